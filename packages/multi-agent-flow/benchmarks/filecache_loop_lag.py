@@ -0,0 +1,93 @@
+"""
+FileCache event-loop lag benchmark
+
+Runs many concurrent cache calls while a ticker coroutine measures how
+late the event loop wakes it up. Compares inline file I/O (io_workers=0,
+the previous behaviour) with the thread-pool offloaded backend.
+
+Usage:
+    python benchmarks/filecache_loop_lag.py [--ops 2000] [--value-kb 64] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from multi_agent_flow.cache import FileCache
+
+
+TICK_INTERVAL = 0.005
+
+
+async def measure_lag(stop: asyncio.Event, samples: list):
+    """Record how far past TICK_INTERVAL each wake-up lands"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_INTERVAL)
+        samples.append(time.perf_counter() - start - TICK_INTERVAL)
+
+
+async def run_workload(cache: FileCache, ops: int, value: str, concurrency: int):
+    """Mixed set/get/exists calls with bounded concurrency"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            key = f"maf:cache:bench:{i % (ops // 4 or 1)}"
+            await cache.set(key, value, ttl_seconds=3600)
+            assert await cache.get(key) is not None
+            await cache.exists(key)
+
+    await asyncio.gather(*[one(i) for i in range(ops)])
+
+
+async def bench(io_workers: int, ops: int, value_kb: int, concurrency: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FileCache(Path(tmp), io_workers=io_workers)
+        value = "x" * (value_kb * 1024)
+
+        stop = asyncio.Event()
+        samples: list = []
+        ticker = asyncio.create_task(measure_lag(stop, samples))
+
+        start = time.perf_counter()
+        await run_workload(cache, ops, value, concurrency)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await ticker
+        cache.close()
+
+    samples.sort()
+    return {
+        "io_workers": io_workers,
+        "elapsed_s": elapsed,
+        "ticks": len(samples),
+        "lag_p50_ms": statistics.median(samples) * 1000 if samples else 0.0,
+        "lag_p99_ms": samples[int(len(samples) * 0.99) - 1] * 1000 if samples else 0.0,
+        "lag_max_ms": samples[-1] * 1000 if samples else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FileCache event-loop lag benchmark")
+    parser.add_argument("--ops", type=int, default=2000, help="Number of set/get/exists rounds")
+    parser.add_argument("--value-kb", type=int, default=64, help="Value size in KB")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent cache calls")
+    parser.add_argument("--workers", type=int, default=4, help="io_workers for the offloaded run")
+    args = parser.parse_args()
+
+    print(f"ops={args.ops} value={args.value_kb}KB concurrency={args.concurrency}\n")
+    print(f"{'mode':10} {'elapsed':>9} {'ticks':>6} {'p50 lag':>9} {'p99 lag':>9} {'max lag':>9}")
+    for label, workers in (("inline", 0), ("offloaded", args.workers)):
+        r = asyncio.run(bench(workers, args.ops, args.value_kb, args.concurrency))
+        print(
+            f"{label:10} {r['elapsed_s']:8.2f}s {r['ticks']:6d} "
+            f"{r['lag_p50_ms']:7.2f}ms {r['lag_p99_ms']:7.2f}ms {r['lag_max_ms']:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Task queue fairness benchmark
+
+Simulates a busy queue in virtual time: every tick some tasks may be
+submitted and one is dispatched (peek_runnable + claim + complete, the
+way TaskScheduler does). Arrivals use 98% of the dispatch capacity and
+90% are HIGH, so with strict priority LOW tasks wait for every HIGH
+backlog to clear; priority aging bounds their wait. A second scenario
+floods one role and submitter and shows how fair share splits dispatches.
+
+Usage:
+    python benchmarks/queue_fairness.py [--ticks 20000] [--aging 50]
+"""
+import argparse
+import logging
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from multi_agent_flow.scheduler import (
+    InMemoryTaskQueue, FairShare, Task, TaskStatus, TaskPriority,
+)
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def at(tick: int) -> str:
+    return (EPOCH + timedelta(seconds=tick)).isoformat()
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def dispatch(queue: InMemoryTaskQueue) -> Optional[Task]:
+    task = queue.peek_runnable()
+    if task is None:
+        return None
+    queue.claim(task.id, "bench")
+    task.status = TaskStatus.COMPLETED
+    queue.update_task(task)
+    return task
+
+
+def starvation(ticks: int, aging: Optional[float], seed: int = 0) -> Dict[str, Dict]:
+    """Per tick: HIGH with p=0.90, NORMAL with p=0.05, LOW with p=0.03"""
+    rng = random.Random(seed)
+    queue = InMemoryTaskQueue(max_size=ticks * 2, aging_seconds=aging)
+    created: Dict[str, int] = {}
+    waits = defaultdict(list)
+    for tick in range(ticks):
+        arrivals = [
+            priority for priority, p in
+            ((TaskPriority.HIGH, 0.90), (TaskPriority.NORMAL, 0.05), (TaskPriority.LOW, 0.03))
+            if rng.random() < p
+        ]
+        for priority in arrivals:
+            task = Task(description="t", target_role="worker", priority=priority, created_at=at(tick))
+            created[task.id] = tick
+            queue.submit(task)
+        task = dispatch(queue)
+        if task is not None:
+            waits[task.priority].append(tick - created[task.id])
+
+    return {
+        priority.value: {
+            "dispatched": len(waits[priority]),
+            "p99": percentile(waits[priority], 0.99),
+            "max": max(waits[priority]) if waits[priority] else None,
+        }
+        for priority in TaskPriority
+    }
+
+
+def share(ticks: int, fair_share: Optional[FairShare]) -> Counter:
+    """Role "busy" (submitter alice) floods; "quiet" roles and bob trickle in"""
+    queue = InMemoryTaskQueue(max_size=ticks * 20, fair_share=fair_share)
+    dispatched = Counter()
+    for tick in range(ticks):
+        arrivals = [("busy", "alice", TaskPriority.HIGH)] * 8
+        if tick % 2 == 0:
+            arrivals.append(("busy", "bob", TaskPriority.NORMAL))
+            arrivals.append(("quiet", "carol", TaskPriority.NORMAL))
+            arrivals.append(("batch", "carol", TaskPriority.LOW))
+        for role, submitter, priority in arrivals:
+            queue.submit(Task(
+                description="t", target_role=role, priority=priority,
+                created_at=at(tick), metadata={"submitter": submitter},
+            ))
+        task = dispatch(queue)
+        if task is not None:
+            dispatched[(task.target_role, task.metadata["submitter"])] += 1
+    return dispatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task queue fairness benchmark")
+    parser.add_argument("--ticks", type=int, default=20000, help="Simulated dispatch cycles")
+    parser.add_argument("--aging", type=float, default=50.0, help="aging_seconds for the aged run")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("Queue wait in ticks (one dispatch per tick)")
+    print(f"{'mode':>10} {'priority':>9} {'dispatched':>11} {'p99':>7} {'max':>7}")
+    for mode, aging in (("strict", None), (f"aging={args.aging:g}", args.aging)):
+        for priority, stats in starvation(args.ticks, aging).items():
+            print(f"{mode:>10} {priority:>9} {stats['dispatched']:11d} "
+                  f"{str(stats['p99']):>7} {str(stats['max']):>7}")
+
+    print("\nDispatch share under a flood from one role and submitter")
+    weights = {"busy": 2.0}
+    for mode, fair_share in (("priority", None), ("fair share", FairShare(role_weights=weights))):
+        counts = share(args.ticks, fair_share)
+        total = sum(counts.values())
+        split = ", ".join(f"{role}/{submitter} {count / total:.0%}" for (role, submitter), count in sorted(counts.items()))
+        print(f"{mode:>10}: {split}")
+    print(f"(fair share role weights: {weights}, others 1)")
+
+
+if __name__ == "__main__":
+    main()
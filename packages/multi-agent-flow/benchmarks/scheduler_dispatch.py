@@ -0,0 +1,107 @@
+"""
+Scheduler dispatch cost benchmark
+
+Fills an InMemoryTaskQueue with N tasks (a mix of independent tasks and
+dependency chains over several roles), then repeatedly takes the next
+runnable task, marks it RUNNING and COMPLETED, the way TaskScheduler does.
+Compares the indexed queue with a scan-based queue reproducing the
+previous behaviour (full scan, dependency re-check and sort per dispatch).
+
+Usage:
+    python benchmarks/scheduler_dispatch.py [--sizes 500,2000,8000] [--dispatches 200]
+"""
+import argparse
+import logging
+import random
+import time
+from typing import List, Dict
+
+from multi_agent_flow.scheduler import InMemoryTaskQueue, TaskQueue, Task, TaskStatus, TaskPriority
+
+
+ROLES = ("planner", "writer", "reviewer", "tester", "analyzer")
+
+
+class ScanTaskQueue(InMemoryTaskQueue):
+    """Previous behaviour: every lookup scans the whole queue"""
+
+    def get_runnable_tasks(self) -> List[Task]:
+        with self._lock:
+            runnable = [
+                t for t in self._tasks.values()
+                if t.status == TaskStatus.PENDING and all(
+                    self._tasks.get(d) and self._tasks[d].status == TaskStatus.COMPLETED
+                    for d in t.dependencies
+                )
+            ]
+            return self._sort_by_priority(runnable)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {"total": len(self._tasks), "pending": 0, "running": 0, "completed": 0, "failed": 0}
+            for task in self._tasks.values():
+                key = task.status.value.lower()
+                if key in stats:
+                    stats[key] += 1
+            return stats
+
+    peek_runnable = TaskQueue.peek_runnable
+
+
+def fill(queue: InMemoryTaskQueue, size: int, seed: int = 0):
+    """Half independent tasks, half chains of five"""
+    rng = random.Random(seed)
+    previous = None
+    for i in range(size):
+        chained = i >= size // 2 and i % 5 != 0
+        task = Task(
+            description=f"task {i}",
+            target_role=rng.choice(ROLES),
+            priority=rng.choice(list(TaskPriority)),
+            dependencies=[previous.id] if chained and previous else [],
+            created_at=f"{i:08d}",
+        )
+        queue.submit(task)
+        previous = task
+
+
+def bench(queue_cls, size: int, dispatches: int) -> dict:
+    queue = queue_cls(max_size=size)
+    fill(queue, size)
+
+    start = time.perf_counter()
+    done = 0
+    while done < dispatches:
+        task = queue.peek_runnable()
+        if task is None:
+            break
+        task.status = TaskStatus.RUNNING
+        queue.update_task(task)
+        task.status = TaskStatus.COMPLETED
+        queue.update_task(task)
+        queue.stats()
+        done += 1
+    elapsed = time.perf_counter() - start
+
+    return {"size": size, "dispatches": done, "us_per_dispatch": elapsed / max(done, 1) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler dispatch cost benchmark")
+    parser.add_argument("--sizes", default="500,2000,8000,32000", help="Comma-separated queue sizes")
+    parser.add_argument("--dispatches", type=int, default=200, help="Dispatches measured per size")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'size':>7} {'scan':>12} {'indexed':>12} {'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        scan = bench(ScanTaskQueue, size, args.dispatches)
+        indexed = bench(InMemoryTaskQueue, size, args.dispatches)
+        print(
+            f"{size:7d} {scan['us_per_dispatch']:10.1f}us {indexed['us_per_dispatch']:10.1f}us "
+            f"{scan['us_per_dispatch'] / indexed['us_per_dispatch']:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
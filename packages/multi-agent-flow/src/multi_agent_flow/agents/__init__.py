@@ -1,5 +1,5 @@
 """Agent execution module"""
-from .runner import AgentRunner, AgentResult
+from .runner import AgentRunner, AgentResult, AgentTaskHandler
 from .config import AgentConfig, AgentsConfig
 
-__all__ = ["AgentRunner", "AgentResult", "AgentConfig", "AgentsConfig"]
+__all__ = ["AgentRunner", "AgentResult", "AgentTaskHandler", "AgentConfig", "AgentsConfig"]
@@ -358,3 +358,52 @@ class AgentRunner:
             name: self.check_agent_available(name)
             for name in self.config.agents.keys()
         }
+
+
+class AgentTaskHandler:
+    """
+    Scheduler task handler that runs a task on its agent's CLI.
+
+    The assigned agent's model (claude, codex, gemini, opencode) selects
+    the CLI and the task description is the prompt. A failed or timed out
+    run raises, so the scheduler marks the task FAILED instead of
+    COMPLETED.
+
+    Instances are picklable, so they also work with the process executor.
+    AsyncTaskScheduler awaits run_async() on its event loop instead of
+    calling the handler in a thread.
+
+    Usage:
+        handler = AgentTaskHandler()
+        scheduler.register_task_handler("writer", handler)
+    """
+
+    def __init__(
+        self,
+        config: Optional[AgentsConfig] = None,
+        working_dir: Optional[Path] = None,
+        timeout_override: Optional[int] = None,
+    ):
+        """
+        Initialize the handler.
+
+        Args:
+            config: Agent CLI configuration (defaults to AgentsConfig.default())
+            working_dir: Directory agents run in (defaults to the current directory)
+            timeout_override: Seconds before a run is killed (defaults to the agent's timeout)
+        """
+        self.config = config or AgentsConfig.default()
+        self.working_dir = Path(working_dir) if working_dir else Path.cwd()
+        self.timeout_override = timeout_override
+
+    def __call__(self, task, agent) -> Dict[str, Any]:
+        return asyncio.run(self.run_async(task, agent))
+
+    async def run_async(self, task, agent) -> Dict[str, Any]:
+        """Run the task on the running event loop (see __call__)."""
+        runner = AgentRunner(config=self.config, working_dir=self.working_dir)
+        result = await runner.run(agent.model, task.description, timeout_override=self.timeout_override)
+        if not result.success:
+            reason = "timed out" if result.timed_out else f"exited with {result.return_code}"
+            raise RuntimeError(f"Agent {agent.model} {reason}: {result.stderr.strip()[:500]}")
+        return result.to_dict()
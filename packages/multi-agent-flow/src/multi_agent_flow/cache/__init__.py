@@ -1,6 +1,56 @@
 """Caching module for multi-agent-flow"""
-from .base import BaseCache, generate_cache_key
+from .base import (
+    BaseCache,
+    generate_cache_key,
+    generate_step_key,
+    generate_step_fingerprint,
+    task_tag,
+    step_tag,
+)
+from .canonical import (
+    Canonicalizer,
+    CanonicalRule,
+    TaskHeaderRule,
+    VolatileFieldsRule,
+    SortKeysRule,
+    WhitespaceRule,
+    default_rules,
+)
+from .codec import ValueCodec, register_codec, available_codecs
 from .file_cache import FileCache
+from .memory_cache import MemoryCache, TieredCache
+from .sqlite_cache import SqliteCache
+from .segment_cache import SegmentCache
+from .redis_cache import RedisCache
+from .singleflight import SingleFlight, CacheFileLock
+from .metrics import CacheMetrics
 from .manager import CacheManager
 
-__all__ = ["BaseCache", "FileCache", "CacheManager", "generate_cache_key"]
+__all__ = [
+    "BaseCache",
+    "Canonicalizer",
+    "CanonicalRule",
+    "TaskHeaderRule",
+    "VolatileFieldsRule",
+    "SortKeysRule",
+    "WhitespaceRule",
+    "default_rules",
+    "ValueCodec",
+    "register_codec",
+    "available_codecs",
+    "FileCache",
+    "MemoryCache",
+    "TieredCache",
+    "SqliteCache",
+    "SegmentCache",
+    "RedisCache",
+    "SingleFlight",
+    "CacheFileLock",
+    "CacheMetrics",
+    "CacheManager",
+    "generate_cache_key",
+    "generate_step_key",
+    "generate_step_fingerprint",
+    "task_tag",
+    "step_tag",
+]
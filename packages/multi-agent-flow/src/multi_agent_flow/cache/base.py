@@ -2,8 +2,9 @@
 Base Cache Interface
 """
 import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple, Dict, Any, List, Sequence
 
 
 class BaseCache(ABC):
@@ -65,6 +66,170 @@ class BaseCache(ABC):
         """Clear all cached values"""
         pass
 
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        Retrieve a value together with its absolute expiry time.
+
+        Backends that track expiry should override this so that tiers
+        stacked on top of them can honour the same TTL.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, expires_at) if found, None otherwise.
+            expires_at is a Unix timestamp or None for no expiry.
+        """
+        value = await self.get(key)
+        if value is None:
+            return None
+        return value, None
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieve several values.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict mapping every requested key to its value (None if missing)
+        """
+        entries = await self.get_many_with_expiry(keys)
+        return {key: entry[0] if entry else None for key, entry in entries.items()}
+
+    async def get_many_with_expiry(
+        self, keys: Sequence[str]
+    ) -> Dict[str, Optional[Tuple[str, Optional[float]]]]:
+        """
+        Retrieve several values with their expiry timestamps.
+
+        Backends should override this with a single round trip.
+
+        Returns:
+            Dict mapping every requested key to (value, expires_at) or None
+        """
+        return {key: await self.get_with_expiry(key) for key in keys}
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: Optional[int] = None):
+        """
+        Store several values with the same TTL.
+
+        Args:
+            items: Key -> value
+            ttl_seconds: Time to live in seconds (None for no expiry)
+        """
+        for key, value in items.items():
+            await self.set(key, value, ttl_seconds)
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """
+        Delete several values.
+
+        Returns:
+            Number of entries deleted
+        """
+        removed = 0
+        for key in keys:
+            if await self.delete(key):
+                removed += 1
+        return removed
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get backend-specific statistics"""
+        return {}
+
+    async def cleanup_expired(self) -> int:
+        """
+        Remove expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        return 0
+
+    async def delete_matching(self, prefix: str) -> int:
+        """
+        Delete all entries whose key starts with a prefix.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            Number of entries deleted
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate keys
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support prefix deletion")
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """
+        Add a key to secondary index tags (see task_tag / step_tag).
+
+        Args:
+            key: Cache key
+            tags: Tags the key should be listed under
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support tags")
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """
+        List the live keys indexed under a tag.
+
+        Args:
+            tag: Index tag
+
+        Returns:
+            Keys that still exist and have not expired
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support tags")
+
+    async def delete_tagged(self, tag: str) -> int:
+        """
+        Delete every entry indexed under a tag, and the tag itself.
+
+        Args:
+            tag: Index tag
+
+        Returns:
+            Number of entries deleted
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support tags")
+
+
+def build_cache_key(*parts: str) -> str:
+    """
+    Join key parts into a namespaced cache key.
+
+    Args:
+        *parts: Key components, most significant first
+
+    Returns:
+        Cache key string
+    """
+    return "maf:cache:" + ":".join(parts)
+
+
+def task_tag(task_id: str) -> str:
+    """Secondary index tag for all entries belonging to a task"""
+    return f"task:{task_id}"
+
+
+def step_tag(step_name: str) -> str:
+    """Secondary index tag for all entries of a step name"""
+    return f"step:{step_name}"
+
+
+def step_name_from_key(key: str) -> str:
+    """
+    Extract the step name from a step cache key.
+
+    Works for both task-scoped keys (maf:cache:{task}:{step}:{hash}) and
+    content-addressed keys (maf:cache:step:{step}:{fingerprint}).
+    """
+    return key.rsplit(":", 2)[1]
+
 
 def generate_cache_key(task_id: str, step_name: str, input_hash: str) -> str:
     """
@@ -78,7 +243,48 @@ def generate_cache_key(task_id: str, step_name: str, input_hash: str) -> str:
     Returns:
         Cache key string
     """
-    return f"maf:cache:{task_id}:{step_name}:{input_hash}"
+    return build_cache_key(task_id, step_name, input_hash)
+
+
+def generate_step_key(step_name: str, fingerprint: str) -> str:
+    """
+    Generate a content-addressed cache key for a step execution.
+
+    The key omits the task ID so any workflow producing the same
+    fingerprint can reuse the result.
+
+    Args:
+        step_name: Step name in the workflow
+        fingerprint: Step fingerprint (see generate_step_fingerprint)
+
+    Returns:
+        Cache key string
+    """
+    return build_cache_key("step", step_name, fingerprint)
+
+
+def generate_step_fingerprint(
+    agent: str,
+    prompt: str,
+    upstream_output: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Fingerprint a step from everything that determines its output.
+
+    Args:
+        agent: Agent CLI that runs the step
+        prompt: Prompt sent to the agent (without per-task identifiers)
+        upstream_output: Output of the previous step, if any
+
+    Returns:
+        Hash of the canonical JSON encoding of the inputs
+    """
+    payload = json.dumps(
+        {"agent": agent, "prompt": prompt, "upstream": upstream_output},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hash_input(payload)
 
 
 def hash_input(input_data: str) -> str:
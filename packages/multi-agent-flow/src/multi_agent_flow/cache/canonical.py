@@ -0,0 +1,189 @@
+"""
+Input canonicalization
+
+Rewrites cache inputs into a canonical form before they are hashed, so
+that prompts differing only in volatile details (task IDs, timestamps,
+key order, whitespace) map to the same cache entry.
+"""
+import json
+import re
+from typing import Optional, Any, List, Sequence
+
+from .base import hash_input
+
+
+# Payload fields that change on every run without changing the work
+DEFAULT_VOLATILE_FIELDS = (
+    "timestamp",
+    "started_at",
+    "completed_at",
+    "created_at",
+    "updated_at",
+    "task_id",
+)
+
+
+def _parse_json(text: str) -> Optional[Any]:
+    """Parse text that is a JSON object or array, else return None"""
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "{[":
+        return None
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        return None
+
+
+class CanonicalRule:
+    """
+    One canonicalization step.
+
+    Rules rewrite prompt text (apply_text) and structured payloads such as
+    the previous step's output (apply_data). Both default to no change.
+    """
+
+    name = "rule"
+
+    def apply_text(self, text: str) -> str:
+        return text
+
+    def apply_data(self, data: Any) -> Any:
+        return data
+
+
+class TaskHeaderRule(CanonicalRule):
+    """Remove the [Task ID: ...] header emitted by FileIPCManager.create_agent_prompt"""
+
+    name = "task_header"
+    pattern = re.compile(r"^\[Task ID: [^\]\n]*\][ \t]*(?:\n|$)", re.MULTILINE)
+
+    def apply_text(self, text: str) -> str:
+        return self.pattern.sub("", text)
+
+
+class VolatileFieldsRule(CanonicalRule):
+    """Drop volatile fields (timestamps, task IDs) from JSON payloads at any depth"""
+
+    name = "volatile_fields"
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_VOLATILE_FIELDS):
+        self.fields = frozenset(fields)
+
+    def apply_data(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {k: self.apply_data(v) for k, v in data.items() if k not in self.fields}
+        if isinstance(data, list):
+            return [self.apply_data(v) for v in data]
+        return data
+
+    def apply_text(self, text: str) -> str:
+        data = _parse_json(text)
+        if data is None:
+            return text
+        return json.dumps(self.apply_data(data), ensure_ascii=False)
+
+
+class SortKeysRule(CanonicalRule):
+    """Order JSON object keys, so key order never affects the hash"""
+
+    name = "sort_keys"
+
+    def apply_data(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {k: self.apply_data(data[k]) for k in sorted(data)}
+        if isinstance(data, list):
+            return [self.apply_data(v) for v in data]
+        return data
+
+    def apply_text(self, text: str) -> str:
+        data = _parse_json(text)
+        if data is None:
+            return text
+        return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+
+class WhitespaceRule(CanonicalRule):
+    """
+    Normalize line endings, trailing whitespace and blank line runs.
+
+    Leading indentation is kept, since it is meaningful in code.
+    """
+
+    name = "whitespace"
+    trailing = re.compile(r"[ \t]+$", re.MULTILINE)
+    blank_lines = re.compile(r"\n{3,}")
+
+    def apply_text(self, text: str) -> str:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        text = self.trailing.sub("", text)
+        return self.blank_lines.sub("\n\n", text).strip("\n")
+
+    def apply_data(self, data: Any) -> Any:
+        if isinstance(data, str):
+            return self.apply_text(data)
+        if isinstance(data, dict):
+            return {k: self.apply_data(v) for k, v in data.items()}
+        if isinstance(data, list):
+            return [self.apply_data(v) for v in data]
+        return data
+
+
+def default_rules() -> List[CanonicalRule]:
+    """The default pipeline, in application order"""
+    return [TaskHeaderRule(), VolatileFieldsRule(), SortKeysRule(), WhitespaceRule()]
+
+
+class Canonicalizer:
+    """
+    Ordered pipeline of canonicalization rules.
+
+    Any rule can be skipped for a single call, which lets callers compute
+    what a key would have been without it and attribute recovered cache
+    hits to individual rules.
+    """
+
+    def __init__(self, rules: Optional[Sequence[CanonicalRule]] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            rules: Rules in application order (defaults to default_rules();
+                   pass [] to hash inputs unchanged)
+        """
+        self.rules = list(default_rules() if rules is None else rules)
+
+    @property
+    def rule_names(self) -> List[str]:
+        return [rule.name for rule in self.rules]
+
+    def canonicalize_text(self, text: str, skip: Optional[str] = None) -> str:
+        """
+        Apply the text side of every rule.
+
+        Args:
+            text: Input text
+            skip: Name of a rule to leave out
+        """
+        for rule in self.rules:
+            if rule.name != skip:
+                text = rule.apply_text(text)
+        return text
+
+    def canonicalize_data(self, data: Any, skip: Optional[str] = None) -> Any:
+        """
+        Apply the data side of every rule to a JSON-like payload.
+
+        Args:
+            data: Input payload (None is returned unchanged)
+            skip: Name of a rule to leave out
+        """
+        if data is None:
+            return None
+        for rule in self.rules:
+            if rule.name != skip:
+                data = rule.apply_data(data)
+        return data
+
+    def hash(self, text: str) -> str:
+        """Hash text after canonicalization (see hash_input)"""
+        return hash_input(self.canonicalize_text(text))
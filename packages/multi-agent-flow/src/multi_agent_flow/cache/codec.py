@@ -0,0 +1,127 @@
+"""
+Value codecs for transparent cache compression
+
+Encoded values are tagged with the codec that produced them, so entries
+written with different codecs (or none) stay readable side by side:
+
+    \\x1e{codec}:{logical_bytes}:{base64 payload}
+
+Untagged values are plain text. JSON text never contains a raw \\x1e, so
+the tag cannot collide with an uncompressed value.
+"""
+import base64
+import bz2
+import logging
+import lzma
+import zlib
+from typing import Optional, Dict, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+TAG = "\x1e"
+
+_CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {}
+
+
+def register_codec(
+    name: str,
+    compress: Callable[[bytes], bytes],
+    decompress: Callable[[bytes], bytes],
+):
+    """
+    Register a compression codec.
+
+    Args:
+        name: Codec name stored in each entry's tag (must not contain ':')
+        compress: bytes -> compressed bytes
+        decompress: compressed bytes -> bytes
+    """
+    if ":" in name or TAG in name:
+        raise ValueError(f"Invalid codec name: {name!r}")
+    _CODECS[name] = (compress, decompress)
+
+
+def available_codecs() -> list:
+    """Names of registered codecs"""
+    return sorted(_CODECS)
+
+
+register_codec("zlib", zlib.compress, zlib.decompress)
+register_codec("bz2", bz2.compress, bz2.decompress)
+register_codec("lzma", lzma.compress, lzma.decompress)
+
+
+def _parse_tag(stored: str) -> Optional[Tuple[str, int, str]]:
+    """Split a tagged value into (codec, logical_bytes, payload)"""
+    if not stored.startswith(TAG):
+        return None
+    name, logical, payload = stored[1:].split(":", 2)
+    return name, int(logical), payload
+
+
+def is_encoded(stored: str) -> bool:
+    """Check whether a stored value carries a codec tag"""
+    return stored.startswith(TAG)
+
+
+def decode_value(stored: str) -> str:
+    """
+    Decode a stored value, whatever codec (if any) produced it.
+
+    Raises:
+        ValueError: If the entry uses a codec that is not registered
+    """
+    tag = _parse_tag(stored)
+    if tag is None:
+        return stored
+
+    name, _, payload = tag
+    codec = _CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown cache codec: {name}")
+    return codec[1](base64.b64decode(payload)).decode("utf-8")
+
+
+def logical_size(stored: str) -> int:
+    """Size in bytes of a stored value once decoded (read from the tag)"""
+    tag = _parse_tag(stored)
+    if tag is None:
+        return len(stored.encode("utf-8"))
+    return tag[1]
+
+
+class ValueCodec:
+    """
+    Compresses values above a size threshold.
+
+    Values smaller than min_size, or that do not shrink, are stored as
+    plain text.
+    """
+
+    def __init__(self, name: str = "zlib", min_size: int = 1024):
+        """
+        Initialize the codec.
+
+        Args:
+            name: Registered codec name (see register_codec)
+            min_size: Values below this many bytes are stored uncompressed
+        """
+        if name not in _CODECS:
+            raise ValueError(f"Unknown cache codec: {name}")
+        self.name = name
+        self.min_size = min_size
+
+    def encode(self, value: str) -> str:
+        """Encode a value for storage"""
+        raw = value.encode("utf-8")
+        if len(raw) < self.min_size:
+            return value
+
+        payload = base64.b64encode(_CODECS[self.name][0](raw)).decode("ascii")
+        encoded = f"{TAG}{self.name}:{len(raw)}:{payload}"
+        if len(encoded) >= len(raw):
+            return value
+        return encoded
+
+    decode = staticmethod(decode_value)
@@ -1,53 +1,369 @@
 """
 File-based Cache Implementation
 """
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import shutil
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, List, Callable, Sequence, Iterable
 
+from ..shared.lifecycle import close_at_exit
 from .base import BaseCache
+from .codec import ValueCodec, decode_value, logical_size
 
 logger = logging.getLogger(__name__)
 
 
+INDEX_FILENAME = ".access_index.json"
+TAGS_DIRNAME = ".tags"
+# Line naming the tag a (hashed) tag file belongs to, written by its creator
+TAG_NAME_PREFIX = "#tag "
+EVICTION_POLICIES = ("lru", "lfu")
+
+
 class FileCache(BaseCache):
     """
     File-based cache implementation.
 
     Stores cached values as JSON files in a directory structure.
-    Supports TTL-based expiration.
+    Supports TTL-based expiration and an optional size quota.
+
+    When max_bytes or max_entries is set, every entry is tracked in a
+    compact access index (size, last access, hit count, expiry) that is
+    persisted next to the cache files. A background thread evicts entries
+    by recency ("lru") or frequency ("lfu") in small batches whenever the
+    quota is exceeded, so set() never blocks on eviction.
+
+    With a codec, values above compress_min_bytes are stored compressed
+    (see codec.py); quotas apply to the compressed size.
+
+    File I/O runs on a bounded thread pool so a slow disk never stalls the
+    event loop. Writes to a key are applied in order, and a value that is
+    still being written is served from memory to readers.
+
+    Secondary index tags (task, step) are append-only key lists under
+    .tags/, so finding a task's entries reads one small file instead of
+    walking the tree. Each list also records its tag name, so the index
+    can be migrated (see read_tag_index).
 
     Directory structure:
         {cache_dir}/
+        ├── .access_index.json
+        ├── .tags/
+        │   └── {tag_hash}.keys
         ├── {key_hash[:2]}/
         │   ├── {key_hash}.json
         │   └── ...
         └── ...
     """
 
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        eviction_policy: str = "lru",
+        low_water_ratio: float = 0.9,
+        eviction_batch_size: int = 64,
+        index_flush_interval: float = 5.0,
+        codec: Optional[str] = None,
+        compress_min_bytes: int = 1024,
+        io_workers: int = 4,
+    ):
         """
         Initialize file cache.
 
         Args:
             cache_dir: Directory to store cache files.
                       Defaults to ~/.multi-agent-flow/cache
+            max_bytes: Disk quota in bytes (None = unbounded)
+            max_entries: Entry quota (None = unbounded)
+            eviction_policy: "lru" (least recently used) or "lfu" (least frequently used)
+            low_water_ratio: Eviction stops once usage drops below this fraction of the quota
+            eviction_batch_size: Files removed per batch before yielding the index lock
+            index_flush_interval: Seconds between background index writes
+            codec: Compression codec for new entries (e.g. "zlib"; None stores plain text)
+            compress_min_bytes: Values smaller than this are never compressed
+            io_workers: Threads for file I/O (0 runs I/O inline on the event loop)
         """
-        self.cache_dir = cache_dir or Path.home() / ".multi-agent-flow" / "cache"
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".multi-agent-flow" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"FileCache initialized: {self.cache_dir}")
+
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.eviction_policy = eviction_policy
+        self.low_water_ratio = low_water_ratio
+        self.eviction_batch_size = eviction_batch_size
+        self.index_flush_interval = index_flush_interval
+        self.codec = ValueCodec(codec, compress_min_bytes) if codec else None
+
+        self.io_workers = io_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if io_workers > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=io_workers, thread_name_prefix="maf-file-cache"
+            )
+        # key -> in-flight write future / (future, data being written or None for delete)
+        self._key_writes: Dict[str, Future] = {}
+        self._pending: Dict[str, Tuple[Future, Optional[Dict[str, Any]]]] = {}
+        self._pending_lock = threading.Lock()
+
+        # key_hash -> [size, last_access, hits, expires_at]
+        self._index: Dict[str, List[Any]] = {}
+        self._index_bytes = 0
+        self._index_dirty = False
+        self._lock = threading.RLock()
+        self._evict_event = threading.Event()
+        self._evictor_thread: Optional[threading.Thread] = None
+        self._running = False
+        self.evictions = 0
+        # Optional callback invoked with the number of entries evicted per pass
+        self.on_evict: Optional[Callable[[int], None]] = None
+
+        if self.quota_enabled:
+            self._load_index()
+            close_at_exit(self)
+
+        logger.info(
+            f"FileCache initialized: {self.cache_dir} "
+            f"(max_bytes={max_bytes}, max_entries={max_entries}, policy={eviction_policy})"
+        )
+
+    @property
+    def quota_enabled(self) -> bool:
+        """Whether a size or entry quota is configured"""
+        return self.max_bytes is not None or self.max_entries is not None
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / INDEX_FILENAME
+
+    @staticmethod
+    def _hash_key(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
 
     def _get_cache_path(self, key: str) -> Path:
         """Get the file path for a cache key"""
-        import hashlib
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
         # Use first 2 characters as subdirectory for better file distribution
-        subdir = self.cache_dir / key_hash[:2]
-        subdir.mkdir(exist_ok=True)
-        return subdir / f"{key_hash}.json"
+        # (created by the first write into it, see _write_cache_file)
+        return self._path_for_hash(self._hash_key(key))
+
+    def _path_for_hash(self, key_hash: str) -> Path:
+        return self.cache_dir / key_hash[:2] / f"{key_hash}.json"
+
+    def _tag_path(self, tag: str) -> Path:
+        return self.cache_dir / TAGS_DIRNAME / f"{self._hash_key(tag)[:32]}.keys"
+
+    # Access index
+
+    def _load_index(self):
+        """Load the access index, rebuilding it if missing or unreadable"""
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if not isinstance(index, dict):
+                raise ValueError("index is not an object")
+        except FileNotFoundError:
+            self.rebuild_index()
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding unreadable cache index: {e}")
+            self.rebuild_index()
+            return
+
+        with self._lock:
+            self._index = index
+            self._index_bytes = sum(entry[0] for entry in index.values())
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the access index from the files on disk.
+
+        This is the only operation that stats every file. Access history is
+        approximated from modification times.
+
+        Returns:
+            Number of indexed entries
+        """
+        index: Dict[str, List[Any]] = {}
+        for cache_file in self.cache_dir.glob("*/*.json"):
+            try:
+                st = cache_file.stat()
+            except FileNotFoundError:
+                continue
+            index[cache_file.stem] = [st.st_size, st.st_mtime, 0, None]
+
+        with self._lock:
+            self._index = index
+            self._index_bytes = sum(entry[0] for entry in index.values())
+            self._index_dirty = True
+        self.flush_index()
+        logger.info(f"Rebuilt cache index: {len(index)} entries")
+        return len(index)
+
+    def flush_index(self):
+        """Persist the access index atomically"""
+        with self._lock:
+            if not self._index_dirty:
+                return
+            payload = json.dumps(self._index, separators=(",", ":"))
+            self._index_dirty = False
+
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache index: {e}")
+            with self._lock:
+                self._index_dirty = True
+
+    def _track(self, key_hash: str, size: int, expires_at: Optional[float]):
+        """Record a write in the access index"""
+        with self._lock:
+            previous = self._index.get(key_hash)
+            if previous:
+                self._index_bytes -= previous[0]
+            hits = previous[2] if previous else 0
+            self._index[key_hash] = [size, time.time(), hits, expires_at]
+            self._index_bytes += size
+            self._index_dirty = True
+        self._ensure_evictor()
+        if self._over_quota():
+            self._evict_event.set()
+
+    def _touch(self, key_hash: str, path: Path, data: Dict[str, Any]):
+        """Record a read in the access index"""
+        with self._lock:
+            entry = self._index.get(key_hash)
+            if entry is None:
+                # Written by another process since the index was loaded
+                try:
+                    size = path.stat().st_size
+                except FileNotFoundError:
+                    return
+                entry = [size, 0.0, 0, data.get("expires_at")]
+                self._index[key_hash] = entry
+                self._index_bytes += size
+            entry[1] = time.time()
+            entry[2] += 1
+            self._index_dirty = True
+
+    def _untrack(self, key_hash: str):
+        """Drop an entry from the access index"""
+        with self._lock:
+            entry = self._index.pop(key_hash, None)
+            if entry:
+                self._index_bytes -= entry[0]
+                self._index_dirty = True
+
+    # Eviction
+
+    def _over_quota(self, ratio: float = 1.0) -> bool:
+        with self._lock:
+            if self.max_bytes is not None and self._index_bytes > self.max_bytes * ratio:
+                return True
+            if self.max_entries is not None and len(self._index) > self.max_entries * ratio:
+                return True
+            return False
+
+    def _eviction_order(self) -> List[str]:
+        """Key hashes ordered from first to last eviction candidate"""
+        now = time.time()
+        with self._lock:
+            items = list(self._index.items())
+
+        def rank(item):
+            size, last_access, hits, expires_at = item[1]
+            expired = expires_at is not None and now > expires_at
+            if self.eviction_policy == "lfu":
+                return (not expired, hits, last_access)
+            return (not expired, last_access)
+
+        return [key_hash for key_hash, _ in sorted(items, key=rank)]
+
+    def evict(self) -> int:
+        """
+        Evict entries until usage is below the low-water mark.
+
+        Expired entries go first, then the policy order. Files are removed in
+        batches and the index lock is released between batches.
+
+        Returns:
+            Number of entries evicted
+        """
+        if not self._over_quota():
+            return 0
+
+        evicted = 0
+        candidates = self._eviction_order()
+        for start in range(0, len(candidates), self.eviction_batch_size):
+            if not self._over_quota(self.low_water_ratio):
+                break
+            with self._lock:
+                for key_hash in candidates[start:start + self.eviction_batch_size]:
+                    if not self._over_quota(self.low_water_ratio):
+                        break
+                    if key_hash not in self._index:
+                        continue
+                    try:
+                        self._path_for_hash(key_hash).unlink()
+                    except FileNotFoundError:
+                        pass
+                    self._untrack(key_hash)
+                    evicted += 1
+
+        self.evictions += evicted
+        if evicted:
+            logger.info(f"Evicted {evicted} cache entries ({self.eviction_policy})")
+            if self.on_evict:
+                self.on_evict(evicted)
+        return evicted
+
+    def _ensure_evictor(self):
+        """Start the background eviction thread on first write"""
+        if self._evictor_thread and self._evictor_thread.is_alive():
+            return
+        with self._lock:
+            if self._evictor_thread and self._evictor_thread.is_alive():
+                return
+            self._running = True
+
+            def evictor_loop():
+                while self._running:
+                    self._evict_event.wait(self.index_flush_interval)
+                    self._evict_event.clear()
+                    try:
+                        self.evict()
+                        self.flush_index()
+                    except Exception as e:
+                        logger.error(f"Cache eviction error: {e}")
+
+            self._evictor_thread = threading.Thread(target=evictor_loop, daemon=True)
+            self._evictor_thread.start()
+
+    def close(self):
+        """Stop the eviction thread, finish pending writes and persist the access index"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._running = False
+        self._evict_event.set()
+        if self._evictor_thread:
+            self._evictor_thread.join(timeout=5.0)
+            self._evictor_thread = None
+        if self.quota_enabled:
+            self.flush_index()
 
     def _read_cache_file(self, path: Path) -> Optional[Dict[str, Any]]:
         """Read and parse a cache file"""
@@ -57,10 +373,19 @@ class FileCache(BaseCache):
         except (FileNotFoundError, json.JSONDecodeError):
             return None
 
-    def _write_cache_file(self, path: Path, data: Dict[str, Any]):
-        """Write data to a cache file"""
-        with open(path, 'w') as f:
-            json.dump(data, f)
+    def _write_cache_file(self, path: Path, data: Dict[str, Any]) -> int:
+        """Atomically write data to a cache file and return its size in bytes"""
+        payload = json.dumps(data).encode("utf-8")
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            f = open(tmp_path, 'wb')
+        except FileNotFoundError:
+            path.parent.mkdir(exist_ok=True)
+            f = open(tmp_path, 'wb')
+        with f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(payload)
 
     def _is_expired(self, data: Dict[str, Any]) -> bool:
         """Check if a cache entry is expired"""
@@ -69,71 +394,104 @@ class FileCache(BaseCache):
             return False
         return time.time() > expires_at
 
-    async def get(self, key: str) -> Optional[str]:
-        """Retrieve a value from cache"""
-        path = self._get_cache_path(key)
-        data = self._read_cache_file(path)
+    # I/O offloading
 
-        if data is None:
-            logger.debug(f"Cache miss: {key}")
-            return None
+    async def _run_io(self, fn: Callable, *args) -> Any:
+        """Run blocking file I/O on the executor (or inline when io_workers=0)"""
+        if self._executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
 
-        if self._is_expired(data):
-            logger.debug(f"Cache expired: {key}")
-            await self.delete(key)
-            return None
+    async def _run_write(self, key: str, data: Optional[Dict[str, Any]], fn: Callable, *args) -> Any:
+        """
+        Run a write for a key on the executor.
 
-        logger.debug(f"Cache hit: {key}")
-        return data.get("value")
+        Writes to the same key run in submission order, and until a write
+        lands the pending data answers reads of that key (read-your-writes).
+        data is the entry being written, or None for a delete.
+        """
+        if self._executor is None:
+            return fn(*args)
 
-    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
-        """Store a value in cache"""
+        with self._pending_lock:
+            previous = self._key_writes.get(key)
+            future = self._executor.submit(self._after, previous, fn, *args)
+            self._key_writes[key] = future
+            self._pending[key] = (future, data)
+
+        def settle(done: Future):
+            with self._pending_lock:
+                if self._key_writes.get(key) is done:
+                    del self._key_writes[key]
+                if self._pending.get(key, (None,))[0] is done:
+                    del self._pending[key]
+
+        future.add_done_callback(settle)
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _after(previous: Optional[Future], fn: Callable, *args) -> Any:
+        """Wait for the previous write to a key, then run fn"""
+        if previous is not None:
+            wait([previous])
+        return fn(*args)
+
+    def _pending_entry(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (found, data) for a key with a write in flight"""
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is None:
+            return False, None
+        return True, pending[1]
+
+    async def _drain_writes(self):
+        """Wait for every in-flight write"""
+        with self._pending_lock:
+            futures = list(self._key_writes.values())
+        if futures:
+            await asyncio.gather(*[asyncio.wrap_future(f) for f in futures], return_exceptions=True)
+
+    # Blocking implementations (run on the executor)
+
+    def _get_sync(self, key: str) -> Optional[Dict[str, Any]]:
         path = self._get_cache_path(key)
+        data = self._read_cache_file(path)
+        if data is not None and not self._is_expired(data) and self.quota_enabled:
+            self._touch(path.stem, path, data)
+        return data
 
-        data = {
-            "key": key,
-            "value": value,
-            "created_at": time.time(),
-            "expires_at": time.time() + ttl_seconds if ttl_seconds else None,
-        }
+    def _peek_sync(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._read_cache_file(self._get_cache_path(key))
 
-        self._write_cache_file(path, data)
-        logger.debug(f"Cache set: {key} (ttl={ttl_seconds})")
+    def _set_sync(self, key: str, data: Dict[str, Any]):
+        path = self._get_cache_path(key)
+        size = self._write_cache_file(path, data)
+        if self.quota_enabled:
+            self._track(path.stem, size, data["expires_at"])
 
-    async def delete(self, key: str) -> bool:
-        """Delete a value from cache"""
+    def _delete_sync(self, key: str) -> bool:
         path = self._get_cache_path(key)
+        if self.quota_enabled:
+            self._untrack(path.stem)
         try:
             path.unlink()
-            logger.debug(f"Cache deleted: {key}")
             return True
         except FileNotFoundError:
             return False
 
-    async def exists(self, key: str) -> bool:
-        """Check if a key exists in cache"""
-        path = self._get_cache_path(key)
-        if not path.exists():
-            return False
-
-        data = self._read_cache_file(path)
-        if data is None or self._is_expired(data):
-            return False
-
-        return True
-
-    async def clear(self):
-        """Clear all cached values"""
-        import shutil
+    def _clear_sync(self):
         if self.cache_dir.exists():
             shutil.rmtree(self.cache_dir)
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-        logger.info("Cache cleared")
+        with self._lock:
+            self._index = {}
+            self._index_bytes = 0
+            self._index_dirty = self.quota_enabled
 
-    async def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
+    def _stats_sync(self) -> Dict[str, Any]:
         total_files = 0
         total_size = 0
+        logical_bytes = 0
         expired_count = 0
 
         for subdir in self.cache_dir.iterdir():
@@ -143,18 +501,95 @@ class FileCache(BaseCache):
                     total_size += cache_file.stat().st_size
 
                     data = self._read_cache_file(cache_file)
+                    if data and "value" in data:
+                        logical_bytes += logical_size(data["value"])
                     if data and self._is_expired(data):
                         expired_count += 1
 
-        return {
+        stats = {
             "total_entries": total_files,
             "total_size_bytes": total_size,
+            "logical_size_bytes": logical_bytes,
+            "physical_size_bytes": total_size,
+            "codec": self.codec.name if self.codec else None,
             "expired_entries": expired_count,
             "cache_dir": str(self.cache_dir),
+            "io_workers": self.io_workers,
         }
+        if self.quota_enabled:
+            stats.update({
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "eviction_policy": self.eviction_policy,
+                "evictions": self.evictions,
+            })
+        return stats
 
-    async def cleanup_expired(self) -> int:
-        """Remove expired cache entries"""
+    def _tag_key_sync(self, key: str, tags: Sequence[str]):
+        line = (key + "\n").encode("utf-8")
+        for tag in tags:
+            path = self._tag_path(tag)
+            path.parent.mkdir(exist_ok=True)
+            while True:
+                try:
+                    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o644)
+                    data = f"{TAG_NAME_PREFIX}{tag}\n".encode("utf-8") + line
+                except FileExistsError:
+                    try:
+                        fd = os.open(str(path), os.O_WRONLY | os.O_APPEND)
+                    except FileNotFoundError:
+                        # Claimed by delete_tagged in between; create it afresh
+                        continue
+                    data = line
+                break
+            # A single O_APPEND write per key keeps concurrent appenders from interleaving
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _read_tag_lines(path: Path) -> Tuple[Optional[str], List[str]]:
+        """Read a tag file as (tag name if recorded, unique keys)"""
+        tag = None
+        keys = []
+        try:
+            with open(path, 'r', encoding="utf-8") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line.startswith(TAG_NAME_PREFIX):
+                        tag = line[len(TAG_NAME_PREFIX):]
+                    elif line.strip():
+                        keys.append(line)
+        except FileNotFoundError:
+            pass
+        return tag, list(dict.fromkeys(keys))
+
+    @classmethod
+    def _read_tag_file(cls, path: Path) -> List[str]:
+        return cls._read_tag_lines(path)[1]
+
+    def _tagged_keys_sync(self, tag: str) -> List[str]:
+        live = []
+        for key in self._read_tag_file(self._tag_path(tag)):
+            data = self._read_cache_file(self._path_for_hash(self._hash_key(key)))
+            if data is not None and not self._is_expired(data):
+                live.append(key)
+        return live
+
+    def _claim_tag_sync(self, tag: str) -> List[str]:
+        """Atomically take over a tag file so concurrent appends start a fresh one"""
+        path = self._tag_path(tag)
+        claimed = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.claim")
+        try:
+            os.replace(path, claimed)
+        except FileNotFoundError:
+            return []
+        keys = self._read_tag_file(claimed)
+        claimed.unlink()
+        return keys
+
+    def _cleanup_expired_sync(self) -> int:
         removed_count = 0
 
         for subdir in self.cache_dir.iterdir():
@@ -163,7 +598,142 @@ class FileCache(BaseCache):
                     data = self._read_cache_file(cache_file)
                     if data and self._is_expired(data):
                         cache_file.unlink()
+                        if self.quota_enabled:
+                            self._untrack(cache_file.stem)
                         removed_count += 1
 
+        return removed_count
+
+    # BaseCache interface
+
+    async def get(self, key: str) -> Optional[str]:
+        """Retrieve a value from cache"""
+        entry = await self.get_with_expiry(key)
+        return entry[0] if entry else None
+
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Retrieve a value and its expiry timestamp from cache"""
+        found, data = self._pending_entry(key)
+        if not found:
+            data = await self._run_io(self._get_sync, key)
+
+        if data is None:
+            logger.debug(f"Cache miss: {key}")
+            return None
+
+        if self._is_expired(data):
+            logger.debug(f"Cache expired: {key}")
+            await self.delete(key)
+            return None
+
+        logger.debug(f"Cache hit: {key}")
+        return decode_value(data["value"]), data.get("expires_at")
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value in cache"""
+        data = {
+            "key": key,
+            "value": self.codec.encode(value) if self.codec else value,
+            "created_at": time.time(),
+            "expires_at": time.time() + ttl_seconds if ttl_seconds else None,
+        }
+
+        await self._run_write(key, data, self._set_sync, key, data)
+        logger.debug(f"Cache set: {key} (ttl={ttl_seconds})")
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from cache"""
+        deleted = await self._run_write(key, None, self._delete_sync, key)
+        if deleted:
+            logger.debug(f"Cache deleted: {key}")
+        return deleted
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in cache"""
+        found, data = self._pending_entry(key)
+        if not found:
+            data = await self._run_io(self._peek_sync, key)
+        return data is not None and not self._is_expired(data)
+
+    async def clear(self):
+        """Clear all cached values"""
+        await self._drain_writes()
+        await self._run_io(self._clear_sync)
+        logger.info("Cache cleared")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return await self._run_io(self._stats_sync)
+
+    async def get_many_with_expiry(
+        self, keys: Sequence[str]
+    ) -> Dict[str, Optional[Tuple[str, Optional[float]]]]:
+        """Retrieve several values, reading the files in parallel on the I/O pool"""
+        keys = list(dict.fromkeys(keys))
+        entries = await asyncio.gather(*[self.get_with_expiry(key) for key in keys])
+        return dict(zip(keys, entries))
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: Optional[int] = None):
+        """Store several values, writing the files in parallel on the I/O pool"""
+        await asyncio.gather(*[self.set(key, value, ttl_seconds) for key, value in items.items()])
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several values in parallel on the I/O pool"""
+        results = await asyncio.gather(*[self.delete(key) for key in dict.fromkeys(keys)])
+        return sum(1 for deleted in results if deleted)
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """Append a key to the tag index files"""
+        await self._run_io(self._tag_key_sync, key, tags)
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """List live keys indexed under a tag"""
+        return await self._run_io(self._tagged_keys_sync, tag)
+
+    async def delete_tagged(self, tag: str) -> int:
+        """Delete every entry indexed under a tag, and the tag file"""
+        removed = 0
+        for key in await self._run_io(self._claim_tag_sync, tag):
+            if await self.delete(key):
+                removed += 1
+        return removed
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired cache entries"""
+        removed_count = await self._run_io(self._cleanup_expired_sync)
         logger.info(f"Cleaned up {removed_count} expired cache entries")
         return removed_count
+
+
+def read_tag_index(cache_dir: Path, candidate_tags: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """
+    Read a FileCache directory's tag index.
+
+    Tag files are named by a hash of the tag. Files written before tag
+    names were recorded are matched against candidate_tags instead; those
+    that match none of them are skipped.
+
+    Args:
+        cache_dir: FileCache directory
+        candidate_tags: Tags that may have legacy (unnamed) tag files
+
+    Returns:
+        Tag -> keys indexed under it
+    """
+    tags_dir = Path(cache_dir) / TAGS_DIRNAME
+    if not tags_dir.is_dir():
+        return {}
+    by_hash = {FileCache._hash_key(tag)[:32]: tag for tag in candidate_tags}
+
+    index: Dict[str, List[str]] = {}
+    unresolved = 0
+    for path in tags_dir.glob("*.keys"):
+        tag, keys = FileCache._read_tag_lines(path)
+        tag = tag or by_hash.get(path.stem)
+        if tag is None:
+            unresolved += 1
+            continue
+        index.setdefault(tag, []).extend(keys)
+    if unresolved:
+        logger.warning(f"Skipped {unresolved} tag file(s) in {tags_dir} with unknown tags")
+    return index
@@ -1,11 +1,31 @@
 """
 Cache Manager - Unified interface for caching
 """
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence, Callable, Awaitable, Tuple
 
-from .base import BaseCache, generate_cache_key, hash_input
+from .base import (
+    BaseCache,
+    build_cache_key,
+    generate_cache_key,
+    generate_step_key,
+    task_tag,
+    step_tag,
+    step_name_from_key,
+)
 from .file_cache import FileCache
+from .memory_cache import MemoryCache, TieredCache
+from .sqlite_cache import SqliteCache
+from .segment_cache import SegmentCache
+from .redis_cache import RedisCache
+from .singleflight import SingleFlight, CacheFileLock
+from .canonical import Canonicalizer
+from .metrics import CacheMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +35,13 @@ class CacheManager:
     Unified cache manager that supports multiple backends.
 
     Provides:
-    - Automatic backend selection (file/redis)
-    - Cache key generation
-    - Hit/miss metrics
+    - Automatic backend selection (file/sqlite/segment/redis)
+    - Optional in-memory LRU tier in front of the backend
+    - Cache key generation from canonicalized inputs (Canonicalizer)
+    - Hit/miss metrics, persisted host-wide per step (CacheMetrics)
+    - Single-flight coalescing of concurrent misses (get_or_compute)
+    - Stale-while-revalidate windows per step (get_or_compute)
+    - Per-task / per-step secondary index for invalidation
     - Graceful degradation on failures
     """
 
@@ -25,31 +49,92 @@ class CacheManager:
         self,
         backend: str = "file",
         default_ttl: int = 3600,
+        memory_tier: bool = False,
+        memory_max_entries: int = 1024,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        write_through: bool = True,
+        promote_on_read: bool = True,
+        cross_process_locks: bool = False,
+        lock_dir: Optional[Path] = None,
+        lock_stale_after: float = 600.0,
+        persist_metrics: bool = True,
+        metrics_path: Optional[Path] = None,
+        stale_windows: Optional[Dict[str, int]] = None,
+        canonicalizer: Optional[Canonicalizer] = None,
         **backend_options,
     ):
         """
         Initialize cache manager.
 
         Args:
-            backend: Cache backend type ("file" or "redis")
+            backend: Cache backend type ("file", "sqlite", "segment" or "redis")
             default_ttl: Default TTL in seconds
+            memory_tier: Put a bounded in-memory LRU tier in front of the backend
+            memory_max_entries: Entry budget of the memory tier
+            memory_max_bytes: Byte budget of the memory tier
+            write_through: Populate the memory tier on writes
+            promote_on_read: Copy backend hits into the memory tier
+            cross_process_locks: Coalesce get_or_compute across processes by default
+            lock_dir: Lock file directory for non-file backends.
+                      Defaults to ~/.multi-agent-flow/locks
+            lock_stale_after: Age in seconds after which a lock file is broken
+            persist_metrics: Record hit/miss/latency telemetry in the shared metrics store
+            metrics_path: Metrics database. Defaults to ~/.multi-agent-flow/metrics.db
+            stale_windows: Step name -> seconds an expired entry may still be
+                           served by get_or_compute while it is refreshed in
+                           the background
+            canonicalizer: Input canonicalization applied before hashing
+                           (defaults to Canonicalizer() with the default rules)
             **backend_options: Options passed to backend constructor
         """
         self.default_ttl = default_ttl
         self._hits = 0
         self._misses = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self.stale_windows: Dict[str, int] = dict(stale_windows or {})
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # Bumped by every delete/invalidation, so holders of entries read
+        # earlier (see peek_entries) can tell they may be outdated
+        self.invalidations = 0
+        self.canonicalizer = canonicalizer or Canonicalizer()
+        # rule name -> hits that would have missed without it
+        self._recovered: Dict[str, int] = {}
+        self.cross_process_locks = cross_process_locks
+        self.lock_dir = Path(lock_dir) if lock_dir else Path.home() / ".multi-agent-flow" / "locks"
+        self.lock_stale_after = lock_stale_after
+        self._singleflight = SingleFlight()
+        self.metrics: Optional[CacheMetrics] = CacheMetrics(metrics_path) if persist_metrics else None
 
         # Initialize backend
         if backend == "file":
             self._cache: BaseCache = FileCache(**backend_options)
+        elif backend == "sqlite":
+            self._cache = SqliteCache(**backend_options)
+        elif backend == "segment":
+            self._cache = SegmentCache(**backend_options)
         elif backend == "redis":
-            # Redis support can be added later
-            logger.warning("Redis backend not implemented, falling back to file")
-            self._cache = FileCache(**backend_options)
+            self._cache = RedisCache(**backend_options)
         else:
             raise ValueError(f"Unknown cache backend: {backend}")
 
-        logger.info(f"CacheManager initialized (backend={backend}, ttl={default_ttl})")
+        if self.metrics and isinstance(self._cache, FileCache):
+            self._cache.on_evict = lambda n: self.metrics.record_evictions(n, "file")
+
+        if memory_tier:
+            self._cache = TieredCache(
+                self._cache,
+                MemoryCache(max_entries=memory_max_entries, max_bytes=memory_max_bytes),
+                write_through=write_through,
+                promote_on_read=promote_on_read,
+            )
+            if self.metrics:
+                self._cache.memory.on_evict = lambda n: self.metrics.record_evictions(n, "memory")
+
+        logger.info(
+            f"CacheManager initialized (backend={backend}, ttl={default_ttl}, "
+            f"memory_tier={memory_tier})"
+        )
 
     async def get_step_result(
         self,
@@ -68,22 +153,9 @@ class CacheManager:
         Returns:
             Cached result dict or None
         """
-        input_hash = hash_input(input_data)
+        input_hash = self.canonicalizer.hash(input_data)
         key = generate_cache_key(task_id, step_name, input_hash)
-
-        try:
-            result = await self._cache.get(key)
-            if result:
-                self._hits += 1
-                import json
-                return json.loads(result)
-            else:
-                self._misses += 1
-                return None
-        except Exception as e:
-            logger.warning(f"Cache get error: {e}")
-            self._misses += 1
-            return None
+        return await self._get_json(key)
 
     async def set_step_result(
         self,
@@ -103,16 +175,474 @@ class CacheManager:
             result: Result to cache
             ttl: Optional TTL override
         """
-        input_hash = hash_input(input_data)
+        input_hash = self.canonicalizer.hash(input_data)
         key = generate_cache_key(task_id, step_name, input_hash)
-        ttl = ttl or self.default_ttl
+        await self._set_json(key, result, ttl)
+        await self._tag(key, (task_tag(task_id), step_tag(step_name)))
+        logger.debug(f"Cached step result: {step_name}")
+
+    async def get_memoized_step(
+        self,
+        step_name: str,
+        fingerprint: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a content-addressed step result.
+
+        Unlike get_step_result, the key does not include the task ID, so
+        results are shared by every workflow that produces the same
+        fingerprint.
+
+        Args:
+            step_name: Step name
+            fingerprint: Step fingerprint (see generate_step_fingerprint)
+
+        Returns:
+            Cached result dict or None
+        """
+        return await self._get_json(generate_step_key(step_name, fingerprint))
+
+    async def set_memoized_step(
+        self,
+        step_name: str,
+        fingerprint: str,
+        result: Dict[str, Any],
+        ttl: Optional[int] = None,
+        task_id: Optional[str] = None,
+    ):
+        """
+        Cache a content-addressed step result.
+
+        Args:
+            step_name: Step name
+            fingerprint: Step fingerprint (see generate_step_fingerprint)
+            result: Result to cache
+            ttl: Optional TTL override
+            task_id: Task that produced the result (indexed for invalidate_task)
+        """
+        key = generate_step_key(step_name, fingerprint)
+        await self._set_json(key, result, ttl)
+        tags = [step_tag(step_name)]
+        if task_id:
+            tags.append(task_tag(task_id))
+        await self._tag(key, tags)
+        logger.debug(f"Memoized step result: {step_name} ({fingerprint})")
+
+    async def get_memoized_steps(
+        self,
+        fingerprints: Dict[str, str],
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Look up several content-addressed step results in one batch.
+
+        Args:
+            fingerprints: Step name -> fingerprint
+
+        Returns:
+            Step name -> cached result dict or None
+        """
+        keys = {step: generate_step_key(step, fp) for step, fp in fingerprints.items()}
+        results = await self.get_many(list(keys.values()))
+        return {step: results.get(key) for step, key in keys.items()}
+
+    async def get_task_entries(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch every cached entry indexed under a task in one batch.
+
+        Returns:
+            Cache key -> result dict, for live entries only
+        """
+        try:
+            keys = await self._cache.tagged_keys(task_tag(task_id))
+        except Exception as e:
+            logger.warning(f"Cache list error: {e}")
+            return {}
+        results = await self.get_many(keys)
+        return {key: result for key, result in results.items() if result is not None}
+
+    async def peek_entries(self, keys: Sequence[str]) -> Dict[str, Tuple[Dict[str, Any], Optional[float]]]:
+        """
+        Read several fresh entries without recording hits or misses.
+
+        For callers that look entries up ahead of use; they report the
+        entries they end up using with record_served_hit.
+
+        Returns:
+            Key -> (result dict, time it stops being fresh or None), for live entries only
+        """
+        if not keys:
+            return {}
+        try:
+            entries = await self._cache.get_many_with_expiry(keys)
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+            return {}
+        fresh = {}
+        for key, entry in entries.items():
+            if entry is None or self._is_stale(key, entry[1]):
+                continue
+            value, expires_at = entry
+            fresh_until = expires_at - self._stale_window(key) if expires_at is not None else None
+            fresh[key] = (json.loads(value), fresh_until)
+        return fresh
+
+    async def peek_task_entries(self, task_id: str) -> Dict[str, Tuple[Dict[str, Any], Optional[float]]]:
+        """Peek every fresh entry indexed under a task (see peek_entries)"""
+        try:
+            keys = await self._cache.tagged_keys(task_tag(task_id))
+        except Exception as e:
+            logger.warning(f"Cache list error: {e}")
+            return {}
+        return await self.peek_entries(keys)
+
+    async def record_served_hit(self, key: str, result: Dict[str, Any], tags: Sequence[str] = ()):
+        """
+        Count a hit on an entry read earlier with peek_entries and index it
+        under tags, as get_or_compute does for the hits it serves.
+        """
+        self._record_lookup(key, json.dumps(result), 0.0)
+        await self._tag(key, tags)
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Read and decode several JSON values in one backend round trip.
+
+        Returns:
+            Key -> result dict or None; every key counts as a hit or miss
+        """
+        if not keys:
+            return {}
+        started = time.perf_counter()
+        try:
+            if self.stale_windows:
+                entries = await self._cache.get_many_with_expiry(keys)
+                raw = {
+                    key: entry[0] for key, entry in entries.items()
+                    if entry is not None and not self._is_stale(key, entry[1])
+                }
+            else:
+                raw = await self._cache.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+            raw = {}
+        # Attribute the batch latency evenly to its keys
+        latency = (time.perf_counter() - started) / len(keys)
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for key in keys:
+            value = raw.get(key)
+            self._record_lookup(key, value, latency)
+            results[key] = json.loads(value) if value else None
+        return results
+
+    async def set_many(
+        self,
+        items: Dict[str, Dict[str, Any]],
+        ttl: Optional[int] = None,
+    ):
+        """
+        Encode and store several JSON values in one backend round trip.
 
+        Args:
+            items: Key -> result dict
+            ttl: Optional TTL override
+        """
+        if not items:
+            return
+        encoded = {key: json.dumps(result) for key, result in items.items()}
+        # Keys with a stale window are kept by the backend for that much longer
+        by_window: Dict[int, Dict[str, str]] = {}
+        for key, value in encoded.items():
+            by_window.setdefault(self._stale_window(key), {})[key] = value
         try:
-            import json
-            await self._cache.set(key, json.dumps(result), ttl)
-            logger.debug(f"Cached step result: {step_name}")
+            for window, batch in by_window.items():
+                await self._cache.set_many(batch, (ttl or self.default_ttl) + window)
         except Exception as e:
             logger.warning(f"Cache set error: {e}")
+            return
+        for key, value in encoded.items():
+            self._record_write(key, value)
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """
+        Delete several entries in one backend round trip.
+
+        Returns:
+            Number of entries removed
+        """
+        if not keys:
+            return 0
+        self.invalidations += 1
+        try:
+            return await self._cache.delete_many(keys)
+        except Exception as e:
+            logger.warning(f"Cache delete error: {e}")
+            return 0
+
+    async def get_or_compute(
+        self,
+        key_parts: Sequence[str],
+        coro_factory: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int] = None,
+        cache_if: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        cross_process: Optional[bool] = None,
+        tags: Sequence[str] = (),
+        allow_stale: bool = True,
+        refresh_factory: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return a cached value, computing it at most once among concurrent callers.
+
+        On a miss, the first caller runs coro_factory and stores the result;
+        concurrent callers for the same key await that result instead of
+        computing it again. Exceptions and cancellation of the computing
+        caller are propagated to every waiter.
+
+        With cross_process, callers in other processes are coalesced too:
+        the computing caller holds a lock file next to the cache entry and
+        the others poll the cache until it is filled or the lock is released.
+
+        If the key's step has a stale window (see stale_windows), an entry
+        that expired less than that many seconds ago is returned as is and
+        recomputed in the background with refresh_factory (or coro_factory).
+        At most one refresh per key runs at a time, and concurrent misses
+        join it. Await wait_for_refreshes() before the event loop shuts down.
+
+        Args:
+            key_parts: Parts joined into the cache key (see build_cache_key)
+            coro_factory: Zero-argument coroutine factory producing a JSON-serializable dict
+            ttl: Optional TTL override
+            cache_if: Predicate deciding whether a result is stored (default: always).
+                      Results that are not stored are still shared with waiters.
+            cross_process: Use a lock file (defaults to cross_process_locks)
+            tags: Secondary index tags recorded for this caller (see task_tag / step_tag)
+            allow_stale: Serve entries within their stale window. Background
+                         refreshes need the running event loop to outlive the call.
+            refresh_factory: Coroutine factory for background refreshes, for callers
+                             whose coro_factory has side effects tied to the caller
+
+        Returns:
+            Cached or freshly computed result
+        """
+        key = build_cache_key(*key_parts)
+
+        if cross_process is None:
+            cross_process = self.cross_process_locks
+
+        async def compute(factory: Callable[[], Awaitable[Dict[str, Any]]] = coro_factory):
+            if cross_process:
+                return await self._compute_locked(key, factory, ttl, cache_if)
+            return await self._compute_and_store(key, factory, ttl, cache_if)
+
+        cached, stale = await self._read(key, allow_stale=allow_stale)
+        if cached is not None:
+            await self._tag(key, tags)
+            if stale:
+                self._schedule_refresh(key, lambda: compute(refresh_factory or coro_factory))
+            return cached
+
+        result, shared = await self._singleflight.do(key, compute)
+        if shared:
+            logger.debug(f"Coalesced cache miss: {key}")
+        await self._tag(key, tags)
+        return result
+
+    def _schedule_refresh(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]):
+        """Recompute a stale entry in the background, once per key"""
+        task = self._refreshing.get(key)
+        if (task is not None and not task.done()) or self._singleflight.in_flight(key):
+            return
+
+        async def refresh():
+            try:
+                await self._singleflight.do(key, compute)
+            except Exception as e:
+                logger.warning(f"Cache refresh error ({key}): {e}")
+
+        def forget(done: asyncio.Task):
+            if self._refreshing.get(key) is done:
+                del self._refreshing[key]
+
+        task = asyncio.create_task(refresh())
+        task.add_done_callback(forget)
+        self._refreshing[key] = task
+        self._refreshes += 1
+        logger.debug(f"Serving stale cache entry, refreshing: {key}")
+
+    async def wait_for_refreshes(self):
+        """Wait until all background refreshes have finished"""
+        while self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int],
+        cache_if: Optional[Callable[[Dict[str, Any]], bool]],
+    ) -> Dict[str, Any]:
+        """Run a computation and store its result"""
+        result = await coro_factory()
+        if cache_if is None or cache_if(result):
+            await self._set_json(key, result, ttl)
+        return result
+
+    async def _compute_locked(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int],
+        cache_if: Optional[Callable[[Dict[str, Any]], bool]],
+    ) -> Dict[str, Any]:
+        """Run a computation under a cross-process lock file"""
+        lock = CacheFileLock(self._lock_path(key), stale_after=self.lock_stale_after)
+        filled: Dict[str, Any] = {}
+
+        async def cache_filled() -> bool:
+            value = await self._peek_json(key)
+            if value is not None:
+                filled["value"] = value
+            return value is not None
+
+        if not await lock.acquire(until=cache_filled):
+            return filled["value"]
+
+        try:
+            # Another process may have finished between our miss and the lock
+            value = await self._peek_json(key)
+            if value is not None:
+                return value
+            return await self._compute_and_store(key, coro_factory, ttl, cache_if)
+        finally:
+            lock.release()
+
+    def _lock_path(self, key: str) -> Path:
+        """Lock file location: beside the entry for file caches, else in lock_dir"""
+        backend = self._cache.backend if isinstance(self._cache, TieredCache) else self._cache
+        if isinstance(backend, FileCache):
+            return backend._get_cache_path(key).with_suffix(".lock")
+        return self.lock_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.lock"
+
+    async def _peek_json(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a fresh JSON value without recording hit/miss"""
+        result, _ = await self._read(key, record=False)
+        return result
+
+    async def _get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read and decode a fresh JSON value, recording hit/miss"""
+        result, _ = await self._read(key)
+        return result
+
+    async def _read(
+        self,
+        key: str,
+        allow_stale: bool = False,
+        record: bool = True,
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Read and decode a JSON value.
+
+        Args:
+            key: Cache key
+            allow_stale: Return entries that are past their TTL but within the stale window
+            record: Record the lookup as a hit or miss
+
+        Returns:
+            Tuple of (result dict or None, whether the result is stale)
+        """
+        started = time.perf_counter()
+        stale = False
+        try:
+            if self._stale_window(key):
+                entry = await self._cache.get_with_expiry(key)
+                result, expires_at = entry if entry else (None, None)
+                stale = result is not None and self._is_stale(key, expires_at)
+                if stale and not allow_stale:
+                    result, stale = None, False
+            else:
+                result = await self._cache.get(key)
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+            result = None
+        if record:
+            self._record_lookup(key, result, time.perf_counter() - started, stale)
+        return (json.loads(result) if result else None), stale
+
+    def _stale_window(self, key: str) -> int:
+        """Seconds past expiry a key may still be served"""
+        if not self.stale_windows:
+            return 0
+        return self.stale_windows.get(self._metric_step(key), 0)
+
+    def _is_stale(self, key: str, expires_at: Optional[float]) -> bool:
+        """Check whether an entry is past its TTL (and inside its stale window)"""
+        window = self._stale_window(key)
+        return bool(window) and expires_at is not None and time.time() >= expires_at - window
+
+    def _record_lookup(self, key: str, value: Optional[str], latency: float, stale: bool = False):
+        """Count a lookup in-process and in the shared metrics store"""
+        if value:
+            self._hits += 1
+            if stale:
+                self._stale_hits += 1
+        else:
+            self._misses += 1
+        if self.metrics:
+            self.metrics.record_lookup(
+                self._metric_step(key),
+                hit=bool(value),
+                latency_s=latency,
+                bytes_read=len(value.encode("utf-8")) if value else 0,
+                stale=stale,
+            )
+
+    def record_recovered_hit(self, step_name: str, rules: Sequence[str]):
+        """
+        Attribute a cache hit to the canonicalization rules it depended on.
+
+        Args:
+            step_name: Step that hit the cache
+            rules: Rules without which the lookup would have missed
+        """
+        for rule in rules:
+            self._recovered[rule] = self._recovered.get(rule, 0) + 1
+            if self.metrics:
+                self.metrics.record_recovered(step_name, rule)
+
+    def _record_write(self, key: str, value: str):
+        """Count a write in the shared metrics store"""
+        if self.metrics:
+            self.metrics.record_write(self._metric_step(key), len(value.encode("utf-8")))
+
+    @staticmethod
+    def _metric_step(key: str) -> str:
+        """Step name a key's metrics are attributed to"""
+        # Step keys have three parts after the namespace (scope, step, hash)
+        if key.count(":") >= 4:
+            return step_name_from_key(key)
+        return "other"
+
+    async def _set_json(self, key: str, result: Dict[str, Any], ttl: Optional[int] = None):
+        """Encode and store a JSON value"""
+        # Keys with a stale window are kept by the backend for that much longer
+        ttl = (ttl or self.default_ttl) + self._stale_window(key)
+        value = json.dumps(result)
+
+        try:
+            await self._cache.set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"Cache set error: {e}")
+            return
+        self._record_write(key, value)
+
+    async def _tag(self, key: str, tags: Sequence[str]):
+        """Record a key in the secondary index"""
+        if not tags:
+            return
+        try:
+            await self._cache.tag_key(key, tags)
+        except Exception as e:
+            logger.warning(f"Cache tag error: {e}")
 
     async def invalidate_step(
         self,
@@ -121,41 +651,113 @@ class CacheManager:
         input_data: str,
     ):
         """Invalidate a cached step result"""
-        input_hash = hash_input(input_data)
+        input_hash = self.canonicalizer.hash(input_data)
         key = generate_cache_key(task_id, step_name, input_hash)
+        self.invalidations += 1
 
         try:
             await self._cache.delete(key)
         except Exception as e:
             logger.warning(f"Cache invalidate error: {e}")
 
-    async def invalidate_task(self, task_id: str):
-        """Invalidate all cached results for a task"""
-        # For file cache, we'd need to iterate through files
-        # This is a simplified version that works with key patterns
+    async def invalidate_task(self, task_id: str) -> int:
+        """
+        Invalidate all cached results for a task.
+
+        Covers task-scoped results and memoized results the task produced
+        or reused, found through the secondary index.
+
+        Returns:
+            Number of entries removed
+        """
         logger.info(f"Invalidating cache for task: {task_id}")
-        # Implementation depends on backend support for pattern deletion
+        self.invalidations += 1
+        try:
+            return await self._cache.delete_tagged(task_tag(task_id))
+        except Exception as e:
+            logger.warning(f"Cache invalidate error: {e}")
+            return 0
+
+    async def purge_step(self, step_name: str) -> int:
+        """
+        Invalidate all cached results of a step, across every task.
+
+        Returns:
+            Number of entries removed
+        """
+        logger.info(f"Purging cache for step: {step_name}")
+        self.invalidations += 1
+        try:
+            return await self._cache.delete_tagged(step_tag(step_name))
+        except Exception as e:
+            logger.warning(f"Cache purge error: {e}")
+            return 0
+
+    async def list_task_steps(self, task_id: str) -> List[str]:
+        """
+        List the step names that have cached results for a task.
+
+        Returns:
+            Sorted step names
+        """
+        try:
+            keys = await self._cache.tagged_keys(task_tag(task_id))
+        except Exception as e:
+            logger.warning(f"Cache list error: {e}")
+            return []
+        return sorted({step_name_from_key(key) for key in keys})
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired entries from the backend"""
+        return await self._cache.cleanup_expired()
 
     async def clear(self):
         """Clear all cached data"""
+        self.invalidations += 1
         await self._cache.clear()
         self._hits = 0
         self._misses = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._recovered = {}
+        if isinstance(self._cache, TieredCache):
+            self._cache.reset_counters()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total = self._hits + self._misses
         hit_rate = (self._hits / total * 100) if total > 0 else 0
 
-        return {
+        stats = {
             "hits": self._hits,
+            "fresh_hits": self._hits - self._stale_hits,
+            "stale_hits": self._stale_hits,
             "misses": self._misses,
             "total_requests": total,
             "hit_rate_percent": round(hit_rate, 2),
+            "refreshes": self._refreshes,
+            "refreshes_in_flight": len(self._refreshing),
+            "recovered_by_rule": dict(self._recovered),
+            "coalescing": self._singleflight.get_stats(),
         }
+        if isinstance(self._cache, TieredCache):
+            stats["tiers"] = self._cache.get_tier_stats()
+        return stats
+
+    def get_host_stats(self) -> Dict[str, Any]:
+        """
+        Get host-wide telemetry from the shared metrics store.
+
+        Includes counts recorded by every process, not just this one.
+        Buffered counts of this process are included.
+
+        Returns:
+            Dict with "total" and per-step "steps" summaries (empty if disabled)
+        """
+        if not self.metrics:
+            return {}
+        return self.metrics.summary()
 
     async def get_backend_stats(self) -> Dict[str, Any]:
         """Get backend-specific statistics"""
-        if isinstance(self._cache, FileCache):
-            return await self._cache.get_stats()
-        return {}
+        return await self._cache.get_stats()
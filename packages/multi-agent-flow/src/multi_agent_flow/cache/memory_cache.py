@@ -0,0 +1,382 @@
+"""
+In-Memory Cache Tier
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, List, Set, Sequence, Callable
+
+from .base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache(BaseCache):
+    """
+    Bounded in-process LRU cache.
+
+    Entries are evicted in least-recently-used order once either the
+    entry-count or the byte budget is exceeded. Expiry uses the same
+    absolute ``expires_at`` timestamps as the file backend, so an entry
+    promoted from disk never outlives its on-disk copy.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Initialize memory cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Maximum total size of cached values (UTF-8 bytes)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # key -> (value, expires_at, size_bytes), ordered oldest -> newest
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float], int]]" = OrderedDict()
+        self._total_bytes = 0
+        # Secondary index: tag -> keys, key -> tags
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Set[str]] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        # Optional callback invoked with the number of entries evicted per insert
+        self.on_evict: Optional[Callable[[int], None]] = None
+
+        logger.info(f"MemoryCache initialized (max_entries={max_entries}, max_bytes={max_bytes})")
+
+    def _remove(self, key: str) -> bool:
+        """Remove an entry and release its bytes"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry[2]
+        self._untag(key)
+        return True
+
+    def _untag(self, key: str):
+        """Drop a key from every tag it is indexed under"""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _evict(self):
+        """Evict least-recently-used entries until within budget"""
+        evicted = 0
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            key, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._untag(key)
+            self._evictions += 1
+            evicted += 1
+            logger.debug(f"Memory cache evicted: {key}")
+        if evicted and self.on_evict:
+            self.on_evict(evicted)
+
+    def _lookup(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Look up a live entry, dropping it if expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at is not None and time.time() > expires_at:
+            self._remove(key)
+            self._expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return value, expires_at
+
+    async def get(self, key: str) -> Optional[str]:
+        """Retrieve a value from memory"""
+        entry = await self.get_with_expiry(key)
+        return entry[0] if entry else None
+
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Retrieve a value and its expiry timestamp from memory"""
+        entry = self._lookup(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value in memory"""
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        self.set_with_expiry(key, value, expires_at)
+
+    def set_with_expiry(self, key: str, value: str, expires_at: Optional[float] = None):
+        """
+        Store a value with an absolute expiry timestamp.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_at: Unix timestamp after which the entry is stale
+        """
+        size = len(value.encode("utf-8"))
+        self._remove(key)
+
+        if size > self.max_bytes:
+            # Never let a single oversized value flush the whole tier
+            logger.debug(f"Memory cache skipped oversized value: {key} ({size} bytes)")
+            return
+
+        self._entries[key] = (value, expires_at, size)
+        self._total_bytes += size
+        self._evict()
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from memory"""
+        return self._remove(key)
+
+    async def exists(self, key: str) -> bool:
+        """Check if a live key exists in memory"""
+        return self._lookup(key) is not None
+
+    async def clear(self):
+        """Clear all in-memory values"""
+        self._entries.clear()
+        self._tags.clear()
+        self._key_tags.clear()
+        self._total_bytes = 0
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """Index a key under tags (ignored if the key is not in memory)"""
+        if key not in self._entries:
+            return
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+            self._key_tags.setdefault(key, set()).add(tag)
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """List live in-memory keys indexed under a tag"""
+        return [key for key in list(self._tags.get(tag, ())) if self._lookup(key) is not None]
+
+    async def delete_tagged(self, tag: str) -> int:
+        """Delete in-memory entries indexed under a tag"""
+        keys = list(self._tags.pop(tag, ()))
+        return sum(1 for key in keys if self._remove(key))
+
+    async def delete_matching(self, prefix: str) -> int:
+        """Delete in-memory entries whose key starts with a prefix"""
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired in-memory entries"""
+        now = time.time()
+        expired = [
+            key for key, (_, expires_at, _) in self._entries.items()
+            if expires_at is not None and now > expires_at
+        ]
+        for key in expired:
+            self._remove(key)
+        self._expirations += len(expired)
+        return len(expired)
+
+    def reset_counters(self):
+        """Reset hit/miss/eviction counters"""
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get memory tier statistics"""
+        return self.get_tier_stats()
+
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Get memory tier statistics (synchronous)"""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "entries": len(self._entries),
+            "size_bytes": self._total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class TieredCache(BaseCache):
+    """
+    Two-tier cache: a bounded MemoryCache in front of any BaseCache backend.
+
+    Semantics:
+    - write_through: ``set`` populates both tiers. When disabled, ``set``
+      only writes the backend and drops any stale memory copy.
+    - promote_on_read: backend hits are copied into the memory tier with
+      the backend's expiry.
+
+    Hit and miss counts are tracked per tier. A backend lookup only
+    happens after a memory miss, so backend hits + misses equals the
+    memory miss count.
+    """
+
+    def __init__(
+        self,
+        backend: BaseCache,
+        memory: Optional[MemoryCache] = None,
+        write_through: bool = True,
+        promote_on_read: bool = True,
+    ):
+        """
+        Initialize tiered cache.
+
+        Args:
+            backend: Persistent cache backend (e.g. FileCache)
+            memory: Memory tier. Defaults to MemoryCache()
+            write_through: Write new values to the memory tier as well
+            promote_on_read: Copy backend hits into the memory tier
+        """
+        self.backend = backend
+        self.memory = memory or MemoryCache()
+        self.write_through = write_through
+        self.promote_on_read = promote_on_read
+
+        self._backend_hits = 0
+        self._backend_misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        """Retrieve a value, checking memory before the backend"""
+        entry = await self.get_with_expiry(key)
+        return entry[0] if entry else None
+
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Retrieve a value and its expiry, checking memory before the backend"""
+        entry = await self.memory.get_with_expiry(key)
+        if entry is not None:
+            return entry
+
+        entry = await self.backend.get_with_expiry(key)
+        if entry is None:
+            self._backend_misses += 1
+            return None
+
+        self._backend_hits += 1
+        if self.promote_on_read:
+            value, expires_at = entry
+            self.memory.set_with_expiry(key, value, expires_at)
+        return entry
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value in the backend (and memory when write-through)"""
+        await self.backend.set(key, value, ttl_seconds)
+        if self.write_through:
+            await self.memory.set(key, value, ttl_seconds)
+        else:
+            await self.memory.delete(key)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from both tiers"""
+        in_memory = await self.memory.delete(key)
+        in_backend = await self.backend.delete(key)
+        return in_memory or in_backend
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in either tier"""
+        if await self.memory.exists(key):
+            return True
+        return await self.backend.exists(key)
+
+    async def clear(self):
+        """Clear both tiers"""
+        await self.memory.clear()
+        await self.backend.clear()
+
+    async def delete_matching(self, prefix: str) -> int:
+        """Delete prefixed entries from both tiers (returns backend count)"""
+        await self.memory.delete_matching(prefix)
+        return await self.backend.delete_matching(prefix)
+
+    async def get_many_with_expiry(
+        self, keys: Sequence[str]
+    ) -> Dict[str, Optional[Tuple[str, Optional[float]]]]:
+        """Retrieve several values, fetching memory misses from the backend in one batch"""
+        entries = {key: await self.memory.get_with_expiry(key) for key in keys}
+        missing = [key for key, entry in entries.items() if entry is None]
+        if not missing:
+            return entries
+
+        for key, entry in (await self.backend.get_many_with_expiry(missing)).items():
+            if entry is None:
+                self._backend_misses += 1
+                continue
+            self._backend_hits += 1
+            if self.promote_on_read:
+                self.memory.set_with_expiry(key, entry[0], entry[1])
+            entries[key] = entry
+        return entries
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: Optional[int] = None):
+        """Store several values in the backend (and memory when write-through)"""
+        await self.backend.set_many(items, ttl_seconds)
+        for key, value in items.items():
+            if self.write_through:
+                await self.memory.set(key, value, ttl_seconds)
+            else:
+                await self.memory.delete(key)
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several values from both tiers (returns backend count)"""
+        for key in keys:
+            await self.memory.delete(key)
+        return await self.backend.delete_many(keys)
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """Index a key under tags (the backend holds the index)"""
+        await self.backend.tag_key(key, tags)
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """List live keys indexed under a tag"""
+        return await self.backend.tagged_keys(tag)
+
+    async def delete_tagged(self, tag: str) -> int:
+        """Delete tagged entries from both tiers (returns backend count)"""
+        for key in await self.backend.tagged_keys(tag):
+            await self.memory.delete(key)
+        return await self.backend.delete_tagged(tag)
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired entries from both tiers (returns backend count)"""
+        await self.memory.cleanup_expired()
+        return await self.backend.cleanup_expired()
+
+    def reset_counters(self):
+        """Reset per-tier hit/miss counters"""
+        self.memory.reset_counters()
+        self._backend_hits = 0
+        self._backend_misses = 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get backend statistics (memory tier stats via get_tier_stats)"""
+        return await self.backend.get_stats()
+
+    def get_tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get hit/miss counts for each tier"""
+        return {
+            "memory": self.memory.get_tier_stats(),
+            "backend": {
+                "hits": self._backend_hits,
+                "misses": self._backend_misses,
+                "type": type(self.backend).__name__,
+            },
+        }
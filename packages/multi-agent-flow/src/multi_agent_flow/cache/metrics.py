@@ -0,0 +1,282 @@
+"""
+Persistent cache telemetry
+
+Counters are buffered in memory and periodically added to a small SQLite
+database shared by every process on the host, so `maf cache stats` and
+the dashboard report real, host-wide hit rates.
+"""
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import closing
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+from ..shared.lifecycle import close_at_exit
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_metrics (
+    step TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (step, metric)
+) WITHOUT ROWID;
+"""
+
+# Upper bounds (milliseconds) of the lookup latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+ALL_STEPS = "*"
+
+
+def _bucket_name(latency_ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if latency_ms <= bound:
+            return f"latency_le_{bound}ms"
+    return "latency_gt_1000ms"
+
+
+LATENCY_METRICS = [f"latency_le_{b}ms" for b in LATENCY_BUCKETS_MS] + ["latency_gt_1000ms"]
+
+# Percentile reported when it falls in the open-ended bucket (JSON-safe, unlike inf)
+OPEN_LATENCY_BUCKET = f">{LATENCY_BUCKETS_MS[-1]}"
+
+
+class CacheMetrics:
+    """
+    Host-wide cache counters broken down by step name.
+
+    Recorded metrics per step: hits (of which stale_hits), misses,
+    bytes_read, bytes_written, evictions, lookup_us (total lookup time),
+    latency histogram buckets and hits recovered per canonicalization rule.
+    Updates are additive UPSERTs, so concurrent processes never overwrite
+    each other's counts.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Initialize the metrics store.
+
+        Args:
+            db_path: SQLite file. Defaults to ~/.multi-agent-flow/metrics.db
+            flush_interval: Seconds between background flushes
+        """
+        self.db_path = Path(db_path) if db_path else Path.home() / ".multi-agent-flow" / "metrics.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+
+        self._pending: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._running = False
+
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+        close_at_exit(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _add(self, step: str, metric: str, amount: int = 1):
+        with self._lock:
+            self._pending[step][metric] += amount
+        self._ensure_flusher()
+
+    # Recording
+
+    def record_lookup(
+        self,
+        step: str,
+        hit: bool,
+        latency_s: float,
+        bytes_read: int = 0,
+        stale: bool = False,
+    ):
+        """Record one cache lookup (stale hits are served past their TTL)"""
+        latency_ms = latency_s * 1000
+        with self._lock:
+            counters = self._pending[step]
+            counters["hits" if hit else "misses"] += 1
+            if hit and stale:
+                counters["stale_hits"] += 1
+            counters["bytes_read"] += bytes_read
+            counters["lookup_us"] += int(latency_s * 1_000_000)
+            counters[_bucket_name(latency_ms)] += 1
+        self._ensure_flusher()
+
+    def record_write(self, step: str, bytes_written: int):
+        """Record one cache write"""
+        self._add(step, "bytes_written", bytes_written)
+        self._add(step, "writes")
+
+    def record_recovered(self, step: str, rule: str):
+        """Record a hit that only matched thanks to a canonicalization rule"""
+        self._add(step, f"recovered_{rule}")
+
+    def record_evictions(self, count: int, tier: str = "backend"):
+        """Record evictions (not attributable to a step)"""
+        if count:
+            self._add(ALL_STEPS, f"evictions_{tier}", count)
+
+    # Persistence
+
+    def _ensure_flusher(self):
+        """Start the background flush thread on first use"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+        with self._lock:
+            if self._flush_thread and self._flush_thread.is_alive():
+                return
+            self._running = True
+
+            def flush_loop():
+                while self._running:
+                    self._flush_event.wait(self.flush_interval)
+                    self._flush_event.clear()
+                    try:
+                        self.flush()
+                    except Exception as e:
+                        logger.warning(f"Cache metrics flush error: {e}")
+
+            self._flush_thread = threading.Thread(target=flush_loop, daemon=True)
+            self._flush_thread.start()
+
+    def flush(self):
+        """Add buffered counters to the shared store"""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(int))
+
+        rows = [
+            (step, metric, value)
+            for step, counters in pending.items()
+            for metric, value in counters.items()
+            if value
+        ]
+        if not rows:
+            return
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT INTO cache_metrics (step, metric, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(step, metric) DO UPDATE SET value = value + excluded.value",
+                    rows,
+                )
+        except sqlite3.Error:
+            # Put the counts back so they are retried on the next flush
+            with self._lock:
+                for step, metric, value in rows:
+                    self._pending[step][metric] += value
+            raise
+
+    def close(self):
+        """Stop the flush thread and write remaining counters"""
+        self._running = False
+        self._flush_event.set()
+        if self._flush_thread:
+            self._flush_thread.join(timeout=5.0)
+            self._flush_thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Cache metrics flush error: {e}")
+
+    def reset(self):
+        """Delete all persisted and buffered counters"""
+        with self._lock:
+            self._pending = defaultdict(lambda: defaultdict(int))
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM cache_metrics")
+
+    # Reporting
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Persisted plus buffered counters: step -> metric -> value"""
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute("SELECT step, metric, value FROM cache_metrics").fetchall()
+
+        counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for step, metric, value in rows:
+            counters[step][metric] += value
+        with self._lock:
+            for step, pending in self._pending.items():
+                for metric, value in pending.items():
+                    counters[step][metric] += value
+        return {step: dict(metrics) for step, metrics in counters.items()}
+
+    @staticmethod
+    def _percentile_ms(counters: Dict[str, int], fraction: float) -> Optional[Union[float, str]]:
+        """
+        Approximate a latency percentile from histogram bucket bounds.
+
+        Returns:
+            Upper bound of the bucket holding the percentile, OPEN_LATENCY_BUCKET
+            if it lies above the last bound, or None without samples
+        """
+        total = sum(counters.get(m, 0) for m in LATENCY_METRICS)
+        if not total:
+            return None
+        threshold = total * fraction
+        seen = 0
+        for bound, metric in zip(LATENCY_BUCKETS_MS, LATENCY_METRICS):
+            seen += counters.get(metric, 0)
+            if seen >= threshold:
+                return float(bound)
+        return OPEN_LATENCY_BUCKET
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Host-wide summary with per-step hit rates and latency.
+
+        Returns:
+            Dict with "total" and "steps" (step name -> summary)
+        """
+        snapshot = self.snapshot()
+        steps: Dict[str, Dict[str, Any]] = {}
+        total: Dict[str, int] = defaultdict(int)
+
+        for step, counters in snapshot.items():
+            if step == ALL_STEPS:
+                continue
+            steps[step] = self._summarize(counters)
+            for metric, value in counters.items():
+                total[metric] += value
+
+        result = self._summarize(total)
+        for metric, value in snapshot.get(ALL_STEPS, {}).items():
+            result[metric] = value
+        return {"total": result, "steps": steps}
+
+    def _summarize(self, counters: Dict[str, int]) -> Dict[str, Any]:
+        hits = counters.get("hits", 0)
+        stale_hits = counters.get("stale_hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "fresh_hits": hits - stale_hits,
+            "stale_hits": stale_hits,
+            "misses": misses,
+            "hit_rate_percent": round(hits / lookups * 100, 2) if lookups else 0,
+            "bytes_read": counters.get("bytes_read", 0),
+            "bytes_written": counters.get("bytes_written", 0),
+            "writes": counters.get("writes", 0),
+            "avg_lookup_ms": round(counters.get("lookup_us", 0) / lookups / 1000, 3) if lookups else 0,
+            "p50_lookup_ms": self._percentile_ms(counters, 0.5),
+            "p95_lookup_ms": self._percentile_ms(counters, 0.95),
+            "latency_histogram": {m: counters.get(m, 0) for m in LATENCY_METRICS},
+            "recovered_by_rule": {
+                m[len("recovered_"):]: v for m, v in counters.items() if m.startswith("recovered_")
+            },
+        }
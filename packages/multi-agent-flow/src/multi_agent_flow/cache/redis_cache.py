@@ -0,0 +1,243 @@
+"""
+Redis-based Cache Implementation
+"""
+import logging
+import time
+from typing import Optional, Dict, Any, List, Tuple, Sequence
+
+from .base import BaseCache
+from .codec import ValueCodec, decode_value, is_encoded, logical_size
+from .resp import RespConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+KEY_PATTERN = "maf:cache:*"
+TAG_PREFIX = "maf:tags:"
+# Tag sets are refreshed on every write; abandoned ones expire after this
+TAG_TTL_SECONDS = 7 * 24 * 3600
+# Enough of a value's head to read a codec tag (see codec.py)
+CODEC_HEADER_BYTES = 64
+
+
+def escape_glob(value: str) -> str:
+    """Escape Redis glob metacharacters in a literal key fragment"""
+    for ch in ("\\", "*", "?", "[", "]"):
+        value = value.replace(ch, "\\" + ch)
+    return value
+
+
+class RedisCache(BaseCache):
+    """
+    Redis-based cache implementation.
+
+    Speaks RESP directly over a pooled asyncio connection, so several
+    engine hosts can share step results. Expiry uses native Redis TTLs;
+    bulk operations are pipelined into one round trip. Secondary index tags
+    are Redis sets under maf:tags:.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        max_connections: int = 10,
+        timeout: float = 5.0,
+        scan_count: int = 500,
+        codec: Optional[str] = None,
+        compress_min_bytes: int = 1024,
+    ):
+        """
+        Initialize Redis cache.
+
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Database index
+            password: Optional AUTH password
+            max_connections: Connection pool size
+            timeout: Connect timeout in seconds
+            scan_count: COUNT hint for SCAN-based operations
+            codec: Compression codec for new entries (e.g. "zlib"; None stores plain text)
+            compress_min_bytes: Values smaller than this are never compressed
+        """
+        self.pool = RespConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            max_connections=max_connections,
+            timeout=timeout,
+        )
+        self.scan_count = scan_count
+        self.codec = ValueCodec(codec, compress_min_bytes) if codec else None
+        logger.info(f"RedisCache initialized: {host}:{port}/{db}")
+
+    @staticmethod
+    def _decode(value: Optional[bytes]) -> Optional[str]:
+        return decode_value(value.decode("utf-8")) if value is not None else None
+
+    def _set_command(self, key: str, value: str, ttl_seconds: Optional[int]) -> Tuple:
+        if self.codec:
+            value = self.codec.encode(value)
+        if ttl_seconds:
+            return ("SET", key, value, "EX", int(ttl_seconds))
+        return ("SET", key, value)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Retrieve a value from cache"""
+        value = self._decode(await self.pool.execute("GET", key))
+        logger.debug(f"Cache {'hit' if value is not None else 'miss'}: {key}")
+        return value
+
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Retrieve a value and its expiry timestamp from cache"""
+        value, pttl = await self.pool.pipeline([("GET", key), ("PTTL", key)])
+        if value is None:
+            return None
+        expires_at = time.time() + pttl / 1000 if pttl >= 0 else None
+        return self._decode(value), expires_at
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value in cache"""
+        await self.pool.execute(*self._set_command(key, value, ttl_seconds))
+        logger.debug(f"Cache set: {key} (ttl={ttl_seconds})")
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from cache"""
+        return await self.pool.execute("DEL", key) > 0
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in cache"""
+        return await self.pool.execute("EXISTS", key) > 0
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Retrieve several values in one round trip"""
+        if not keys:
+            return {}
+        values = await self.pool.execute("MGET", *keys)
+        return {key: self._decode(value) for key, value in zip(keys, values)}
+
+    async def get_many_with_expiry(
+        self, keys: Sequence[str]
+    ) -> Dict[str, Optional[Tuple[str, Optional[float]]]]:
+        """Retrieve several values and their TTLs in one pipelined round trip"""
+        if not keys:
+            return {}
+        replies = await self.pool.pipeline(
+            [("MGET", *keys)] + [("PTTL", key) for key in keys]
+        )
+        now = time.time()
+        entries = {}
+        for key, value, pttl in zip(keys, replies[0], replies[1:]):
+            if value is None:
+                entries[key] = None
+            else:
+                entries[key] = (self._decode(value), now + pttl / 1000 if pttl >= 0 else None)
+        return entries
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: Optional[int] = None):
+        """Store several values in one pipelined round trip"""
+        await self.pool.pipeline([
+            self._set_command(key, value, ttl_seconds) for key, value in items.items()
+        ])
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several values in one round trip"""
+        if not keys:
+            return 0
+        return await self.pool.execute("DEL", *keys)
+
+    async def scan_keys(self, pattern: str = KEY_PATTERN) -> List[str]:
+        """Collect all keys matching a glob pattern using SCAN"""
+        keys = []
+        cursor = b"0"
+        while True:
+            cursor, batch = await self.pool.execute(
+                "SCAN", cursor, "MATCH", pattern, "COUNT", self.scan_count
+            )
+            keys.extend(k.decode("utf-8") for k in batch)
+            if cursor in (b"0", 0):
+                break
+        return keys
+
+    async def delete_matching(self, prefix: str) -> int:
+        """
+        Delete all keys starting with a prefix.
+
+        Uses SCAN (never KEYS) so large databases are not blocked.
+
+        Returns:
+            Number of keys deleted
+        """
+        keys = await self.scan_keys(escape_glob(prefix) + "*")
+        removed = 0
+        for i in range(0, len(keys), self.scan_count):
+            removed += await self.pool.execute("DEL", *keys[i:i + self.scan_count])
+        return removed
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """Add a key to each tag's set"""
+        commands = []
+        for tag in tags:
+            commands.append(("SADD", TAG_PREFIX + tag, key))
+            commands.append(("EXPIRE", TAG_PREFIX + tag, TAG_TTL_SECONDS))
+        await self.pool.pipeline(commands)
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """List live keys indexed under a tag"""
+        members = [m.decode("utf-8") for m in await self.pool.execute("SMEMBERS", TAG_PREFIX + tag)]
+        if not members:
+            return []
+        exists = await self.pool.pipeline([("EXISTS", key) for key in members])
+        return [key for key, found in zip(members, exists) if found]
+
+    async def delete_tagged(self, tag: str) -> int:
+        """Delete every entry indexed under a tag, and the tag set"""
+        members = await self.pool.execute("SMEMBERS", TAG_PREFIX + tag)
+        removed = 0
+        for i in range(0, len(members), self.scan_count):
+            removed += await self.pool.execute("DEL", *members[i:i + self.scan_count])
+        await self.pool.execute("DEL", TAG_PREFIX + tag)
+        return removed
+
+    async def clear(self):
+        """Clear all cached values (only keys in the maf:cache and maf:tags namespaces)"""
+        removed = await self.delete_matching("maf:cache:")
+        await self.delete_matching(TAG_PREFIX)
+        logger.info(f"Cache cleared ({removed} keys)")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        keys = await self.scan_keys()
+        total_size = 0
+        logical_bytes = 0
+        for i in range(0, len(keys), self.scan_count):
+            batch = keys[i:i + self.scan_count]
+            replies = await self.pool.pipeline(
+                [("STRLEN", key) for key in batch]
+                + [("GETRANGE", key, 0, CODEC_HEADER_BYTES - 1) for key in batch]
+            )
+            sizes, heads = replies[:len(batch)], replies[len(batch):]
+            total_size += sum(sizes)
+            for size, head in zip(sizes, heads):
+                text = head.decode("utf-8", errors="replace")
+                # Untagged values are stored as-is; tagged ones carry their decoded size
+                logical_bytes += logical_size(text) if is_encoded(text) else size
+
+        return {
+            "total_entries": len(keys),
+            "total_size_bytes": total_size,
+            "logical_size_bytes": logical_bytes,
+            "physical_size_bytes": total_size,
+            "codec": self.codec.name if self.codec else None,
+            "expired_entries": 0,  # Redis expires keys natively
+            "cache_dir": f"redis://{self.pool.host}:{self.pool.port}/{self.pool.db}",
+            "pool": self.pool.get_stats(),
+        }
+
+    async def close(self):
+        """Close pooled connections"""
+        await self.pool.close()
@@ -0,0 +1,216 @@
+"""
+Minimal RESP (Redis Serialization Protocol) client with connection pooling
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, List, Any, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+class RespError(Exception):
+    """Error reply returned by a RESP server"""
+    pass
+
+
+def encode_command(*args: Union[str, bytes, int, float]) -> bytes:
+    """
+    Encode a command as a RESP array of bulk strings.
+
+    Args:
+        *args: Command name followed by its arguments
+
+    Returns:
+        Wire-format bytes
+    """
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        else:
+            data = str(arg).encode("utf-8")
+        parts.append(f"${len(data)}\r\n".encode())
+        parts.append(data)
+        parts.append(b"\r\n")
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read a single RESP reply.
+
+    Error replies are returned as RespError instances (not raised) so that
+    pipelined replies can be drained completely before reporting.
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+
+    prefix, body = line[:1], line[1:-2]
+
+    if prefix == b"+":
+        return body.decode("utf-8")
+    if prefix == b"-":
+        return RespError(body.decode("utf-8"))
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        count = int(body)
+        if count == -1:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+
+    raise RespError(f"Unknown reply type: {line!r}")
+
+
+class RespConnection:
+    """A single RESP connection"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(
+        cls,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float = 5.0,
+    ) -> "RespConnection":
+        """Open a connection and authenticate/select the database"""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout=timeout
+        )
+        conn = cls(reader, writer)
+        if password:
+            await conn.execute("AUTH", password)
+        if db:
+            await conn.execute("SELECT", db)
+        return conn
+
+    async def execute(self, *args) -> Any:
+        """Send one command and return its reply"""
+        return (await self.pipeline([args]))[0]
+
+    async def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Send several commands in one write and read all replies.
+
+        Raises:
+            RespError: If any command returned an error reply
+        """
+        self.writer.write(b"".join(encode_command(*cmd) for cmd in commands))
+        await self.writer.drain()
+
+        replies = [await read_reply(self.reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def close(self):
+        """Close the connection"""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+
+
+class RespConnectionPool:
+    """
+    Bounded pool of RESP connections.
+
+    Connections are bound to the event loop that opened them. If the pool
+    is used from a new loop (e.g. successive asyncio.run calls in the CLI),
+    idle connections from the previous loop are discarded.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        max_connections: int = 10,
+        timeout: float = 5.0,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: List[RespConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._created = 0
+
+    def _bind_loop(self):
+        """Reset pool state when used from a different event loop"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._idle = []
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection for the duration of the block"""
+        self._bind_loop()
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = await RespConnection.open(
+                    self.host, self.port, self.db, self.password, self.timeout
+                )
+                self._created += 1
+
+            try:
+                yield conn
+            except RespError:
+                # Error replies are fully drained, the connection is still usable
+                self._idle.append(conn)
+                raise
+            except BaseException:
+                # Broken or cancelled mid-reply: drop it instead of pooling it
+                await conn.close()
+                raise
+            else:
+                self._idle.append(conn)
+
+    async def execute(self, *args) -> Any:
+        """Execute a single command on a pooled connection"""
+        async with self.connection() as conn:
+            return await conn.execute(*args)
+
+    async def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Execute several commands in one round trip"""
+        if not commands:
+            return []
+        async with self.connection() as conn:
+            return await conn.pipeline(commands)
+
+    async def close(self):
+        """Close all idle connections"""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
+
+    def get_stats(self) -> dict:
+        """Get pool statistics"""
+        return {
+            "max_connections": self.max_connections,
+            "idle_connections": len(self._idle),
+            "connections_created": self._created,
+        }
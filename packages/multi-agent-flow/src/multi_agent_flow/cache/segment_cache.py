@@ -0,0 +1,764 @@
+"""
+Log-structured segment cache
+
+Values are appended to rotating segment files and located through a
+compact in-memory offset index. Large agent outputs are written once and
+read back through mmap slices instead of parsing a JSON file per entry.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple, List, Set, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, a single process is assumed
+    fcntl = None
+
+from ..shared.lifecycle import close_at_exit
+from .base import BaseCache
+from .codec import ValueCodec, decode_value
+
+logger = logging.getLogger(__name__)
+
+
+SEGMENT_SUFFIX = ".seg"
+LOCK_FILENAME = "LOCK"
+
+# Record types
+PUT, DELETE, TAG = 1, 2, 3
+
+# Record header: crc32, type, key length, value length, expires_at (0 = never).
+# The CRC covers everything after itself. TAG records store the tag as key
+# and the tagged cache key as value.
+RECORD_HEADER = struct.Struct("<IBIId")
+# Footer entry per record: type, key hash, tagged key hash (TAG only), offset, expires_at
+FOOTER_ENTRY = struct.Struct("<BQQId")
+# Footer trailer: footer offset, entry count, magic
+FOOTER_TRAILER = struct.Struct("<QI8s")
+FOOTER_MAGIC = b"MAFSEG01"
+
+# Offsets are packed below the segment ID in index positions
+OFFSET_BITS = 32
+OFFSET_MASK = (1 << OFFSET_BITS) - 1
+
+
+def _hash_key(key: str) -> int:
+    """64-bit key hash used by the offset index"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class _Segment:
+    """One segment file with a read-only mapping that grows with the file"""
+
+    def __init__(self, segment_id: int, path: Path):
+        self.id = segment_id
+        self.path = path
+        self.size = 0  # bytes of records, excluding the footer
+        self.dead = 0  # bytes of records superseded or deleted
+        self.sealed = False
+        self.min_expiry: Optional[float] = None
+        # Footer entries of the segment while it is being written
+        self.entries: List[Tuple[int, int, int, int, float]] = []
+        self._map: Optional[mmap.mmap] = None
+
+    def mapping(self, end: int) -> mmap.mmap:
+        """Map the file so that it covers at least `end` bytes"""
+        if self._map is None or len(self._map) < end:
+            # Views still handed out keep the previous mapping alive
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._map) < end:
+                raise ValueError(f"Segment {self.path.name} is shorter than expected")
+        return self._map
+
+    def note_expiry(self, expires_at: float):
+        if expires_at and (self.min_expiry is None or expires_at < self.min_expiry):
+            self.min_expiry = expires_at
+
+    def release(self):
+        self._map = None
+
+
+class SegmentCache(BaseCache):
+    """
+    Append-only segment cache implementation.
+
+    Every write appends a record to the active segment file; once it
+    reaches segment_size the segment is sealed with a footer listing its
+    records (type, key hash, offset, expiry). At startup the offset index
+    is rebuilt from those footers, so only the unsealed active segment is
+    scanned and no value bytes are read.
+
+    The index maps a 64-bit key hash to (segment, offset), about 150 bytes
+    per entry regardless of value size (one million entries load from
+    footers in about a second). Reads slice the segment's mmap and
+    decode straight from the mapped pages, so values are never held in
+    memory by the cache itself. The stored key is compared on read, so hash
+    collisions show up as misses, never as wrong values.
+
+    A background thread compacts sealed segments whose superseded, deleted
+    or expired records reach compact_ratio of their size, copying live
+    records forward into the active segment and deleting the old file.
+
+    One process per directory is the writer (it holds an flock on LOCK);
+    other processes open the cache read-only and pick up the writer's new
+    records at most every sync_interval seconds.
+
+    Directory structure:
+        {cache_dir}/
+        ├── LOCK
+        ├── 00000001.seg   (sealed: records + footer)
+        └── 00000002.seg   (active: records)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        segment_size: int = 64 * 1024 * 1024,
+        compact_ratio: float = 0.5,
+        compact_interval: float = 60.0,
+        sync_interval: float = 1.0,
+        codec: Optional[str] = None,
+        compress_min_bytes: int = 1024,
+    ):
+        """
+        Initialize segment cache.
+
+        Args:
+            cache_dir: Directory for segment files.
+                       Defaults to ~/.multi-agent-flow/segments
+            segment_size: Bytes after which the active segment is sealed
+            compact_ratio: Fraction of reclaimable bytes that triggers compaction of a segment
+            compact_interval: Seconds between background compaction passes
+            sync_interval: Minimum seconds between index refreshes of a read-only instance
+            codec: Compression codec for new entries (e.g. "zlib"; None stores plain text)
+            compress_min_bytes: Values smaller than this are never compressed
+        """
+        if not 0 < segment_size <= OFFSET_MASK:
+            raise ValueError(f"segment_size must be between 1 and {OFFSET_MASK}")
+
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".multi-agent-flow" / "segments"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.compact_ratio = compact_ratio
+        self.compact_interval = compact_interval
+        self.sync_interval = sync_interval
+        self.codec = ValueCodec(codec, compress_min_bytes) if codec else None
+
+        # key hash -> segment_id << OFFSET_BITS | offset
+        self._index: Dict[int, int] = {}
+        # tag hash -> hashes of tagged keys
+        self._tags: Dict[int, Set[int]] = {}
+        self._segments: Dict[int, _Segment] = {}
+        self._active: Optional[_Segment] = None
+        self._file = None
+        self._lock = threading.RLock()
+        self._synced_at = 0.0
+
+        self._compact_event = threading.Event()
+        self._compact_thread: Optional[threading.Thread] = None
+        self._running = False
+        self.compactions = 0
+
+        self._lock_file = open(self.cache_dir / LOCK_FILENAME, 'a')
+        self.read_only = not self._acquire_writer_lock()
+
+        started = time.perf_counter()
+        self._load()
+        if not self.read_only:
+            self._open_active()
+            close_at_exit(self)
+
+        logger.info(
+            f"SegmentCache initialized: {self.cache_dir} ({len(self._index)} entries in "
+            f"{len(self._segments)} segments, {time.perf_counter() - started:.3f}s"
+            f"{', read-only' if self.read_only else ''})"
+        )
+
+    def _acquire_writer_lock(self) -> bool:
+        """Become the directory's writer unless another process already is"""
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.cache_dir / f"{segment_id:08d}{SEGMENT_SUFFIX}"
+
+    def _segment_ids(self) -> List[int]:
+        ids = []
+        for path in self.cache_dir.glob(f"*{SEGMENT_SUFFIX}"):
+            try:
+                ids.append(int(path.stem))
+            except ValueError:
+                continue
+        return sorted(ids)
+
+    # Loading
+
+    def _load(self):
+        """Rebuild the index from segment footers (scanning unsealed segments)"""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.release()
+            self._index = {}
+            self._tags = {}
+            self._segments = {}
+
+            ids = self._segment_ids()
+            for segment_id in ids:
+                segment = _Segment(segment_id, self._segment_path(segment_id))
+                self._segments[segment_id] = segment
+                if not self._load_footer(segment):
+                    self._scan(segment)
+                    if not self.read_only and segment_id != ids[-1]:
+                        # Left unsealed by a crash during rotation
+                        self._seal(segment)
+            self._synced_at = time.monotonic()
+
+    def _load_footer(self, segment: _Segment) -> bool:
+        """Index a sealed segment from its footer"""
+        try:
+            file_size = segment.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        if file_size < FOOTER_TRAILER.size:
+            return False
+
+        mapped = segment.mapping(file_size)
+        footer_offset, count, magic = FOOTER_TRAILER.unpack_from(mapped, file_size - FOOTER_TRAILER.size)
+        if magic != FOOTER_MAGIC or footer_offset + count * FOOTER_ENTRY.size + FOOTER_TRAILER.size != file_size:
+            return False
+
+        segment.size = footer_offset
+        segment.sealed = True
+        footer = memoryview(mapped)[footer_offset:footer_offset + count * FOOTER_ENTRY.size]
+        try:
+            for kind, key_hash, tagged_hash, offset, expires_at in FOOTER_ENTRY.iter_unpack(footer):
+                self._apply(segment, kind, key_hash, tagged_hash, offset, expires_at)
+        finally:
+            footer.release()
+        return True
+
+    def _scan(self, segment: _Segment, start: int = 0):
+        """Index records from `start` up to the first incomplete or corrupt record"""
+        try:
+            file_size = segment.path.stat().st_size
+        except FileNotFoundError:
+            return
+        offset = start
+        if file_size > start:
+            mapped = segment.mapping(file_size)
+            with memoryview(mapped) as view:
+                while offset + RECORD_HEADER.size <= file_size:
+                    crc, kind, key_len, value_len, expires_at = RECORD_HEADER.unpack_from(mapped, offset)
+                    end = offset + RECORD_HEADER.size + key_len + value_len
+                    if kind not in (PUT, DELETE, TAG) or end > file_size:
+                        break
+                    if zlib.crc32(view[offset + 4:end]) != crc:
+                        break
+
+                    key_start = offset + RECORD_HEADER.size
+                    key_hash = _hash_key(str(view[key_start:key_start + key_len], "utf-8"))
+                    tagged_hash = 0
+                    if kind == TAG:
+                        tagged_hash = _hash_key(str(view[key_start + key_len:end], "utf-8"))
+                    segment.entries.append((kind, key_hash, tagged_hash, offset, expires_at))
+                    self._apply(segment, kind, key_hash, tagged_hash, offset, expires_at)
+                    offset = end
+
+        segment.size = offset
+        if offset < file_size and not self.read_only:
+            logger.warning(f"Truncating {segment.path.name} at {offset} bytes (incomplete record)")
+            with open(segment.path, 'r+b') as f:
+                f.truncate(offset)
+            segment.release()
+
+    def _apply(
+        self,
+        segment: _Segment,
+        kind: int,
+        key_hash: int,
+        tagged_hash: int,
+        offset: int,
+        expires_at: float,
+    ):
+        """Apply one record to the in-memory index"""
+        if kind == PUT:
+            self._supersede(key_hash)
+            self._index[key_hash] = segment.id << OFFSET_BITS | offset
+            segment.note_expiry(expires_at)
+        elif kind == DELETE:
+            self._supersede(key_hash)
+            self._tags.pop(key_hash, None)
+        elif kind == TAG:
+            self._tags.setdefault(key_hash, set()).add(tagged_hash)
+
+    def _supersede(self, key_hash: int):
+        """Drop a key from the index, counting its record as dead"""
+        position = self._index.pop(key_hash, None)
+        if position is None:
+            return
+        segment = self._segments.get(position >> OFFSET_BITS)
+        if segment is not None:
+            segment.dead += self._record_length(segment, position & OFFSET_MASK)
+
+    def _sync(self):
+        """Pick up records written by the writer process (read-only instances)"""
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        ids = self._segment_ids()
+        if any(segment_id not in ids for segment_id in self._segments):
+            # Segments were compacted away or cleared: start over
+            self._load()
+            return
+
+        for segment_id in ids:
+            segment = self._segments.get(segment_id)
+            if segment is None:
+                segment = _Segment(segment_id, self._segment_path(segment_id))
+                self._segments[segment_id] = segment
+                if self._load_footer(segment):
+                    continue
+            elif segment.sealed:
+                continue
+            self._scan(segment, segment.size)
+            if segment_id != ids[-1]:
+                # The writer seals a segment before starting the next one
+                segment.sealed = True
+        self._synced_at = time.monotonic()
+
+    # Records
+
+    def _record_length(self, segment: _Segment, offset: int) -> int:
+        mapped = segment.mapping(offset + RECORD_HEADER.size)
+        _, _, key_len, value_len, _ = RECORD_HEADER.unpack_from(mapped, offset)
+        return RECORD_HEADER.size + key_len + value_len
+
+    def _record_key(self, segment: _Segment, offset: int) -> str:
+        mapped = segment.mapping(offset + RECORD_HEADER.size)
+        _, _, key_len, _, _ = RECORD_HEADER.unpack_from(mapped, offset)
+        key_start = offset + RECORD_HEADER.size
+        mapped = segment.mapping(key_start + key_len)
+        return mapped[key_start:key_start + key_len].decode("utf-8")
+
+    def _read(self, position: int, key: str) -> Optional[Tuple[str, float]]:
+        """Read the value at an index position if it belongs to key"""
+        segment = self._segments.get(position >> OFFSET_BITS)
+        if segment is None:
+            return None
+        offset = position & OFFSET_MASK
+        mapped = segment.mapping(offset + RECORD_HEADER.size)
+        _, _, key_len, value_len, expires_at = RECORD_HEADER.unpack_from(mapped, offset)
+        key_start = offset + RECORD_HEADER.size
+        value_start = key_start + key_len
+        mapped = segment.mapping(value_start + value_len)
+
+        if mapped[key_start:value_start] != key.encode("utf-8"):
+            return None  # hash collision
+        with memoryview(mapped) as view:
+            stored = str(view[value_start:value_start + value_len], "utf-8")
+        return stored, expires_at
+
+    def _open_active(self):
+        """Reopen the last unsealed segment for appends, or start a new one"""
+        last = self._segments[max(self._segments)] if self._segments else None
+        if last is None or last.sealed:
+            segment_id = last.id + 1 if last else 1
+            last = _Segment(segment_id, self._segment_path(segment_id))
+            self._segments[segment_id] = last
+        self._active = last
+        self._file = open(last.path, 'ab')
+
+    def _append(self, kind: int, key: str, value: str, expires_at: Optional[float]) -> int:
+        """Append a record to the active segment and return its index position"""
+        key_bytes = key.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        body = RECORD_HEADER.pack(0, kind, len(key_bytes), len(value_bytes), expires_at or 0.0)[4:]
+        body += key_bytes + value_bytes
+        record = struct.pack("<I", zlib.crc32(body)) + body
+
+        tagged_hash = _hash_key(value) if kind == TAG else 0
+        return self._append_record(record, kind, _hash_key(key), tagged_hash, expires_at or 0.0)
+
+    def _append_record(
+        self,
+        record: bytes,
+        kind: int,
+        key_hash: int,
+        tagged_hash: int,
+        expires_at: float,
+    ) -> int:
+        """Write an encoded record, rotating the active segment when full"""
+        if self.read_only:
+            raise PermissionError(f"SegmentCache is read-only (another process owns {self.cache_dir})")
+        if self._active.size and self._active.size + len(record) > self.segment_size:
+            self._rotate()
+
+        segment = self._active
+        offset = segment.size
+        self._file.write(record)
+        segment.size += len(record)
+        segment.entries.append((kind, key_hash, tagged_hash, offset, expires_at))
+        if kind == PUT:
+            segment.note_expiry(expires_at)
+        return segment.id << OFFSET_BITS | offset
+
+    def _seal(self, segment: _Segment):
+        """Write the footer of a segment"""
+        footer = b"".join(FOOTER_ENTRY.pack(*entry) for entry in segment.entries)
+        footer += FOOTER_TRAILER.pack(segment.size, len(segment.entries), FOOTER_MAGIC)
+        with open(segment.path, 'ab') as f:
+            f.write(footer)
+            f.flush()
+            os.fsync(f.fileno())
+        segment.sealed = True
+        segment.entries = []
+
+    def _rotate(self):
+        """Seal the active segment and start the next one"""
+        self._file.close()
+        self._seal(self._active)
+        self._compact_event.set()
+        self._open_active()
+
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    # BaseCache
+
+    async def get(self, key: str) -> Optional[str]:
+        """Retrieve a value from cache"""
+        entry = await self.get_with_expiry(key)
+        return entry[0] if entry else None
+
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Retrieve a value and its expiry timestamp from cache"""
+        key_hash = _hash_key(key)
+        with self._lock:
+            if self.read_only:
+                self._sync()
+            position = self._index.get(key_hash)
+            if position is None:
+                logger.debug(f"Cache miss: {key}")
+                return None
+
+            try:
+                entry = self._read(position, key)
+            except FileNotFoundError:
+                # Compacted away by the writer before this instance mapped it
+                self._synced_at = 0.0
+                entry = None
+            if entry is None:
+                logger.debug(f"Cache miss: {key}")
+                return None
+
+            stored, expires_at = entry
+            if expires_at and time.time() > expires_at:
+                logger.debug(f"Cache expired: {key}")
+                if not self.read_only:
+                    self._supersede(key_hash)
+                return None
+
+        logger.debug(f"Cache hit: {key}")
+        return decode_value(stored), expires_at or None
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value in cache"""
+        await self.set_many({key: value}, ttl_seconds)
+        logger.debug(f"Cache set: {key} (ttl={ttl_seconds})")
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: Optional[int] = None):
+        """Append several values and flush once"""
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            for key, value in items.items():
+                stored = self.codec.encode(value) if self.codec else value
+                position = self._append(PUT, key, stored, expires_at)
+                key_hash = _hash_key(key)
+                self._supersede(key_hash)
+                self._index[key_hash] = position
+            self._flush()
+        self._ensure_compactor()
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from cache"""
+        return await self.delete_many([key]) > 0
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Append tombstones for several keys and flush once"""
+        removed = 0
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                key_hash = _hash_key(key)
+                if key_hash not in self._index:
+                    continue
+                self._append(DELETE, key, "", None)
+                self._supersede(key_hash)
+                removed += 1
+            self._flush()
+        return removed
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in cache"""
+        return await self.get_with_expiry(key) is not None
+
+    def _live_keys(self, key_hashes: Sequence[int]) -> List[str]:
+        """Keys of the live entries among key_hashes (read from their records)"""
+        keys = []
+        now = time.time()
+        for key_hash in key_hashes:
+            with self._lock:
+                position = self._index.get(key_hash)
+                segment = self._segments.get(position >> OFFSET_BITS) if position is not None else None
+                if segment is None:
+                    continue
+                offset = position & OFFSET_MASK
+                mapped = segment.mapping(offset + RECORD_HEADER.size)
+                _, _, key_len, _, expires_at = RECORD_HEADER.unpack_from(mapped, offset)
+                key_start = offset + RECORD_HEADER.size
+                mapped = segment.mapping(key_start + key_len)
+                key = mapped[key_start:key_start + key_len].decode("utf-8")
+            if not (expires_at and now > expires_at):
+                keys.append(key)
+        return keys
+
+    async def delete_matching(self, prefix: str) -> int:
+        """Delete all entries whose key starts with a prefix"""
+        with self._lock:
+            key_hashes = list(self._index)
+        keys = [key for key in self._live_keys(key_hashes) if key.startswith(prefix)]
+        return await self.delete_many(keys)
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """Index a key under tags (already recorded tags are not appended again)"""
+        key_hash = _hash_key(key)
+        with self._lock:
+            appended = False
+            for tag in tags:
+                members = self._tags.setdefault(_hash_key(tag), set())
+                if key_hash in members:
+                    continue
+                self._append(TAG, tag, key, None)
+                members.add(key_hash)
+                appended = True
+            if appended:
+                self._flush()
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """List live keys indexed under a tag"""
+        with self._lock:
+            if self.read_only:
+                self._sync()
+            members = list(self._tags.get(_hash_key(tag), ()))
+        return self._live_keys(members)
+
+    async def delete_tagged(self, tag: str) -> int:
+        """Delete every entry indexed under a tag, and the tag itself"""
+        tag_hash = _hash_key(tag)
+        with self._lock:
+            members = list(self._tags.get(tag_hash, ()))
+        removed = await self.delete_many(self._live_keys(members))
+        with self._lock:
+            if tag_hash in self._tags:
+                self._append(DELETE, tag, "", None)
+                self._tags.pop(tag_hash, None)
+                self._flush()
+        return removed
+
+    async def clear(self):
+        """Clear all cached values"""
+        if self.read_only:
+            raise PermissionError(f"SegmentCache is read-only (another process owns {self.cache_dir})")
+        with self._lock:
+            self._file.close()
+            for segment in self._segments.values():
+                segment.release()
+                try:
+                    segment.path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._index = {}
+            self._tags = {}
+            self._segments = {}
+            self._open_active()
+        logger.info("Cache cleared")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            segments = list(self._segments.values())
+            total_entries = len(self._index)
+        total_size = sum(segment.size for segment in segments)
+        dead = sum(segment.dead for segment in segments)
+        return {
+            "total_entries": total_entries,
+            "total_size_bytes": total_size,
+            "segments": len(segments),
+            "dead_bytes": dead,
+            "codec": self.codec.name if self.codec else None,
+            "compactions": self.compactions,
+            "read_only": self.read_only,
+            "cache_dir": str(self.cache_dir),
+        }
+
+    async def cleanup_expired(self) -> int:
+        """Compact every sealed segment holding expired or dead records"""
+        return self.compact(min_ratio=0.0)
+
+    # Compaction
+
+    def _reclaimable(self, segment: _Segment, now: float) -> int:
+        """Dead bytes plus bytes of live but expired records in a sealed segment"""
+        reclaimable = segment.dead
+        if segment.min_expiry is None or segment.min_expiry > now:
+            return reclaimable
+
+        next_expiry = None
+        for kind, key_hash, _, offset, expires_at in self._footer_entries(segment):
+            if kind != PUT or self._index.get(key_hash) != segment.id << OFFSET_BITS | offset:
+                continue
+            if expires_at and expires_at <= now:
+                reclaimable += self._record_length(segment, offset)
+            elif expires_at and (next_expiry is None or expires_at < next_expiry):
+                next_expiry = expires_at
+        if reclaimable == segment.dead:
+            segment.min_expiry = next_expiry
+        return reclaimable
+
+    def _footer_entries(self, segment: _Segment) -> List[Tuple[int, int, int, int, float]]:
+        file_size = segment.path.stat().st_size
+        mapped = segment.mapping(file_size)
+        footer_offset, count, _ = FOOTER_TRAILER.unpack_from(mapped, file_size - FOOTER_TRAILER.size)
+        return list(FOOTER_ENTRY.iter_unpack(mapped[footer_offset:footer_offset + count * FOOTER_ENTRY.size]))
+
+    def compact(self, min_ratio: Optional[float] = None) -> int:
+        """
+        Rewrite sealed segments with enough reclaimable space.
+
+        Live records are copied forward into the active segment, then the
+        old segment file is removed. The index lock is released between
+        records, so lookups keep being served during compaction.
+
+        Args:
+            min_ratio: Reclaimable fraction that qualifies a segment
+                       (defaults to compact_ratio; 0 compacts any segment with garbage)
+
+        Returns:
+            Number of expired entries dropped
+        """
+        if self.read_only:
+            return 0
+        ratio = self.compact_ratio if min_ratio is None else min_ratio
+        now = time.time()
+
+        with self._lock:
+            sealed = sorted((s for s in self._segments.values() if s.sealed), key=lambda s: s.id)
+            candidates = []
+            for segment in sealed:
+                reclaimable = self._reclaimable(segment, now)
+                if reclaimable and reclaimable >= segment.size * ratio:
+                    candidates.append(segment)
+
+        expired = 0
+        for segment in candidates:
+            expired += self._compact_segment(segment, now)
+        return expired
+
+    def _compact_segment(self, segment: _Segment, now: float) -> int:
+        """Copy a sealed segment's live records forward and delete it"""
+        expired = 0
+        for kind, key_hash, tagged_hash, offset, expires_at in self._footer_entries(segment):
+            with self._lock:
+                position = segment.id << OFFSET_BITS | offset
+                oldest = segment.id == min(self._segments)
+
+                if kind == PUT:
+                    if self._index.get(key_hash) != position:
+                        continue
+                    if expires_at and expires_at <= now:
+                        del self._index[key_hash]
+                        expired += 1
+                        if not oldest:
+                            # Keep superseded records in older segments from resurfacing on load
+                            self._append(DELETE, self._record_key(segment, offset), "", None)
+                        continue
+                elif kind == TAG:
+                    members = self._tags.get(key_hash)
+                    if members is None or tagged_hash not in members:
+                        continue
+                    if tagged_hash not in self._index:
+                        members.discard(tagged_hash)
+                        if not members:
+                            del self._tags[key_hash]
+                        continue
+                elif kind == DELETE:
+                    # A tombstone is only needed while older segments may hold the key
+                    if oldest or key_hash in self._index or key_hash in self._tags:
+                        continue
+
+                length = self._record_length(segment, offset)
+                record = bytes(segment.mapping(offset + length)[offset:offset + length])
+                new_position = self._append_record(record, kind, key_hash, tagged_hash, expires_at)
+                if kind == PUT:
+                    self._index[key_hash] = new_position
+
+        with self._lock:
+            self._flush()
+            segment.release()
+            del self._segments[segment.id]
+            try:
+                segment.path.unlink()
+            except FileNotFoundError:
+                pass
+            self.compactions += 1
+        logger.info(f"Compacted segment {segment.path.name} ({expired} expired entries dropped)")
+        return expired
+
+    def _ensure_compactor(self):
+        """Start the background compaction thread on first write"""
+        if self._compact_thread and self._compact_thread.is_alive():
+            return
+        with self._lock:
+            if self._compact_thread and self._compact_thread.is_alive():
+                return
+            self._running = True
+
+            def compact_loop():
+                while self._running:
+                    self._compact_event.wait(self.compact_interval)
+                    self._compact_event.clear()
+                    if not self._running:
+                        break
+                    try:
+                        self.compact()
+                    except Exception as e:
+                        logger.error(f"Cache compaction error: {e}")
+
+            self._compact_thread = threading.Thread(target=compact_loop, daemon=True)
+            self._compact_thread.start()
+
+    def close(self):
+        """Stop the compaction thread and close the active segment"""
+        self._running = False
+        self._compact_event.set()
+        if self._compact_thread:
+            self._compact_thread.join(timeout=5.0)
+            self._compact_thread = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if not self._lock_file.closed:
+            self._lock_file.close()
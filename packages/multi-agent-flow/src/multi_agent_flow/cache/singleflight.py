@@ -0,0 +1,185 @@
+"""
+Single-flight request coalescing
+
+Ensures that concurrent callers asking for the same key share a single
+computation instead of each running it.
+"""
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _consume_outcome(future: asyncio.Future):
+    """Mark a future's exception as retrieved when nobody waited on it"""
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """
+    In-process call coalescing.
+
+    The first caller for a key (the leader) runs the computation; callers
+    arriving while it is in flight await the leader's outcome. Results,
+    exceptions and cancellation of the leader are delivered to every
+    waiter. A waiter being cancelled does not affect the leader.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a computation for a key is running"""
+        future = self._calls.get(key)
+        return future is not None and not future.done()
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine factory
+
+        Returns:
+            Tuple of (result, shared) where shared is True for waiters
+        """
+        loop = asyncio.get_running_loop()
+        future = self._calls.get(key)
+        # Futures from another event loop (e.g. a previous asyncio.run) cannot be awaited
+        if future is not None and not future.done() and future.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(future), True
+
+        future = loop.create_future()
+        future.add_done_callback(_consume_outcome)
+        self._calls[key] = future
+        self.leaders += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing statistics"""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": sum(1 for f in self._calls.values() if not f.done()),
+        }
+
+
+class CacheFileLock:
+    """
+    Cross-process lock backed by an exclusively created lock file.
+
+    Works on any platform and filesystem that supports O_EXCL. Locks held
+    longer than stale_after seconds (e.g. by a crashed process) are broken.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        stale_after: float = 600.0,
+        poll_interval: float = 0.1,
+    ):
+        """
+        Initialize the lock.
+
+        Args:
+            path: Lock file path
+            stale_after: Age in seconds after which a lock is considered abandoned
+            poll_interval: Seconds between acquisition attempts
+        """
+        self.path = Path(path)
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._held = False
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    def try_acquire(self) -> bool:
+        """Attempt to take the lock without waiting"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            self._break_if_stale()
+            return False
+
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        self._held = True
+        return True
+
+    def _break_if_stale(self):
+        """Remove the lock file if its holder appears to have died"""
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if age > self.stale_after:
+            logger.warning(f"Breaking stale cache lock: {self.path} ({age:.0f}s old)")
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    async def acquire(
+        self,
+        timeout: Optional[float] = None,
+        until: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> bool:
+        """
+        Wait for the lock.
+
+        Args:
+            timeout: Give up after this many seconds (None waits indefinitely)
+            until: Optional async predicate checked between attempts; waiting
+                   stops early (returning False) once it returns True
+
+        Returns:
+            True if the lock was acquired
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self.try_acquire():
+            if until is not None and await until():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    def release(self):
+        """Release the lock if held"""
+        if not self._held:
+            return
+        self._held = False
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,512 @@
+"""
+SQLite-based Cache Implementation
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple, List, Sequence, Iterable, Callable
+
+from .base import BaseCache, step_name_from_key, step_tag, task_tag
+from .codec import ValueCodec, decode_value, logical_size
+from .file_cache import read_tag_index
+
+logger = logging.getLogger(__name__)
+
+
+# Stay well below SQLite's default limit on bound parameters per statement
+MAX_VARIABLES = 500
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    size INTEGER NOT NULL,
+    logical_size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries(expires_at);
+CREATE TABLE IF NOT EXISTS cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(key);
+"""
+
+# Untags entries in the statement that deletes them. INSERT OR REPLACE does
+# not fire it (recursive_triggers is off), so overwriting an entry keeps its tags.
+UNTAG_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_cache_entries_untag
+AFTER DELETE ON cache_entries
+BEGIN
+    DELETE FROM cache_tags WHERE key = OLD.key;
+END
+"""
+
+
+class SqliteCache(BaseCache):
+    """
+    SQLite-based cache implementation.
+
+    Stores all entries in a single database file in WAL mode, so readers in
+    other processes never block on a writer. Expiry is indexed, which turns
+    stats and expiry sweeps into single queries instead of a directory walk.
+
+    Each thread gets its own connection; cross-process writers are
+    serialized by SQLite's file lock with a busy timeout. Queries run on
+    executor threads so they never block the event loop: reads on a small
+    pool, writes on a single writer thread, in the order they were issued.
+
+    The size column holds stored (possibly compressed) bytes and
+    logical_size the decoded size. Secondary index tags live in
+    cache_tags, keyed by (tag, key) so a tag lookup is an index range scan;
+    a trigger removes an entry's tags whenever the entry is deleted.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        timeout: float = 30.0,
+        codec: Optional[str] = None,
+        compress_min_bytes: int = 1024,
+        io_workers: int = 4,
+    ):
+        """
+        Initialize SQLite cache.
+
+        Args:
+            db_path: Path to the database file.
+                     Defaults to ~/.multi-agent-flow/cache.db
+            timeout: Seconds to wait on a locked database before failing
+            codec: Compression codec for new entries (e.g. "zlib"; None stores plain text)
+            compress_min_bytes: Values smaller than this are never compressed
+            io_workers: Threads for reads; writes run on one more thread
+                        (0 runs queries inline on the event loop)
+        """
+        self.db_path = Path(db_path) if db_path else Path.home() / ".multi-agent-flow" / "cache.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.codec = ValueCodec(codec, compress_min_bytes) if codec else None
+        self._local = threading.local()
+        # Every open connection, so close() can close those of executor threads
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._generation = 0
+
+        self.io_workers = io_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        if io_workers > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=io_workers, thread_name_prefix="maf-sqlite-cache"
+            )
+            # A single writer keeps writes in submission order and off
+            # SQLite's busy-wait on the write lock
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="maf-sqlite-cache-writer"
+            )
+
+        conn = self._get_connection()
+        conn.executescript(SCHEMA)
+        self._migrate_schema(conn)
+        logger.info(f"SqliteCache initialized: {self.db_path}")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get (or open) the connection for the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=self.timeout,
+                isolation_level=None,  # autocommit; transactions are explicit
+                check_same_thread=False,  # only its thread uses it; close() may close it
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            with self._connections_lock:
+                self._connections.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+        return conn
+
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """Add columns introduced after the database was created"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+        if "logical_size" not in columns:
+            conn.execute("ALTER TABLE cache_entries ADD COLUMN logical_size INTEGER")
+
+        triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        if "trg_cache_entries_untag" not in triggers:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Databases created before the trigger hold tags of deleted entries
+                conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+                conn.execute(UNTAG_TRIGGER)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """Finish pending queries and close every connection"""
+        for executor in (self._executor, self._writer):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._executor = self._writer = None
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            # Threads still holding a closed connection reopen on next use
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    # Query offloading
+
+    async def _run_read(self, fn: Callable, *args) -> Any:
+        """Run a blocking read on the reader threads (or inline when io_workers=0)"""
+        if self._executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _run_write(self, fn: Callable, *args) -> Any:
+        """Run a blocking write on the writer thread (or inline when io_workers=0)"""
+        if self._writer is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._writer, fn, *args)
+
+    def _get_sync(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        return self._get_connection().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _set_sync(self, key: str, value: str, ttl_seconds: Optional[int]):
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        stored = self.codec.encode(value) if self.codec else value
+        self._get_connection().execute(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(key, value, created_at, expires_at, size, logical_size) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, stored, now, expires_at, len(stored.encode("utf-8")),
+             len(value.encode("utf-8"))),
+        )
+
+    def _execute_sync(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run one autocommit write statement and return its row count"""
+        return self._get_connection().execute(sql, params).rowcount
+
+    def _exists_sync(self, key: str) -> bool:
+        row = self._get_connection().execute(
+            "SELECT 1 FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def _get_many_sync(self, keys: List[str]) -> Dict[str, Optional[Tuple[str, Optional[float]]]]:
+        entries: Dict[str, Optional[Tuple[str, Optional[float]]]] = dict.fromkeys(keys)
+        now = time.time()
+
+        conn = self._get_connection()
+        conn.execute("BEGIN")
+        try:
+            for i in range(0, len(keys), MAX_VARIABLES):
+                chunk = keys[i:i + MAX_VARIABLES]
+                rows = conn.execute(
+                    "SELECT key, value, expires_at FROM cache_entries "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    if expires_at is None or expires_at > now:
+                        entries[key] = (decode_value(value), expires_at)
+        finally:
+            conn.execute("COMMIT")
+        return entries
+
+    def _set_many_sync(self, items: Dict[str, str], ttl_seconds: Optional[int]):
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        rows = []
+        for key, value in items.items():
+            stored = self.codec.encode(value) if self.codec else value
+            rows.append((key, stored, now, expires_at, len(stored.encode("utf-8")),
+                         len(value.encode("utf-8"))))
+
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, value, created_at, expires_at, size, logical_size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _delete_many_sync(self, keys: List[str]) -> int:
+        removed = 0
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for i in range(0, len(keys), MAX_VARIABLES):
+                chunk = keys[i:i + MAX_VARIABLES]
+                removed += conn.execute(
+                    f"DELETE FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def _tag_key_sync(self, key: str, tags: Sequence[str]):
+        self._get_connection().executemany(
+            "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+            [(tag, key) for tag in tags],
+        )
+
+    def _tagged_keys_sync(self, tag: str) -> List[str]:
+        rows = self._get_connection().execute(
+            "SELECT t.key FROM cache_tags t JOIN cache_entries e ON e.key = t.key "
+            "WHERE t.tag = ? AND (e.expires_at IS NULL OR e.expires_at > ?)",
+            (tag, time.time()),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _delete_tagged_sync(self, tag: str) -> int:
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag = ?)",
+                (tag,),
+            )
+            conn.execute("DELETE FROM cache_tags WHERE tag = ?", (tag,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+    def _clear_sync(self):
+        self._get_connection().execute("DELETE FROM cache_entries")
+        self._get_connection().execute("DELETE FROM cache_tags")
+
+    def _stats_sync(self) -> Dict[str, Any]:
+        total_entries, total_size, logical_bytes, expired_count = self._get_connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+            "COALESCE(SUM(COALESCE(logical_size, size)), 0), "
+            "COALESCE(SUM(expires_at IS NOT NULL AND expires_at <= ?), 0) "
+            "FROM cache_entries",
+            (time.time(),),
+        ).fetchone()
+
+        return {
+            "total_entries": total_entries,
+            "total_size_bytes": total_size,
+            "logical_size_bytes": logical_bytes,
+            "physical_size_bytes": total_size,
+            "codec": self.codec.name if self.codec else None,
+            "expired_entries": expired_count,
+            "cache_dir": str(self.db_path),
+            "io_workers": self.io_workers,
+        }
+
+    # BaseCache interface
+
+    async def get(self, key: str) -> Optional[str]:
+        """Retrieve a value from cache"""
+        entry = await self.get_with_expiry(key)
+        return entry[0] if entry else None
+
+    async def get_with_expiry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Retrieve a value and its expiry timestamp from cache"""
+        row = await self._run_read(self._get_sync, key)
+
+        if row is None:
+            logger.debug(f"Cache miss: {key}")
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and time.time() > expires_at:
+            logger.debug(f"Cache expired: {key}")
+            await self.delete(key)
+            return None
+
+        logger.debug(f"Cache hit: {key}")
+        return decode_value(value), expires_at
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value in cache"""
+        await self._run_write(self._set_sync, key, value, ttl_seconds)
+        logger.debug(f"Cache set: {key} (ttl={ttl_seconds})")
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from cache"""
+        removed = await self._run_write(
+            self._execute_sync, "DELETE FROM cache_entries WHERE key = ?", (key,)
+        )
+        return removed > 0
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in cache"""
+        return await self._run_read(self._exists_sync, key)
+
+    async def delete_matching(self, prefix: str) -> int:
+        """Delete all entries whose key starts with a prefix"""
+        # Range scan on the primary key instead of LIKE, which cannot use the index
+        return await self._run_write(
+            self._execute_sync,
+            "DELETE FROM cache_entries WHERE key >= ? AND key < ?",
+            (prefix, prefix + "\U0010ffff"),
+        )
+
+    async def get_many_with_expiry(
+        self, keys: Sequence[str]
+    ) -> Dict[str, Optional[Tuple[str, Optional[float]]]]:
+        """Retrieve several values in one read transaction"""
+        return await self._run_read(self._get_many_sync, list(dict.fromkeys(keys)))
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: Optional[int] = None):
+        """Store several values in one transaction"""
+        await self._run_write(self._set_many_sync, items, ttl_seconds)
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several values in one transaction"""
+        return await self._run_write(self._delete_many_sync, list(dict.fromkeys(keys)))
+
+    async def tag_key(self, key: str, tags: Sequence[str]):
+        """Index a key under tags"""
+        await self._run_write(self._tag_key_sync, key, list(tags))
+
+    async def tagged_keys(self, tag: str) -> List[str]:
+        """List live keys indexed under a tag"""
+        return await self._run_read(self._tagged_keys_sync, tag)
+
+    async def delete_tagged(self, tag: str) -> int:
+        """Delete every entry indexed under a tag, and the tag itself"""
+        return await self._run_write(self._delete_tagged_sync, tag)
+
+    async def clear(self):
+        """Clear all cached values"""
+        await self._run_write(self._clear_sync)
+        logger.info("Cache cleared")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return await self._run_read(self._stats_sync)
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired cache entries"""
+        removed_count = await self._run_write(
+            self._execute_sync,
+            "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        )
+        logger.info(f"Cleaned up {removed_count} expired cache entries")
+        return removed_count
+
+    def migrate_from_file_cache(self, cache_dir: Optional[Path] = None) -> int:
+        """
+        Import all live entries from a FileCache directory, with their tags.
+
+        Runs in a single transaction, so a failed migration leaves the
+        database untouched. The source directory is not modified.
+
+        Args:
+            cache_dir: FileCache directory. Defaults to ~/.multi-agent-flow/cache
+
+        Returns:
+            Number of entries imported
+        """
+        cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".multi-agent-flow" / "cache"
+        if not cache_dir.exists():
+            return 0
+
+        now = time.time()
+        rows = []
+        for cache_file in cache_dir.glob("*/*.json"):
+            try:
+                with open(cache_file, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+
+            key = data.get("key")
+            value = data.get("value")
+            expires_at = data.get("expires_at")
+            if key is None or value is None:
+                continue
+            if expires_at is not None and now > expires_at:
+                continue
+
+            rows.append((
+                key,
+                value,
+                data.get("created_at", now),
+                expires_at,
+                len(value.encode("utf-8")),
+                logical_size(value),
+            ))
+
+        migrated = {row[0] for row in rows}
+        tag_rows = [
+            (tag, key)
+            for tag, keys in read_tag_index(cache_dir, _candidate_tags(migrated)).items()
+            for key in keys
+            if key in migrated
+        ]
+
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, value, created_at, expires_at, size, logical_size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                tag_rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        logger.info(f"Migrated {len(rows)} entries ({len(tag_rows)} tags) from {cache_dir}")
+        return len(rows)
+
+
+def _candidate_tags(keys: Iterable[str]) -> List[str]:
+    """
+    Tags that step cache keys imply, for tag files that do not record their tag.
+
+    Task-scoped keys (maf:cache:{task}:{step}:{hash}) name their task and
+    step; content-addressed keys (maf:cache:step:{step}:{fingerprint}) only
+    their step, so tasks that only produced memoized results cannot be
+    recovered from legacy tag files.
+    """
+    tags = set()
+    for key in keys:
+        if not key.startswith("maf:cache:") or key.count(":") < 4:
+            continue
+        tags.add(step_tag(step_name_from_key(key)))
+        scope = key[len("maf:cache:"):].rsplit(":", 2)[0]
+        if scope != "step":
+            tags.add(task_tag(scope))
+    return sorted(tags)
@@ -9,6 +9,7 @@ Usage:
     maf workflow  - Start a workflow
 """
 import os
+import getpass
 import sys
 import time
 import signal
@@ -16,6 +17,7 @@ import subprocess
 import argparse
 import json
 import logging
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -44,6 +46,9 @@ BACKEND_AGENTS = {
     "analyzer": {"port": 8004, "module": "multi_agent_flow.agents.analyzer.main:app"},
 }
 
+# Seconds per priority step of the scheduler daemon's queue aging
+DEFAULT_AGING_SECONDS = 300.0
+
 
 def get_pid_dir() -> Path:
     """Get PID directory path"""
@@ -334,7 +339,7 @@ def workflow(task_description: str):
         print(f"Make sure agents are running: maf start")
 
 
-def run_workflow(task_description: str, with_dashboard: bool = False):
+def run_workflow(task_description: str, with_dashboard: bool = False, use_cache: bool = True):
     """Run a full agent chaining workflow (Phase 3 & 4)"""
     print_banner()
     print(f"{BLUE}  Starting Agent Chaining Workflow...{NC}\n")
@@ -375,7 +380,8 @@ def run_workflow(task_description: str, with_dashboard: bool = False):
         # Set up callbacks
         def on_step_complete(tid, result):
             icon = f"{GREEN}✓{NC}" if result.status.value == "success" else f"{RED}✗{NC}"
-            print(f"    {icon} {result.step_name.value:12} - {result.status.value}")
+            cached = f" {CYAN}(cached){NC}" if result.cached else ""
+            print(f"    {icon} {result.step_name.value:12} - {result.status.value}{cached}")
 
         def on_workflow_complete(state):
             if state.status.value == "COMPLETED":
@@ -391,13 +397,14 @@ def run_workflow(task_description: str, with_dashboard: bool = False):
         print(f"    Planner → Writer → Reviewer → Tester → Analyzer\n")
 
         # Start and execute workflow
-        engine.start_workflow(task_id, task_description)
+        engine.start_workflow(task_id, task_description, use_cache=use_cache)
 
         if notification_manager:
             # Run async workflow
             state = asyncio.run(engine.execute_workflow_async(task_id))
         else:
             state = engine.execute_workflow(task_id)
+        engine.close()
 
         print(f"\n  Final Status: {state.status.value}")
         print(f"  Steps Completed: {len([h for h in state.history if h.status.value == 'success'])}/5")
@@ -441,9 +448,9 @@ def workflow_list():
             print(f"  {YELLOW}No workflows found.{NC}")
             return
 
-        print("  " + "=" * 70)
-        print(f"  {'TASK ID':<20} {'STATUS':<15} {'STEP':<12} {'UPDATED':<20}")
-        print("  " + "-" * 70)
+        print("  " + "=" * 78)
+        print(f"  {'TASK ID':<20} {'STATUS':<15} {'STEP':<12} {'CACHED':<7} {'UPDATED':<20}")
+        print("  " + "-" * 78)
 
         for wf in workflows:
             status_color = GREEN if wf["status"] == "COMPLETED" else (
@@ -453,29 +460,65 @@ def workflow_list():
                 f"  {wf['task_id']:<20} "
                 f"{status_color}{wf['status']:<15}{NC} "
                 f"{wf['current_step'] or 'N/A':<12} "
+                f"{len(wf['predicted_cache_hits']):<7} "
                 f"{wf['last_updated'][:19]}"
             )
 
-        print("  " + "=" * 70)
+        print("  " + "=" * 78)
         print(f"  Total: {len(workflows)} workflows")
 
     except Exception as e:
         print(f"{RED}  Failed to list workflows: {e}{NC}")
 
 
-def task_submit(description: str, role: str, priority: str = "NORMAL"):
+def daemon_queue(aging: Optional[float] = DEFAULT_AGING_SECONDS, fair_share: bool = False):
+    """The durable task queue, in the scheduler daemon's dispatch order"""
+    from multi_agent_flow.scheduler import SqliteTaskQueue, FairShare
+
+    return SqliteTaskQueue(
+        aging_seconds=aging or None,
+        fair_share=FairShare() if fair_share else None,
+        edf=True,
+    )
+
+
+def installed_agents(agents_config: dict, agent_cli_config=None) -> dict:
+    """Launcher agents whose CLI is installed (the agents the daemon runs tasks on)"""
+    from multi_agent_flow.agents import AgentRunner
+
+    runner = AgentRunner(config=agent_cli_config)
+    return {
+        agent_id: config for agent_id, config in agents_config.items()
+        if runner.check_agent_available(config.model)
+    }
+
+
+def task_submit(
+    description: str,
+    role: str,
+    priority: str = "NORMAL",
+    submitter: Optional[str] = None,
+    deadline_in: Optional[float] = None,
+    estimate: Optional[float] = None,
+    aging: Optional[float] = DEFAULT_AGING_SECONDS,
+    fair_share: bool = False,
+):
     """Submit a task to the scheduler"""
     print_banner()
     print(f"{BLUE}  Submitting Task...{NC}\n")
 
     try:
-        from multi_agent_flow.scheduler import TaskScheduler, TaskPriority
+        from multi_agent_flow.scheduler import TaskScheduler, TaskPriority, AgentStateManager
         from multi_agent_flow.launcher import LauncherManager
 
-        # Initialize scheduler with launcher config
-        manager = LauncherManager(port_range=(8000, 8010))
-        scheduler = TaskScheduler()
-        scheduler.register_agents_from_config(manager.agents_config)
+        # Only queue the task (durable queue shared with `maf scheduler`).
+        # Admission estimates use the daemon's dispatch order and a read-only
+        # view of its agents, or the installed agents before it first ran.
+        agents = AgentStateManager(read_only=True)
+        scheduler = TaskScheduler(queue=daemon_queue(aging, fair_share), state_manager=agents)
+        if not agents.get_all_states():
+            manager = LauncherManager(port_range=(8000, 8010))
+            scheduler.register_agents_from_config(installed_agents(manager.agents_config))
 
         # Map priority string to enum
         priority_map = {
@@ -486,14 +529,32 @@ def task_submit(description: str, role: str, priority: str = "NORMAL"):
         task_priority = priority_map.get(priority.upper(), TaskPriority.NORMAL)
 
         # Submit task
-        task = scheduler.submit_task(description, role, task_priority)
+        # Submitter defaults to the OS user (fair share between submitters)
+        deadline = None
+        if deadline_in is not None:
+            deadline = datetime.now(timezone.utc) + timedelta(minutes=deadline_in)
+        task = scheduler.submit_task(
+            description,
+            role,
+            task_priority,
+            submitter=submitter or getpass.getuser(),
+            deadline=deadline,
+            estimated_seconds=estimate * 60 if estimate is not None else None,
+        )
 
         print(f"{GREEN}  Task submitted successfully!{NC}")
         print(f"\n  Task ID:     {task.id}")
         print(f"  Description: {task.description}")
         print(f"  Target Role: {task.target_role}")
         print(f"  Priority:    {task.priority.value}")
+        print(f"  Submitter:   {task.metadata['submitter']}")
+        if task.deadline:
+            print(f"  Deadline:    {task.deadline} UTC")
+            if task.metadata.get("deadline_at_risk"):
+                print(f"  {YELLOW}Warning: predicted to finish at {task.metadata['predicted_finish']} UTC, "
+                      f"after its deadline{NC}")
         print(f"  Status:      {task.status.value}")
+        print(f"\n  Queued in {scheduler.queue.db_path} (run `maf scheduler` to execute)")
 
     except Exception as e:
         print(f"{RED}  Failed to submit task: {e}{NC}")
@@ -507,17 +568,94 @@ def queue_status():
     print(f"{BLUE}  Task Queue Status{NC}\n")
 
     try:
-        from multi_agent_flow.scheduler import TaskScheduler
+        from multi_agent_flow.scheduler import SqliteTaskQueue, AgentStateManager
+
+        # Dispatch and SLA statistics live in the daemon; show the shared
+        # queue and the agent states the daemon last wrote
+        queue = SqliteTaskQueue()
+        stats = queue.stats()
+        print("=" * 60)
+        print(f"  Queue: {queue.db_path}")
+        print(f"  Tasks - Pending: {stats['pending']} | Running: {stats['running']} | "
+              f"Completed: {stats['completed']} | Failed: {stats['failed']}")
+        agents = AgentStateManager(read_only=True)
+        if agents.get_all_states():
+            print(agents.print_status())
+        else:
+            print("=" * 60)
+            print(f"  {YELLOW}No agent states yet (run `maf scheduler`){NC}")
+
+    except Exception as e:
+        print(f"{RED}  Failed to get queue status: {e}{NC}")
+
+
+def scheduler_daemon(
+    executor: str = "thread",
+    max_workers: int = 8,
+    retain: int = 1000,
+    retain_hours: float = 168.0,
+    aging: Optional[float] = DEFAULT_AGING_SECONDS,
+    fair_share: bool = False,
+):
+    """Run a long-lived scheduler that executes tasks queued by `maf task`"""
+    print_banner()
+    print(f"{BLUE}  Starting Task Scheduler...{NC}\n")
+
+    try:
+        from multi_agent_flow.scheduler import TaskScheduler, RetentionPolicy, FileResultStore
         from multi_agent_flow.launcher import LauncherManager
+        from multi_agent_flow.agents import AgentTaskHandler
 
         manager = LauncherManager(port_range=(8000, 8010))
-        scheduler = TaskScheduler()
-        scheduler.register_agents_from_config(manager.agents_config)
 
-        scheduler.print_status()
+        # Tasks run on the agents' CLIs; agents whose CLI is missing are not
+        # registered, so their tasks wait instead of failing
+        handler = AgentTaskHandler()
+        agents_config = installed_agents(manager.agents_config, handler.config)
+        skipped = sorted(set(manager.agents_config) - set(agents_config))
+        if not agents_config:
+            print(f"{RED}  No agent CLI is installed, so no task can be executed.{NC}")
+            print("  Install one of: " + ", ".join(sorted(handler.config.agents)) + " (see `maf agents`)")
+            return
+
+        # Finished tasks are pruned and large results kept on disk, so the
+        # queue does not grow with agent output over a long run
+        scheduler = TaskScheduler(
+            queue=daemon_queue(aging, fair_share),
+            executor=executor,
+            max_workers=max_workers,
+            retention=RetentionPolicy(max_age_seconds=retain_hours * 3600, max_finished=retain),
+            result_store=FileResultStore(),
+        )
+        scheduler.register_agents_from_config(agents_config)
+        for role in sorted({role for config in agents_config.values() for role in config.roles}):
+            scheduler.register_task_handler(role, handler)
+        scheduler.start()
+
+        print(f"  Queue:     {scheduler.queue.db_path}")
+        print(f"  Scheduler: {scheduler.scheduler_id}")
+        print(f"  Executor:  {executor} (max_workers={max_workers})")
+        print(f"  Ordering:  earliest deadline first, then "
+              f"{'aging every ' + format(aging, 'g') + 's' if aging else 'strict priority'}"
+              f"{', fair share across roles/submitters' if fair_share else ''}")
+        print(f"  Retention: {retain} finished tasks, {retain_hours:g}h "
+              f"(results in {scheduler.result_store.directory})")
+        print(f"  Agents:    {', '.join(f'{a} ({c.model})' for a, c in agents_config.items())}")
+        if skipped:
+            print(f"  {YELLOW}Skipped (CLI not installed): {', '.join(skipped)}; "
+                  f"tasks for their roles stay queued{NC}")
+        print(f"\n  {YELLOW}Press Ctrl+C to stop (running tasks are drained){NC}")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n  Stopping scheduler...")
+            scheduler.stop(drain=True)
+            print(f"{GREEN}  Scheduler stopped.{NC}")
 
     except Exception as e:
-        print(f"{RED}  Failed to get queue status: {e}{NC}")
+        print(f"{RED}  Failed to run scheduler: {e}{NC}")
 
 
 # Phase 4 Functions
@@ -608,7 +746,12 @@ def check_agents():
         print(f"{RED}  Failed to check agents: {e}{NC}")
 
 
-def cache_action(action: str):
+def cache_action(
+    action: str,
+    backend: str = "file",
+    task_id: Optional[str] = None,
+    step_name: Optional[str] = None,
+):
     """Manage workflow cache"""
     print_banner()
     print(f"{BLUE}  Cache Management{NC}\n")
@@ -617,34 +760,96 @@ def cache_action(action: str):
         from multi_agent_flow.cache.manager import CacheManager
         import asyncio
 
-        manager = CacheManager()
+        if action == "migrate":
+            from multi_agent_flow.cache.sqlite_cache import SqliteCache
+            migrated = SqliteCache().migrate_from_file_cache()
+            print(f"  {GREEN}Migrated {migrated} entries from file cache to SQLite.{NC}")
+            return
+
+        manager = CacheManager(backend=backend)
 
         if action == "stats":
             stats = manager.get_stats()
             backend_stats = asyncio.run(manager.get_backend_stats())
 
-            print(f"  {CYAN}Cache Statistics:{NC}")
-            print(f"    Hits:         {stats['hits']}")
-            print(f"    Misses:       {stats['misses']}")
-            print(f"    Hit Rate:     {stats['hit_rate_percent']}%")
+            host_stats = manager.get_host_stats()
+            total = host_stats.get("total", stats)
+
+            print(f"  {CYAN}Cache Statistics (host-wide):{NC}")
+            print(f"    Hits:         {total['hits']} (fresh={total['fresh_hits']}, stale={total['stale_hits']})")
+            print(f"    Misses:       {total['misses']}")
+            print(f"    Hit Rate:     {total['hit_rate_percent']}%")
+            if host_stats:
+                print(f"    Read/Written: {total['bytes_read'] / 1024:.2f} KB / "
+                      f"{total['bytes_written'] / 1024:.2f} KB")
+                evictions = {k[len("evictions_"):]: v for k, v in total.items() if k.startswith("evictions_")}
+                if evictions:
+                    print("    Evictions:    " + ", ".join(f"{tier}={n}" for tier, n in evictions.items()))
+                if total.get("recovered_by_rule"):
+                    print("    Recovered:    " + ", ".join(
+                        f"{rule}={n}" for rule, n in sorted(total["recovered_by_rule"].items())
+                    ) + " (hits only matched after canonicalization)")
+
+            for tier, tier_stats in stats.get("tiers", {}).items():
+                print(f"    {tier.capitalize():13} hits={tier_stats['hits']} misses={tier_stats['misses']}")
+
+            if host_stats.get("steps"):
+                print(f"\n  {CYAN}By Step:{NC}")
+                print(f"    {'Step':12} {'Hits':>6} {'Stale':>6} {'Misses':>7} {'Hit%':>7} {'Avg ms':>8} {'p95 ms':>8}")
+                for step, s in sorted(host_stats["steps"].items()):
+                    p95 = s["p95_lookup_ms"]
+                    p95_text = "-" if p95 is None else f"<={p95:.0f}" if isinstance(p95, float) else p95
+                    print(f"    {step:12} {s['hits']:>6} {s['stale_hits']:>6} {s['misses']:>7} {s['hit_rate_percent']:>6}% "
+                          f"{s['avg_lookup_ms']:>8} {p95_text:>8}")
 
             if backend_stats:
                 print(f"\n  {CYAN}Backend Statistics:{NC}")
                 print(f"    Total Entries: {backend_stats.get('total_entries', 'N/A')}")
                 print(f"    Total Size:    {backend_stats.get('total_size_bytes', 0) / 1024:.2f} KB")
+                if "logical_size_bytes" in backend_stats:
+                    logical = backend_stats["logical_size_bytes"]
+                    physical = backend_stats.get("physical_size_bytes", 0)
+                    ratio = f" ({logical / physical:.1f}x)" if physical and backend_stats.get("codec") else ""
+                    print(f"    Logical Size:  {logical / 1024:.2f} KB{ratio} "
+                          f"codec={backend_stats.get('codec') or 'none'}")
                 print(f"    Expired:       {backend_stats.get('expired_entries', 'N/A')}")
                 print(f"    Location:      {backend_stats.get('cache_dir', 'N/A')}")
+                if "segments" in backend_stats:
+                    print(f"    Segments:      {backend_stats['segments']} "
+                          f"({backend_stats['dead_bytes'] / 1024:.2f} KB reclaimable, "
+                          f"{backend_stats['compactions']} compacted)")
+                if "eviction_policy" in backend_stats:
+                    quota = backend_stats.get("max_bytes")
+                    quota_text = f"{quota / 1024 / 1024:.1f} MB" if quota else "unbounded"
+                    print(f"    Quota:         {quota_text} ({backend_stats['eviction_policy']}, "
+                          f"{backend_stats.get('evictions', 0)} evicted)")
 
         elif action == "clear":
             asyncio.run(manager.clear())
             print(f"  {GREEN}Cache cleared.{NC}")
 
         elif action == "cleanup":
-            from multi_agent_flow.cache.file_cache import FileCache
-            cache = FileCache()
-            removed = asyncio.run(cache.cleanup_expired())
+            removed = asyncio.run(manager.cleanup_expired())
             print(f"  {GREEN}Removed {removed} expired entries.{NC}")
 
+        elif action == "invalidate":
+            if not task_id and not step_name:
+                print(f"{RED}  Specify --task TASK_ID and/or --step STEP_NAME{NC}")
+                return
+
+            async def invalidate():
+                removed = 0
+                if task_id:
+                    steps = await manager.list_task_steps(task_id)
+                    print(f"  Task {task_id}: {', '.join(steps) if steps else 'no cached steps'}")
+                    removed += await manager.invalidate_task(task_id)
+                if step_name:
+                    removed += await manager.purge_step(step_name)
+                return removed
+
+            removed = asyncio.run(invalidate())
+            print(f"  {GREEN}Invalidated {removed} entries.{NC}")
+
     except Exception as e:
         print(f"{RED}  Cache action failed: {e}{NC}")
 
@@ -670,6 +875,7 @@ Phase 1 (launch):
 Phase 2 (scheduler):
   maf task "desc" writer --priority HIGH
   maf queue
+  maf scheduler            # Execute queued tasks (long-running)
 
 Phase 3 (workflow):
   maf run "Create REST API"  # Full agent chaining
@@ -681,6 +887,8 @@ Phase 4 (real integration):
   maf dashboard            # Start real-time WebSocket dashboard
   maf monitor              # Monitor workflows in terminal
   maf cache stats          # View cache statistics
+  maf cache migrate        # Copy file cache entries into SQLite
+  maf cache invalidate --task ID   # Drop cached results of a task
 """
     )
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -709,14 +917,38 @@ Phase 4 (real integration):
                             help="Target agent role")
     task_parser.add_argument("-p", "--priority", choices=["HIGH", "NORMAL", "LOW"],
                             default="NORMAL", help="Task priority (default: NORMAL)")
+    task_parser.add_argument("--submitter", help="Submitter name for fair share (default: OS user)")
+    task_parser.add_argument("--deadline-in", type=float, metavar="MINUTES",
+                            help="Task must finish within this many minutes")
+    task_parser.add_argument("--estimate", type=float, metavar="MINUTES",
+                            help="Expected run time, used to check the deadline at submission")
+    task_parser.add_argument("--aging", type=float, default=DEFAULT_AGING_SECONDS,
+                            help="The scheduler daemon's --aging, used to estimate the finish (default: 300)")
+    task_parser.add_argument("--fair-share", action="store_true",
+                            help="The scheduler daemon runs with --fair-share")
 
     # queue command (Phase 2 - scheduler)
     subparsers.add_parser("queue", help="Show task queue status")
 
+    # scheduler command (Phase 2 - scheduler daemon)
+    scheduler_parser = subparsers.add_parser("scheduler", help="Run the task scheduler daemon")
+    scheduler_parser.add_argument("--executor", choices=["thread", "process", "asyncio"], default="thread",
+                                  help="Task executor (default: thread)")
+    scheduler_parser.add_argument("--workers", type=int, default=8, help="Max concurrent tasks (default: 8)")
+    scheduler_parser.add_argument("--aging", type=float, default=DEFAULT_AGING_SECONDS,
+                                  help="Seconds of waiting per priority level gained (0: strict priority, default: 300)")
+    scheduler_parser.add_argument("--fair-share", action="store_true",
+                                  help="Share dispatches fairly across roles and submitters")
+    scheduler_parser.add_argument("--retain", type=int, default=1000,
+                                  help="Finished tasks kept in the queue (default: 1000)")
+    scheduler_parser.add_argument("--retain-hours", type=float, default=168.0,
+                                  help="Hours finished tasks are kept (default: 168)")
+
     # run command (Phase 3 - workflow engine)
     run_parser = subparsers.add_parser("run", help="Run a full agent chaining workflow")
     run_parser.add_argument("task", help="Task description")
     run_parser.add_argument("--dashboard", "-d", action="store_true", help="Enable real-time dashboard notifications")
+    run_parser.add_argument("--no-cache", action="store_true", help="Bypass memoized step results")
 
     # wf-status command (Phase 3)
     wf_status_parser = subparsers.add_parser("wf-status", help="Check workflow status")
@@ -741,7 +973,12 @@ Phase 4 (real integration):
 
     # cache command
     cache_parser = subparsers.add_parser("cache", help="Manage workflow cache")
-    cache_parser.add_argument("action", choices=["stats", "clear", "cleanup"], help="Cache action")
+    cache_parser.add_argument("action", choices=["stats", "clear", "cleanup", "migrate", "invalidate"],
+                              help="Cache action")
+    cache_parser.add_argument("--backend", choices=["file", "sqlite", "segment"], default="file",
+                              help="Cache backend (default: file)")
+    cache_parser.add_argument("--task", help="Task ID (for invalidate)")
+    cache_parser.add_argument("--step", help="Step name to purge across all tasks (for invalidate)")
 
     args = parser.parse_args()
 
@@ -756,11 +993,14 @@ Phase 4 (real integration):
     elif args.command == "workflow":
         workflow(args.task)
     elif args.command == "task":
-        task_submit(args.description, args.role, args.priority)
+        task_submit(args.description, args.role, args.priority, args.submitter, args.deadline_in, args.estimate,
+                    args.aging, args.fair_share)
     elif args.command == "queue":
         queue_status()
+    elif args.command == "scheduler":
+        scheduler_daemon(args.executor, args.workers, args.retain, args.retain_hours, args.aging, args.fair_share)
     elif args.command == "run":
-        run_workflow(args.task, with_dashboard=args.dashboard)
+        run_workflow(args.task, with_dashboard=args.dashboard, use_cache=not args.no_cache)
     elif args.command == "wf-status":
         workflow_status(args.task_id)
     elif args.command == "wf-list":
@@ -773,7 +1013,7 @@ Phase 4 (real integration):
     elif args.command == "agents":
         check_agents()
     elif args.command == "cache":
-        cache_action(args.action)
+        cache_action(args.action, args.backend, args.task, args.step)
     else:
         parser.print_help()
 
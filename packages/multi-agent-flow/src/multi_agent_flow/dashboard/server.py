@@ -28,6 +28,7 @@ class DashboardServer:
         self.manager = ConnectionManager()
         self._app = None
         self._server = None
+        self._cache_metrics = None
 
     def create_app(self):
         """Create the FastAPI application"""
@@ -56,6 +57,14 @@ class DashboardServer:
                 "connections": self.manager.connection_count,
             }
 
+        @app.get("/cache/metrics")
+        async def cache_metrics():
+            """Host-wide cache telemetry (all processes sharing the metrics store)"""
+            if self._cache_metrics is None:
+                from ..cache.metrics import CacheMetrics
+                self._cache_metrics = CacheMetrics()
+            return await asyncio.to_thread(self._cache_metrics.summary)
+
         @app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             """Main WebSocket endpoint for all clients"""
@@ -25,6 +25,7 @@ class AgentConfig:
     port: Optional[int] = None
     roles: List[str] = field(default_factory=list)
     env: Dict[str, str] = field(default_factory=dict)
+    capacity: int = 1  # Prompts the agent CLI can serve concurrently
 
 
 # Default agent configurations
@@ -122,6 +123,7 @@ class LauncherManager:
                     port=agent_data.get("port"),
                     roles=agent_data.get("roles", [agent_id]),
                     env=agent_data.get("env", {}),
+                    capacity=agent_data.get("capacity", 1),
                 )
             return agents
         return DEFAULT_AGENTS.copy()
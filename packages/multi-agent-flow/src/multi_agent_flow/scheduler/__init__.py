@@ -4,8 +4,26 @@ Handles task queuing, scheduling, and agent state management.
 """
 from .task import Task, TaskStatus, TaskPriority, AgentState, AgentStatus
 from .queue import TaskQueue, InMemoryTaskQueue
+from .sqlite_queue import SqliteTaskQueue
 from .state_manager import AgentStateManager
+from .executor import (
+    TaskExecutor,
+    ThreadTaskExecutor,
+    ProcessTaskExecutor,
+    AsyncioTaskExecutor,
+    create_executor,
+)
+from .policy import (
+    AgentSelectionPolicy,
+    LeastLoadedPolicy,
+    DurationWeightedPolicy,
+    RoundRobinPolicy,
+    create_policy,
+)
+from .fairness import FairShare
+from .retention import RetentionPolicy, ResultStore, FileResultStore
 from .scheduler import TaskScheduler
+from .async_scheduler import AsyncTaskScheduler
 
 __all__ = [
     # Data structures
@@ -17,8 +35,28 @@ __all__ = [
     # Queue
     "TaskQueue",
     "InMemoryTaskQueue",
+    "SqliteTaskQueue",
     # State management
     "AgentStateManager",
+    # Executors
+    "TaskExecutor",
+    "ThreadTaskExecutor",
+    "ProcessTaskExecutor",
+    "AsyncioTaskExecutor",
+    "create_executor",
+    # Agent selection
+    "AgentSelectionPolicy",
+    "LeastLoadedPolicy",
+    "DurationWeightedPolicy",
+    "RoundRobinPolicy",
+    "create_policy",
+    # Fairness
+    "FairShare",
+    # Retention
+    "RetentionPolicy",
+    "ResultStore",
+    "FileResultStore",
     # Main scheduler
     "TaskScheduler",
+    "AsyncTaskScheduler",
 ]
@@ -0,0 +1,284 @@
+"""
+Async Task Scheduler - Single event loop variant of TaskScheduler
+"""
+import asyncio
+import inspect
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional, Callable, Any, Union
+from datetime import datetime
+
+from .task import Task, AgentState
+from .queue import TaskQueue
+from .policy import AgentSelectionPolicy
+from .retention import RetentionPolicy, ResultStore
+from .scheduler import TaskScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskScheduler(TaskScheduler):
+    """
+    Task scheduler running entirely on one asyncio event loop.
+
+    Same queue, agent state, selection policy and dispatch statistics as
+    TaskScheduler, but the scheduler loop is a coroutine woken by an
+    asyncio.Event and every dispatched task is an asyncio.Task awaiting
+    its handler directly. In-flight tasks cost a coroutine rather than a
+    thread, so thousands of agent subprocesses can be awaited at once, and
+    cancel_task() also cancels tasks that are already running.
+
+    Coroutine handlers, and handlers with a run_async() coroutine method
+    (e.g. AgentTaskHandler), are awaited on the loop. Plain functions are
+    run with asyncio.to_thread() so they cannot block it; cancelling such
+    a task abandons the call but cannot interrupt the thread.
+
+    submit_task(), cancel_task() and wake() may be called from other
+    threads; everything else runs on the loop that called start().
+    """
+
+    def __init__(
+        self,
+        state_file: Optional[Path] = None,
+        max_queue_size: int = 100,
+        poll_interval: float = 10.0,
+        max_concurrency: int = 1000,
+        state_flush_interval: Optional[float] = 1.0,
+        queue: Optional[TaskQueue] = None,
+        lease_seconds: float = 60.0,
+        agent_policy: Union[str, AgentSelectionPolicy] = "least_loaded",
+        retention: Optional[RetentionPolicy] = None,
+        result_store: Optional[ResultStore] = None,
+        deadline_policy: str = "flag",
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Tasks in flight at once; beyond this, runnable
+                             tasks stay PENDING in the queue
+            (other arguments as for TaskScheduler)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        super().__init__(
+            state_file=state_file,
+            max_queue_size=max_queue_size,
+            poll_interval=poll_interval,
+            max_workers=max_concurrency,
+            state_flush_interval=state_flush_interval,
+            queue=queue,
+            lease_seconds=lease_seconds,
+            agent_policy=agent_policy,
+            retention=retention,
+            result_store=result_store,
+            deadline_policy=deadline_policy,
+        )
+        self._executor_kind = "event_loop"
+        self.max_concurrency = max_concurrency
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        # Execution counters, reported in the same shape as TaskExecutor.stats()
+        self._busy_seconds = 0.0
+        self._started_loop_at: Optional[float] = None
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    def _in_loop(self) -> bool:
+        """Whether the caller is running on the scheduler's event loop"""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def wake(self) -> None:
+        """Ask the scheduler loop to process the queue now (thread-safe)"""
+        with self._wake:
+            if self._wake_at is None:
+                self._wake_at = time.monotonic()
+        if self._loop is None or self._wake_event is None:
+            return
+        if self._in_loop():
+            self._wake_event.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        Cancel a task. Pending tasks are marked CANCELLED immediately;
+        running tasks have their coroutine cancelled and are marked
+        CANCELLED (and their agent slot released) once it unwinds.
+        """
+        if super().cancel_task(task_id):
+            return True
+        running = self._in_flight.get(task_id)
+        if running is None or running.done():
+            return False
+        if self._in_loop():
+            running.cancel()
+        else:
+            self._loop.call_soon_threadsafe(running.cancel)
+        logger.info(f"Cancelling running task: {task_id}")
+        return True
+
+    def _has_capacity(self) -> bool:
+        return len(self._in_flight) < self.max_concurrency
+
+    def _dispatch_task(self, task: Task, agent: AgentState) -> None:
+        """Dispatch a task to an agent as an asyncio.Task on the loop."""
+        self._assign_task(task, agent)
+        self._counters["submitted"] += 1
+        self._in_flight[task.id] = asyncio.create_task(
+            self._run_task(task, agent), name=f"maf-task-{task.id}"
+        )
+
+    async def _run_task(self, task: Task, agent: AgentState) -> None:
+        """Await a task's handler and record its outcome."""
+        start = time.monotonic()
+        try:
+            result = await self._execute_task(task, agent)
+        except asyncio.CancelledError:
+            self._counters["cancelled"] += 1
+            self._cancel_running_task(task.id)
+            self.wake()
+            raise
+        except Exception as e:
+            self._counters["failed"] += 1
+            logger.error(f"Task {task.id} failed: {e}")
+            self._fail_task(task.id, str(e))
+            return
+        finally:
+            self._in_flight.pop(task.id, None)
+            self._busy_seconds += time.monotonic() - start
+        self._counters["completed"] += 1
+        self._complete_task(task.id, result)
+
+    async def _execute_task(self, task: Task, agent: AgentState) -> Dict[str, Any]:
+        """
+        Execute a task. Override this method or register handlers for custom execution.
+        """
+        handler = self._task_handlers.get(task.target_role)
+
+        if handler is None:
+            return await simulate_task_async(task, agent)
+
+        if _is_coroutine_callable(handler):
+            return await handler(task, agent)
+        run_async = getattr(handler, "run_async", None)
+        if run_async is not None and inspect.iscoroutinefunction(run_async):
+            return await run_async(task, agent)
+
+        result = await asyncio.to_thread(handler, task, agent)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def start(self) -> None:
+        """Start the scheduler loop as a task on the running event loop."""
+        if self._running:
+            logger.warning("Scheduler is already running")
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        self._started_loop_at = time.monotonic()
+        self._running = True
+        # Dispatch anything submitted before the loop started
+        self.wake()
+        self._loop_task = asyncio.create_task(self._scheduler_loop(), name="maf-scheduler")
+        logger.info("AsyncTaskScheduler started")
+
+    async def _scheduler_loop(self) -> None:
+        logger.info("Scheduler loop started")
+        timeout = self._loop_timeout()
+        self._last_poll = self._last_lease_check = time.monotonic()
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+            with self._wake:
+                woke_at, self._wake_at = self._wake_at, None
+            if not self._running:
+                break
+            self._loop_tick(woke_at)
+        logger.info("Scheduler loop stopped")
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the scheduler loop.
+
+        Args:
+            drain: Wait for running tasks to finish. False cancels them;
+                   they are marked CANCELLED and their agent slots released.
+            timeout: Seconds to wait for running tasks when draining;
+                     tasks still running afterwards are cancelled
+        """
+        self._running = False
+        if self._wake_event is not None:
+            self._wake_event.set()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+
+        running = list(self._in_flight.values())
+        if running:
+            if drain:
+                _, running = await asyncio.wait(running, timeout=timeout)
+                if running:
+                    logger.warning(f"{len(running)} task(s) still running after {timeout}s drain")
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        self.state_manager.flush()
+        logger.info("AsyncTaskScheduler stopped")
+
+    async def __aenter__(self) -> "AsyncTaskScheduler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def _executor_stats(self) -> Dict[str, Any]:
+        active = len(self._in_flight)
+        uptime = time.monotonic() - self._started_loop_at if self._started_loop_at else 0
+        return {
+            "kind": self._executor_kind,
+            "max_workers": self.max_concurrency,
+            "max_queue": 0,
+            "active": active,
+            "queued": 0,
+            "utilization_percent": round(active / self.max_concurrency * 100, 1),
+            "avg_utilization_percent": round(
+                self._busy_seconds / (uptime * self.max_concurrency) * 100, 1
+            ) if uptime else 0,
+            "busy_seconds": round(self._busy_seconds, 3),
+            "shutdown": not self._running,
+            **self._counters,
+        }
+
+
+def _is_coroutine_callable(handler: Callable) -> bool:
+    """Coroutine function, or an object whose __call__ is one"""
+    return inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+        getattr(handler, "__call__", None)
+    )
+
+
+async def simulate_task_async(task: Task, agent: AgentState) -> Dict[str, Any]:
+    """Default task execution on the event loop: simulate work without blocking it."""
+    logger.info(f"Executing task {task.id} on agent {agent.id}")
+    await asyncio.sleep(1)  # Simulate work
+
+    return {
+        "status": "completed",
+        "message": f"Task executed by {agent.id}",
+        "timestamp": datetime.utcnow().isoformat(),
+    }
@@ -0,0 +1,303 @@
+"""
+Task Executors - Bounded worker pools for scheduler task execution
+"""
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from typing import Dict, Optional, Callable, Any
+
+logger = logging.getLogger(__name__)
+
+
+class TaskExecutor(ABC):
+    """
+    Abstract base class for task executors.
+
+    An executor runs at most max_workers tasks at once and accepts up to
+    max_queue more waiting for a worker. has_capacity() is the scheduler's
+    backpressure signal: while it is False, tasks stay PENDING in the task
+    queue instead of piling up inside the pool.
+    """
+
+    kind = "base"
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 0):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Tasks executed concurrently
+            max_queue: Tasks accepted beyond max_workers, waiting for a worker
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Future, float] = {}
+        self._active = 0
+        self._busy_seconds = 0.0
+        self._created_at = time.monotonic()
+        self._shutdown = False
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    @property
+    def is_shutdown(self) -> bool:
+        return self._shutdown
+
+    def has_capacity(self) -> bool:
+        """Whether another task can be submitted without exceeding the bound"""
+        with self._lock:
+            return not self._shutdown and len(self._in_flight) < self.max_workers + self.max_queue
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Run fn(*args) on the pool.
+
+        Returns:
+            Future resolving to the call's result (awaitables are awaited)
+        """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(f"{self.kind} executor is shut down")
+            self._counters["submitted"] += 1
+        future = self._submit(fn, *args)
+        with self._lock:
+            self._in_flight[future] = time.monotonic()
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._in_flight.pop(future, None)
+            if future.cancelled():
+                self._counters["cancelled"] += 1
+            elif future.exception() is not None:
+                self._counters["failed"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    def _run_timed(self, fn: Callable, *args) -> Any:
+        """Run a call on a worker, tracking active workers and busy time"""
+        with self._lock:
+            self._active += 1
+        start = time.monotonic()
+        try:
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                result = asyncio.run(_await(result))
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._busy_seconds += time.monotonic() - start
+
+    @abstractmethod
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Hand a call to the underlying pool"""
+        pass
+
+    @abstractmethod
+    def _close(self, drain: bool) -> None:
+        """Release the underlying pool"""
+        pass
+
+    def shutdown(self, drain: bool = True, timeout: Optional[float] = None) -> int:
+        """
+        Stop accepting work and release the pool.
+
+        Args:
+            drain: Wait for in-flight work (False cancels work that has not
+                   started; the asyncio executor also cancels running work)
+            timeout: Seconds to wait for in-flight work when draining; work
+                     that has not started by then is cancelled
+
+        Returns:
+            Number of tasks cancelled
+        """
+        with self._lock:
+            self._shutdown = True
+            pending = list(self._in_flight)
+
+        if drain:
+            _, pending = wait(pending, timeout=timeout)
+            if pending:
+                logger.warning(f"{len(pending)} task(s) still running after {timeout}s drain")
+        cancelled = sum(1 for future in pending if future.cancel())
+
+        # Only a completed drain waits for the pool; otherwise shutdown
+        # returns without blocking on work that is still running
+        self._close(drain and not pending)
+        logger.info(f"{self.kind} executor shut down (drain={drain}, cancelled={cancelled})")
+        return cancelled
+
+    def _active_workers(self) -> int:
+        return self._active
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool utilization metrics.
+
+        Returns:
+            Dict with kind, bounds, active/queued counts, utilization
+            (active / max_workers), average utilization since creation
+            and completed/failed/cancelled counters
+        """
+        with self._lock:
+            in_flight = len(self._in_flight)
+            active = min(self._active_workers(), self.max_workers)
+            busy = self._busy_seconds
+            counters = dict(self._counters)
+        uptime = time.monotonic() - self._created_at
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": active,
+            "queued": max(in_flight - active, 0),
+            "utilization_percent": round(active / self.max_workers * 100, 1),
+            "avg_utilization_percent": round(busy / (uptime * self.max_workers) * 100, 1) if uptime else 0,
+            "busy_seconds": round(busy, 3),
+            "shutdown": self._shutdown,
+            **counters,
+        }
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class ThreadTaskExecutor(TaskExecutor):
+    """Bounded thread pool. Async handlers run on a per-call event loop."""
+
+    kind = "thread"
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 0):
+        super().__init__(max_workers, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="maf-task")
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        return self._pool.submit(self._run_timed, fn, *args)
+
+    def _close(self, drain: bool) -> None:
+        self._pool.shutdown(wait=drain, cancel_futures=not drain)
+
+
+class ProcessTaskExecutor(TaskExecutor):
+    """
+    Process pool for CPU-heavy handlers.
+
+    The callable and its arguments are pickled, so handlers must be
+    module-level functions. Worker activity is not observable from the
+    parent; a task counts as active from submission until its result
+    arrives, which is exact while max_queue is 0.
+    """
+
+    kind = "process"
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 0):
+        super().__init__(max_workers, max_queue)
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        return self._pool.submit(fn, *args)
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            submitted_at = self._in_flight.get(future)
+            if submitted_at is not None:
+                self._busy_seconds += time.monotonic() - submitted_at
+        super()._on_done(future)
+
+    def _active_workers(self) -> int:
+        return len(self._in_flight)
+
+    def _close(self, drain: bool) -> None:
+        self._pool.shutdown(wait=drain, cancel_futures=not drain)
+
+
+class AsyncioTaskExecutor(TaskExecutor):
+    """
+    Event loop on a dedicated thread for async handlers.
+
+    At most max_workers calls run concurrently (semaphore). Synchronous
+    calls are moved to a thread so they never block the loop, and
+    cancelling the returned future cancels the running coroutine.
+    """
+
+    kind = "asyncio"
+
+    def __init__(self, max_workers: int = 16, max_queue: int = 0):
+        super().__init__(max_workers, max_queue)
+        self._loop = asyncio.new_event_loop()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        ready = threading.Event()
+
+        def run_loop():
+            asyncio.set_event_loop(self._loop)
+            self._semaphore = asyncio.Semaphore(max_workers)
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run_loop, name="maf-task-loop", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        async with self._semaphore:
+            with self._lock:
+                self._active += 1
+            start = time.monotonic()
+            try:
+                result = await asyncio.to_thread(fn, *args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._busy_seconds += time.monotonic() - start
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        return asyncio.run_coroutine_threadsafe(self._run(fn, *args), self._loop)
+
+    async def _cancel_all(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _close(self, drain: bool) -> None:
+        # Let cancelled coroutines unwind before the loop stops
+        asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop).result(timeout=5.0)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5.0)
+
+
+EXECUTORS = {
+    "thread": ThreadTaskExecutor,
+    "process": ProcessTaskExecutor,
+    "asyncio": AsyncioTaskExecutor,
+}
+
+
+def create_executor(kind: str = "thread", max_workers: int = 4, max_queue: int = 0) -> TaskExecutor:
+    """
+    Create a task executor.
+
+    Args:
+        kind: "thread", "process" or "asyncio"
+        max_workers: Tasks executed concurrently
+        max_queue: Tasks accepted beyond max_workers
+
+    Returns:
+        TaskExecutor instance
+    """
+    if kind not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {kind} (expected one of {', '.join(EXECUTORS)})")
+    return EXECUTORS[kind](max_workers=max_workers, max_queue=max_queue)
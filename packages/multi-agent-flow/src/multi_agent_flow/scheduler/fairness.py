@@ -0,0 +1,159 @@
+"""
+Dispatch Fairness - Priority aging and weighted fair share across roles and submitters
+"""
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple, Any
+
+from .task import Task, TaskPriority
+
+# Task.metadata key naming who submitted a task (fair share between submitters)
+SUBMITTER_KEY = "submitter"
+
+PRIORITY_RANK = {
+    TaskPriority.HIGH: 0,
+    TaskPriority.NORMAL: 1,
+    TaskPriority.LOW: 2,
+}
+
+# (role, submitter) a task's fair share is charged to
+ShareKey = Tuple[str, Optional[str]]
+
+
+def submitter_of(task: Task) -> Optional[str]:
+    """Submitter recorded in the task's metadata, if any"""
+    submitter = task.metadata.get(SUBMITTER_KEY)
+    return str(submitter) if submitter is not None else None
+
+
+def share_key(task: Task) -> ShareKey:
+    return task.target_role, submitter_of(task)
+
+
+def created_timestamp(created_at: str) -> float:
+    """Seconds since the epoch for an ISO created_at, naive meaning UTC (0.0 if unparseable)"""
+    try:
+        parsed = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def order_key(task: Task, aging_seconds: Optional[float] = None, edf: bool = False) -> Tuple[Any, ...]:
+    """
+    Dispatch order of a pending task (smaller first).
+
+    Without aging this is (priority rank, created_at). With aging a task
+    gains one priority level for every aging_seconds it waits, so its
+    effective rank at time `now` is rank - (now - created) / aging_seconds.
+    Comparing two tasks by that rank is the same at every `now` as
+    comparing created + rank * aging_seconds, so the key never changes
+    while the task waits and heaps and SQL indexes stay valid.
+
+    With edf (earliest deadline first), tasks with a deadline come first
+    in deadline order, then tasks without one in the order above.
+    """
+    rank = PRIORITY_RANK[task.priority]
+    if aging_seconds is None:
+        key = (rank, task.created_at)
+    else:
+        key = (created_timestamp(task.created_at) + rank * aging_seconds, task.created_at)
+    if edf:
+        key = (created_timestamp(task.deadline) if task.deadline else math.inf, *key)
+    return key
+
+
+class _VirtualClock:
+    """
+    Start-time fair queueing over a set of keys.
+
+    Each dispatch charges its key 1/weight of virtual time; the key with
+    the earliest start tag goes next. A key that was idle restarts at the
+    current virtual time instead of spending credit saved while idle.
+    """
+
+    # Finish tags kept before forgetting keys that fell behind the clock
+    MAX_KEYS = 256
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights = weights or {}
+        self._finish: Dict[Optional[str], float] = {}
+        self._now = 0.0
+
+    def start(self, key: Optional[str]) -> float:
+        return max(self._finish.get(key, 0.0), self._now)
+
+    def charge(self, key: Optional[str]) -> None:
+        start = self.start(key)
+        self._now = start
+        self._finish[key] = start + 1.0 / self.weights.get(key, 1.0)
+        if len(self._finish) > self.MAX_KEYS:
+            self._finish = {k: v for k, v in self._finish.items() if v > self._now}
+
+
+class FairShare:
+    """
+    Weighted fair share of dispatches across roles, then across submitters
+    within a role.
+
+    Among roles with runnable tasks, the one furthest behind its share
+    dispatches next; within it, the submitter furthest behind its share;
+    within that, tasks go in (aged) priority order. Weights default to 1,
+    so a role with weight 2 gets twice the dispatches of a role with
+    weight 1 while both have work. Submitters are read from
+    Task.metadata["submitter"]; tasks without one share a single bucket.
+
+    Shares are tracked per queue instance, so schedulers sharing a
+    SqliteTaskQueue are each fair over the tasks they dispatch.
+    """
+
+    def __init__(
+        self,
+        role_weights: Optional[Dict[str, float]] = None,
+        submitter_weights: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            role_weights: Role -> relative share of dispatches
+            submitter_weights: Submitter -> relative share within a role
+        """
+        for weights in (role_weights or {}, submitter_weights or {}):
+            for key, weight in weights.items():
+                if weight <= 0:
+                    raise ValueError(f"Fair share weight for {key} must be positive")
+        self.role_weights = dict(role_weights or {})
+        self.submitter_weights = dict(submitter_weights or {})
+        self._lock = threading.Lock()
+        self._roles = _VirtualClock(self.role_weights)
+        self._submitters: Dict[str, _VirtualClock] = defaultdict(lambda: _VirtualClock(self.submitter_weights))
+
+    def pick(self, heads: Dict[ShareKey, Any]) -> ShareKey:
+        """
+        Choose which (role, submitter) dispatches next.
+
+        Args:
+            heads: (role, submitter) -> order key of its best runnable task
+
+        Returns:
+            The chosen (role, submitter)
+        """
+        by_role: Dict[str, Dict[Optional[str], Any]] = defaultdict(dict)
+        for (role, submitter), head in heads.items():
+            by_role[role][submitter] = head
+        with self._lock:
+            # Ties go to the better head, then by name, so queues agree
+            role = min(by_role, key=lambda r: (self._roles.start(r), min(by_role[r].values()), r))
+            clock = self._submitters[role]
+            submitters = by_role[role]
+            submitter = min(submitters, key=lambda s: (clock.start(s), submitters[s], s is not None, s or ""))
+        return role, submitter
+
+    def charge(self, role: str, submitter: Optional[str]) -> None:
+        """Account one dispatch to a role and submitter."""
+        with self._lock:
+            self._roles.charge(role)
+            self._submitters[role].charge(submitter)
@@ -0,0 +1,134 @@
+"""
+Agent Selection Policies - Choose which available agent runs a task
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Union
+
+from .task import Task, AgentState
+
+
+class AgentSelectionPolicy(ABC):
+    """
+    Abstract base class for agent selection policies.
+
+    select() receives the agents that can take the task right now (right
+    role, at least one free slot) and returns the one to use.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def select(self, task: Task, agents: List[AgentState]) -> Optional[AgentState]:
+        """Choose an agent for a task, or None to leave it queued."""
+        pass
+
+
+class _RotatingTieBreak:
+    """Rotates among tied candidates so the same agent does not always win"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def pick(self, candidates: List[AgentState]) -> AgentState:
+        candidates = sorted(candidates, key=lambda a: a.id)
+        with self._lock:
+            self._counter += 1
+            return candidates[self._counter % len(candidates)]
+
+
+class LeastLoadedPolicy(AgentSelectionPolicy):
+    """Pick the agent with the lowest fraction of slots in use (then most free slots)."""
+
+    name = "least_loaded"
+
+    def __init__(self):
+        self._ties = _RotatingTieBreak()
+
+    def select(self, task: Task, agents: List[AgentState]) -> Optional[AgentState]:
+        if not agents:
+            return None
+        best = min((a.load(), -a.free_slots()) for a in agents)
+        return self._ties.pick([a for a in agents if (a.load(), -a.free_slots()) == best])
+
+
+class DurationWeightedPolicy(AgentSelectionPolicy):
+    """
+    Pick the agent expected to finish the task soonest.
+
+    The expected finish time is the agent's average historical task
+    duration scaled by its queue depth per slot ((running + 1) / capacity).
+    Agents without history are assumed to take the average of the agents
+    that have one, so new agents still get work.
+    """
+
+    name = "duration_weighted"
+
+    def __init__(self, default_seconds: float = 60.0):
+        """
+        Args:
+            default_seconds: Assumed duration when no agent has history
+        """
+        self.default_seconds = default_seconds
+        self._ties = _RotatingTieBreak()
+
+    def select(self, task: Task, agents: List[AgentState]) -> Optional[AgentState]:
+        if not agents:
+            return None
+        known = [a.avg_task_seconds() for a in agents if a.avg_task_seconds() is not None]
+        fallback = sum(known) / len(known) if known else self.default_seconds
+
+        def expected_finish(agent: AgentState) -> float:
+            avg = agent.avg_task_seconds()
+            avg = fallback if avg is None else avg
+            return avg * (len(agent.running_task_ids) + 1) / agent.capacity
+
+        scores = {a.id: expected_finish(a) for a in agents}
+        best = min(scores.values())
+        return self._ties.pick([a for a in agents if scores[a.id] == best])
+
+
+class RoundRobinPolicy(AgentSelectionPolicy):
+    """Cycle through the agents of each role in ID order."""
+
+    name = "round_robin"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last: Dict[str, str] = {}  # role -> last chosen agent ID
+
+    def select(self, task: Task, agents: List[AgentState]) -> Optional[AgentState]:
+        if not agents:
+            return None
+        ordered = sorted(agents, key=lambda a: a.id)
+        with self._lock:
+            last = self._last.get(task.target_role)
+            chosen = next((a for a in ordered if last is None or a.id > last), ordered[0])
+            self._last[task.target_role] = chosen.id
+        return chosen
+
+
+POLICIES = {
+    "least_loaded": LeastLoadedPolicy,
+    "duration_weighted": DurationWeightedPolicy,
+    "round_robin": RoundRobinPolicy,
+}
+
+
+def create_policy(policy: Union[str, AgentSelectionPolicy] = "least_loaded") -> AgentSelectionPolicy:
+    """
+    Resolve an agent selection policy.
+
+    Args:
+        policy: Policy name ("least_loaded", "duration_weighted",
+                "round_robin") or an AgentSelectionPolicy instance
+
+    Returns:
+        AgentSelectionPolicy instance
+    """
+    if isinstance(policy, AgentSelectionPolicy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown agent policy: {policy} (expected one of {', '.join(POLICIES)})")
+    return POLICIES[policy]()
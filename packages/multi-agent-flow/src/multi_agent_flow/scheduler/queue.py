@@ -3,20 +3,44 @@ Task Queue Implementation for Multi-Agent Scheduler
 Supports in-memory queue with priority ordering.
 """
 from abc import ABC, abstractmethod
-from collections import deque
-from typing import Optional, List, Dict
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Set, Tuple, Iterable
 from threading import Lock
 import heapq
 import logging
 
 from .task import Task, TaskStatus, TaskPriority
+from .fairness import FairShare, ShareKey, PRIORITY_RANK, order_key, share_key
 
 logger = logging.getLogger(__name__)
 
+# Statuses a task does not leave again; only these are pruned
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+
+def finished_cutoff(max_age_seconds: Optional[float]) -> Optional[str]:
+    """ISO timestamp before which finished tasks are expired"""
+    if max_age_seconds is None:
+        return None
+    return (datetime.utcnow() - timedelta(seconds=max_age_seconds)).isoformat()
+
 
 class TaskQueue(ABC):
     """Abstract base class for task queues."""
 
+    # Seconds between changed_externally() checks by the scheduler loop
+    # (None: the queue is only modified by its own process)
+    watch_interval: Optional[float] = None
+
+    # Dispatch ordering (see fairness.order_key)
+    aging_seconds: Optional[float] = None
+    edf: bool = False
+
+    def order_key(self, task: Task) -> Tuple:
+        """Sort key of a pending task in this queue's dispatch order (smaller first)."""
+        return order_key(task, self.aging_seconds, self.edf)
+
     @abstractmethod
     def submit(self, task: Task) -> None:
         """Add a task to the queue."""
@@ -42,38 +66,295 @@ class TaskQueue(ABC):
         """Get tasks that are ready to run (dependencies met)."""
         pass
 
+    def pending_ahead(self, task: Task) -> Tuple[float, int]:
+        """
+        Work queued ahead of a task: pending tasks of its role that sort
+        at or before it in dispatch order.
+
+        Returns:
+            (sum of their estimated_seconds, number without an estimate)
+        """
+        key = self.order_key(task)
+        ahead = [
+            t for t in self.get_pending_tasks()
+            if t.target_role == task.target_role and self.order_key(t) <= key
+        ]
+        estimated = [t.estimated_seconds for t in ahead if t.estimated_seconds is not None]
+        return sum(estimated), len(ahead) - len(estimated)
+
+    def peek_runnable(self, exclude_roles: Iterable[str] = ()) -> Optional[Task]:
+        """Get the highest-priority runnable task whose role is not excluded."""
+        excluded = set(exclude_roles)
+        for task in self.get_runnable_tasks():
+            if task.target_role not in excluded:
+                return task
+        return None
+
+    def get_dependents(self, task_id: str) -> List[Task]:
+        """Get pending tasks that depend on a task."""
+        return [t for t in self.get_pending_tasks() if task_id in t.dependencies]
+
+    def claim(self, task_id: str, owner: str, lease_seconds: Optional[float] = None) -> Optional[Task]:
+        """
+        Move a PENDING task to RUNNING on behalf of a scheduler.
+
+        Args:
+            task_id: Task to claim
+            owner: Identifier of the claiming scheduler
+            lease_seconds: How long the claim lasts without renewal (queues
+                           without leases ignore it)
+
+        Returns:
+            The claimed task, or None if it is no longer PENDING
+        """
+        task = self.get_task(task_id)
+        if not task or task.status != TaskStatus.PENDING:
+            return None
+        task.status = TaskStatus.RUNNING
+        task.started_at = datetime.utcnow().isoformat()
+        task.updated_at = task.started_at
+        self.update_task(task)
+        return task
+
+    def renew_leases(self, owner: str, lease_seconds: float) -> int:
+        """Extend the leases of tasks claimed by owner. Returns count renewed."""
+        return 0
+
+    def recover_expired_leases(self) -> List[str]:
+        """Return RUNNING tasks with expired leases to PENDING. Returns their IDs."""
+        return []
+
+    def changed_externally(self) -> bool:
+        """Whether another process modified the queue since the last check."""
+        return False
+
+    def prune_finished(
+        self,
+        max_age_seconds: Optional[float] = None,
+        max_finished: Optional[int] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Remove finished tasks beyond a retention limit.
+
+        Tasks are aged by completed_at (updated_at for tasks cancelled
+        before running). Tasks with PENDING or RUNNING dependents are kept.
+
+        Args:
+            max_age_seconds: Remove tasks finished longer ago than this
+            max_finished: Keep at most this many most recently finished tasks
+
+        Returns:
+            Removed task ID -> result_ref (to delete offloaded results)
+        """
+        return {}
+
 
 class InMemoryTaskQueue(TaskQueue):
     """
     Thread-safe in-memory task queue with priority support.
     Tasks are ordered by priority (HIGH > NORMAL > LOW) and creation time.
+    With aging_seconds, waiting tasks gain one priority level per
+    aging_seconds so a steady stream of HIGH tasks cannot starve LOW ones.
+    With a FairShare, dispatch is shared between roles and submitters by
+    weight before priority order applies within each. With edf, tasks with
+    a deadline are dispatched earliest deadline first, ahead of the rest.
+
+    The queue is indexed so dispatch does not scan every task:
+    - a heap of ready tasks per (role, submitter) (lazy deletion, O(log n) push/pop)
+    - an unsatisfied-dependency counter per task
+    - a reverse-dependency map that promotes dependents on completion
+    - task ID sets per status for O(1) counts
+    - pending task ID sets per role for deadline admission
+
+    Callers mutate Task objects in place and then call update_task, so the
+    indexed fields of each task are snapshotted and compared on update.
     """
 
-    PRIORITY_MAP = {
-        TaskPriority.HIGH: 0,
-        TaskPriority.NORMAL: 1,
-        TaskPriority.LOW: 2,
-    }
+    PRIORITY_MAP = PRIORITY_RANK
 
-    def __init__(self, max_size: int = 100):
+    def __init__(
+        self,
+        max_size: int = 100,
+        aging_seconds: Optional[float] = None,
+        fair_share: Optional[FairShare] = None,
+        edf: bool = False,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            max_size: Maximum number of tasks held
+            aging_seconds: Wait after which a task outranks fresh tasks one
+                           priority level above it (None: strict priority)
+            fair_share: Weighted fair share across roles and submitters
+                        (None: strict priority order across all roles)
+            edf: Dispatch tasks with deadlines earliest deadline first,
+                 falling back to priority order for tasks without one
+        """
+        if aging_seconds is not None and aging_seconds <= 0:
+            raise ValueError("aging_seconds must be positive")
         self._tasks: Dict[str, Task] = {}
         self._lock = Lock()
         self._max_size = max_size
+        self.aging_seconds = aging_seconds
+        self.fair_share = fair_share
+        self.edf = edf
+
+        # task_id -> (status, priority, target_role, created_at, dependencies) as indexed
+        self._indexed: Dict[str, Tuple[TaskStatus, TaskPriority, str, str, frozenset]] = {}
+        self._by_status: Dict[TaskStatus, Set[str]] = defaultdict(set)
+        self._pending_by_role: Dict[str, Set[str]] = defaultdict(set)
+        self._unmet: Dict[str, int] = {}
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
+
+        # (role, submitter) -> heap of (*order_key, seq, task_id); an entry is
+        # live only while _ready_seq[task_id] == seq
+        self._ready: Dict[ShareKey, List[Tuple]] = defaultdict(list)
+        self._ready_seq: Dict[str, int] = {}
+        # task_id -> (share key, order key) of its live heap entry
+        self._ready_entry: Dict[str, Tuple[ShareKey, Tuple]] = {}
+        self._seq = 0
+
         logger.info(f"InMemoryTaskQueue initialized (max_size={max_size})")
 
+    # Index maintenance (callers hold the lock)
+
+    def _dep_met(self, dep_id: str) -> bool:
+        return dep_id in self._indexed and self._indexed[dep_id][0] == TaskStatus.COMPLETED
+
+    def _push_ready(self, task: Task) -> None:
+        self._seq += 1
+        self._ready_seq[task.id] = self._seq
+        key, order = share_key(task), self.order_key(task)
+        self._ready_entry[task.id] = (key, order)
+        heap = self._ready[key]
+        heapq.heappush(heap, (*order, self._seq, task.id))
+        # Entries deleted below the top are only discarded lazily; compact
+        # the heap once stale entries dominate it
+        if len(heap) > 64 and len(heap) > 2 * len(self._ready_seq):
+            heap[:] = [e for e in heap if self._ready_seq.get(e[-1]) == e[-2]]
+            heapq.heapify(heap)
+
+    def _drop_ready(self, task_id: str) -> None:
+        self._ready_seq.pop(task_id, None)
+        self._ready_entry.pop(task_id, None)
+
+    def _promote(self, task_id: str) -> None:
+        """A dependency of task_id completed"""
+        self._unmet[task_id] -= 1
+        if self._unmet[task_id] == 0 and self._indexed[task_id][0] == TaskStatus.PENDING:
+            self._push_ready(self._tasks[task_id])
+
+    def _demote(self, task_id: str) -> None:
+        """A dependency of task_id is no longer completed"""
+        self._unmet[task_id] += 1
+        self._drop_ready(task_id)
+
+    def _index(self, task: Task) -> None:
+        deps = frozenset(task.dependencies)
+        # Counted before the task itself is indexed; a self-dependency is
+        # then settled by the promotion below like any other dependent
+        self._unmet[task.id] = sum(1 for dep_id in deps if not self._dep_met(dep_id))
+        self._indexed[task.id] = (task.status, task.priority, task.target_role, task.created_at, deps)
+        self._by_status[task.status].add(task.id)
+        if task.status == TaskStatus.PENDING:
+            self._pending_by_role[task.target_role].add(task.id)
+        for dep_id in deps:
+            self._dependents[dep_id].add(task.id)
+
+        if task.status == TaskStatus.COMPLETED:
+            for dependent_id in self._dependents.get(task.id, ()):
+                self._promote(dependent_id)
+        elif task.status == TaskStatus.PENDING and self._unmet[task.id] == 0:
+            self._push_ready(task)
+
+    def _unindex(self, task_id: str) -> None:
+        status, _, role, _, deps = self._indexed.pop(task_id)
+        self._by_status[status].discard(task_id)
+        self._drop_pending(role, task_id)
+        self._drop_ready(task_id)
+        del self._unmet[task_id]
+        for dep_id in deps:
+            dependents = self._dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self._dependents[dep_id]
+
+        if status == TaskStatus.COMPLETED:
+            for dependent_id in self._dependents.get(task_id, ()):
+                self._demote(dependent_id)
+
+    def _reindex(self, task: Task) -> None:
+        """Bring the index in line with a task's current fields"""
+        status, _, role, _, deps = self._indexed[task.id]
+        if frozenset(task.dependencies) != deps:
+            self._unindex(task.id)
+            self._index(task)
+            return
+
+        if status == TaskStatus.PENDING:
+            self._drop_pending(role, task.id)
+        if task.status == TaskStatus.PENDING:
+            self._pending_by_role[task.target_role].add(task.id)
+
+        if task.status != status:
+            self._by_status[status].discard(task.id)
+            self._by_status[task.status].add(task.id)
+            if status == TaskStatus.COMPLETED:
+                for dependent_id in self._dependents.get(task.id, ()):
+                    self._demote(dependent_id)
+
+        self._indexed[task.id] = (task.status, task.priority, task.target_role, task.created_at, deps)
+
+        if task.status != status and task.status == TaskStatus.COMPLETED:
+            for dependent_id in self._dependents.get(task.id, ()):
+                self._promote(dependent_id)
+
+        if status == TaskStatus.PENDING and task.status == TaskStatus.RUNNING and self.fair_share:
+            self.fair_share.charge(*share_key(task))
+
+        if task.status == TaskStatus.PENDING and self._unmet[task.id] == 0:
+            if self._ready_entry.get(task.id) != (share_key(task), self.order_key(task)):
+                self._push_ready(task)
+        else:
+            self._drop_ready(task.id)
+
+    def _drop_pending(self, role: str, task_id: str) -> None:
+        pending = self._pending_by_role.get(role)
+        if pending is not None:
+            pending.discard(task_id)
+            if not pending:
+                del self._pending_by_role[role]
+
+    def _ready_head(self, key: ShareKey) -> Optional[Tuple]:
+        """Live top of a (role, submitter) ready heap, discarding stale entries"""
+        heap = self._ready[key]
+        while heap and self._ready_seq.get(heap[0][-1]) != heap[0][-2]:
+            heapq.heappop(heap)
+        if not heap:
+            del self._ready[key]
+            return None
+        return heap[0]
+
+    # TaskQueue API
+
     def submit(self, task: Task) -> None:
         """Add a task to the queue."""
         with self._lock:
             if len(self._tasks) >= self._max_size:
                 raise RuntimeError(f"Task queue is full (max={self._max_size})")
 
+            if task.id in self._tasks:
+                self._unindex(task.id)
             self._tasks[task.id] = task
+            self._index(task)
             logger.info(f"Task submitted: {task.id} ({task.description[:50]}...)")
 
     def get_pending_tasks(self) -> List[Task]:
         """Get all pending tasks, sorted by priority."""
         with self._lock:
-            pending = [t for t in self._tasks.values() if t.status == TaskStatus.PENDING]
+            pending = [self._tasks[i] for i in self._by_status[TaskStatus.PENDING]]
             return self._sort_by_priority(pending)
 
     def get_task(self, task_id: str) -> Optional[Task]:
@@ -81,11 +362,27 @@ class InMemoryTaskQueue(TaskQueue):
         with self._lock:
             return self._tasks.get(task_id)
 
+    def pending_ahead(self, task: Task) -> Tuple[float, int]:
+        """Work queued ahead of a task, from its role's pending set (no sort)."""
+        key = self.order_key(task)
+        seconds, unestimated = 0.0, 0
+        with self._lock:
+            for task_id in self._pending_by_role.get(task.target_role, ()):
+                pending = self._tasks[task_id]
+                if self.order_key(pending) > key:
+                    continue
+                if pending.estimated_seconds is None:
+                    unestimated += 1
+                else:
+                    seconds += pending.estimated_seconds
+        return seconds, unestimated
+
     def update_task(self, task: Task) -> None:
         """Update a task in the queue."""
         with self._lock:
             if task.id in self._tasks:
                 self._tasks[task.id] = task
+                self._reindex(task)
                 logger.debug(f"Task updated: {task.id} -> {task.status}")
 
     def get_runnable_tasks(self) -> List[Task]:
@@ -96,22 +393,55 @@ class InMemoryTaskQueue(TaskQueue):
         2. All dependencies are COMPLETED
         """
         with self._lock:
-            runnable = []
-            for task in self._tasks.values():
-                if task.status != TaskStatus.PENDING:
-                    continue
+            runnable = [self._tasks[i] for i in self._ready_seq]
+            return self._sort_by_priority(runnable)
 
-                # Check if all dependencies are completed
-                deps_met = all(
-                    self._tasks.get(dep_id) and
-                    self._tasks[dep_id].status == TaskStatus.COMPLETED
-                    for dep_id in task.dependencies
-                )
+    def peek_runnable(self, exclude_roles: Iterable[str] = ()) -> Optional[Task]:
+        """
+        Get the highest-priority runnable task whose role is not excluded.
 
-                if deps_met:
-                    runnable.append(task)
+        Compares the heads of the per-(role, submitter) ready heaps, so the
+        cost is O(roles x submitters + log n) instead of a scan of the queue.
+        With a FairShare the head of the (role, submitter) furthest behind
+        its share is returned; otherwise the best head overall.
+        """
+        excluded = set(exclude_roles)
+        with self._lock:
+            heads = {}
+            for key in list(self._ready):
+                if key[0] in excluded:
+                    continue
+                head = self._ready_head(key)
+                if head is not None:
+                    heads[key] = head
+            if not heads:
+                return None
+            if self.fair_share:
+                # Heads compared by order key only (without seq and task ID)
+                best = heads[self.fair_share.pick({key: head[:-2] for key, head in heads.items()})]
+            else:
+                best = min(heads.values())
+            return self._tasks[best[-1]]
 
-            return self._sort_by_priority(runnable)
+    def claim(self, task_id: str, owner: str, lease_seconds: Optional[float] = None) -> Optional[Task]:
+        """Move a PENDING task to RUNNING (atomic under the queue lock)."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if not task or task.status != TaskStatus.PENDING:
+                return None
+            task.status = TaskStatus.RUNNING
+            task.started_at = datetime.utcnow().isoformat()
+            task.updated_at = task.started_at
+            self._reindex(task)
+            return task
+
+    def get_dependents(self, task_id: str) -> List[Task]:
+        """Get pending tasks that depend on a task."""
+        with self._lock:
+            return [
+                self._tasks[i] for i in self._dependents.get(task_id, ())
+                if self._indexed[i][0] == TaskStatus.PENDING
+            ]
 
     def get_all_tasks(self) -> List[Task]:
         """Get all tasks in the queue."""
@@ -121,12 +451,13 @@ class InMemoryTaskQueue(TaskQueue):
     def get_tasks_by_status(self, status: TaskStatus) -> List[Task]:
         """Get all tasks with a specific status."""
         with self._lock:
-            return [t for t in self._tasks.values() if t.status == status]
+            return [self._tasks[i] for i in self._by_status[status]]
 
     def remove_task(self, task_id: str) -> bool:
         """Remove a task from the queue."""
         with self._lock:
             if task_id in self._tasks:
+                self._unindex(task_id)
                 del self._tasks[task_id]
                 logger.info(f"Task removed: {task_id}")
                 return True
@@ -135,39 +466,62 @@ class InMemoryTaskQueue(TaskQueue):
     def clear_completed(self) -> int:
         """Remove all completed tasks. Returns count of removed tasks."""
         with self._lock:
-            completed_ids = [
-                t.id for t in self._tasks.values()
-                if t.status in (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
-            ]
+            completed_ids = (
+                list(self._by_status[TaskStatus.COMPLETED]) +
+                list(self._by_status[TaskStatus.CANCELLED])
+            )
             for task_id in completed_ids:
+                self._unindex(task_id)
                 del self._tasks[task_id]
             logger.info(f"Cleared {len(completed_ids)} completed tasks")
             return len(completed_ids)
 
+    def prune_finished(
+        self,
+        max_age_seconds: Optional[float] = None,
+        max_finished: Optional[int] = None,
+    ) -> Dict[str, Optional[str]]:
+        """Remove finished tasks beyond a retention limit (see TaskQueue.prune_finished)."""
+        cutoff = finished_cutoff(max_age_seconds)
+        removed: Dict[str, Optional[str]] = {}
+        with self._lock:
+            finished = sorted(
+                (self._tasks[i] for status in FINISHED_STATUSES for i in self._by_status[status]),
+                key=lambda t: t.completed_at or t.updated_at,
+                reverse=True,
+            )
+            for rank, task in enumerate(finished):
+                finished_at = task.completed_at or task.updated_at
+                expired = (
+                    (max_finished is not None and rank >= max_finished) or
+                    (cutoff is not None and finished_at < cutoff)
+                )
+                if not expired or any(
+                    self._indexed[i][0] in (TaskStatus.PENDING, TaskStatus.RUNNING)
+                    for i in self._dependents.get(task.id, ())
+                ):
+                    continue
+                removed[task.id] = task.result_ref
+                self._unindex(task.id)
+                del self._tasks[task.id]
+        if removed:
+            logger.info(f"Pruned {len(removed)} finished tasks")
+        return removed
+
     def _sort_by_priority(self, tasks: List[Task]) -> List[Task]:
         """Sort tasks by priority (HIGH first) and creation time."""
         return sorted(
             tasks,
-            key=lambda t: (self.PRIORITY_MAP[t.priority], t.created_at)
+            key=self.order_key
         )
 
     def stats(self) -> Dict[str, int]:
         """Get queue statistics."""
         with self._lock:
-            stats = {
+            return {
                 "total": len(self._tasks),
-                "pending": 0,
-                "running": 0,
-                "completed": 0,
-                "failed": 0,
+                "pending": len(self._by_status[TaskStatus.PENDING]),
+                "running": len(self._by_status[TaskStatus.RUNNING]),
+                "completed": len(self._by_status[TaskStatus.COMPLETED]),
+                "failed": len(self._by_status[TaskStatus.FAILED]),
             }
-            for task in self._tasks.values():
-                if task.status == TaskStatus.PENDING:
-                    stats["pending"] += 1
-                elif task.status == TaskStatus.RUNNING:
-                    stats["running"] += 1
-                elif task.status == TaskStatus.COMPLETED:
-                    stats["completed"] += 1
-                elif task.status == TaskStatus.FAILED:
-                    stats["failed"] += 1
-            return stats
@@ -0,0 +1,159 @@
+"""
+Task Retention - Pruning finished tasks and offloading large results
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from .task import Task
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    How long finished (COMPLETED, FAILED, CANCELLED) tasks stay in the queue.
+
+    A finished task is pruned once it is older than max_age_seconds or
+    outside the max_finished most recently finished tasks. Tasks that a
+    PENDING or RUNNING task still depends on are always kept.
+    """
+    max_age_seconds: Optional[float] = None
+    max_finished: Optional[int] = None
+    prune_interval: float = 30.0  # Seconds between pruning passes
+
+    def __post_init__(self):
+        if self.max_finished is not None and self.max_finished < 0:
+            raise ValueError("max_finished must not be negative")
+
+
+class ResultStore(ABC):
+    """
+    Abstract base class for stores holding task results outside the queue.
+
+    offload() replaces a large Task.result with a reference (Task.result_ref)
+    and load() resolves it again, so queues only keep small results.
+    """
+
+    def __init__(self, offload_bytes: int = 64 * 1024):
+        """
+        Args:
+            offload_bytes: Results whose JSON encoding reaches this size are offloaded
+        """
+        self.offload_bytes = offload_bytes
+
+    @abstractmethod
+    def put(self, task_id: str, data: bytes) -> str:
+        """Store an encoded result. Returns its reference."""
+        pass
+
+    @abstractmethod
+    def get(self, ref: str) -> Optional[bytes]:
+        """Read an encoded result, or None if it is gone."""
+        pass
+
+    @abstractmethod
+    def delete(self, ref: str) -> bool:
+        """Delete a stored result."""
+        pass
+
+    def offload(self, task: Task) -> bool:
+        """
+        Move a task's result into the store if it is large enough.
+
+        Returns:
+            True if the result was offloaded (task.result is then None)
+        """
+        if task.result is None or task.result_ref is not None:
+            return False
+        try:
+            data = json.dumps(task.result).encode()
+        except (TypeError, ValueError):
+            # Not JSON-serializable: keep it inline
+            return False
+        if len(data) < self.offload_bytes:
+            return False
+        task.result_ref = self.put(task.id, data)
+        task.result = None
+        logger.debug(f"Offloaded result of {task.id} ({len(data)} bytes) -> {task.result_ref}")
+        return True
+
+    def load(self, task: Task) -> Optional[Dict[str, Any]]:
+        """Get a task's result, reading it from the store if it was offloaded."""
+        if task.result_ref is None:
+            return task.result
+        data = self.get(task.result_ref)
+        if data is None:
+            logger.warning(f"Offloaded result of {task.id} is missing: {task.result_ref}")
+            return None
+        return json.loads(data)
+
+
+class FileResultStore(ResultStore):
+    """
+    Results stored as (gzip-compressed) JSON files, one per task.
+
+    References are file names relative to the directory, so processes
+    sharing a SqliteTaskQueue can share the store by pointing at the same
+    directory.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        offload_bytes: int = 64 * 1024,
+        compress: bool = True,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Result directory. Defaults to ~/.multi-agent-flow/results
+            offload_bytes: Results whose JSON encoding reaches this size are offloaded
+            compress: gzip stored results
+        """
+        super().__init__(offload_bytes)
+        self.directory = Path(directory) if directory else Path.home() / ".multi-agent-flow" / "results"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+
+    def _path(self, ref: str) -> Path:
+        path = self.directory / ref
+        if path.parent != self.directory:
+            raise ValueError(f"Invalid result reference: {ref}")
+        return path
+
+    def put(self, task_id: str, data: bytes) -> str:
+        ref = f"{task_id}.json.gz" if self.compress else f"{task_id}.json"
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".result-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(ref))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return ref
+
+    def get(self, ref: str) -> Optional[bytes]:
+        try:
+            data = self._path(ref).read_bytes()
+        except FileNotFoundError:
+            return None
+        return gzip.decompress(data) if ref.endswith(".gz") else data
+
+    def delete(self, ref: str) -> bool:
+        try:
+            self._path(ref).unlink()
+            return True
+        except FileNotFoundError:
+            return False
@@ -2,15 +2,24 @@
 Task Scheduler - Main orchestration logic for multi-agent task execution
 """
 import logging
+import os
+import socket
 import threading
 import time
+import uuid
+from collections import deque
 from pathlib import Path
-from typing import Dict, Optional, Callable, Any
-from datetime import datetime
+from concurrent.futures import Future
+from typing import Dict, Optional, Callable, Any, Union
+from datetime import datetime, timezone
 
 from .task import Task, TaskStatus, TaskPriority, AgentState, AgentStatus
-from .queue import InMemoryTaskQueue
+from .queue import TaskQueue, InMemoryTaskQueue
 from .state_manager import AgentStateManager
+from .executor import TaskExecutor, create_executor
+from .policy import AgentSelectionPolicy, create_policy
+from .retention import RetentionPolicy, ResultStore
+from .fairness import SUBMITTER_KEY, created_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -25,22 +34,119 @@ class TaskScheduler:
     - Parallel task execution
     - Agent state management
     - File-based state persistence
+
+    Dispatch is event-driven: submitting, completing or failing a task and
+    an agent becoming idle wake the scheduler loop immediately. The loop
+    still runs every poll_interval seconds as a safety net for changes made
+    behind the scheduler's back (e.g. direct queue edits).
+
+    Tasks run on a bounded executor ("thread", "process" for CPU-heavy
+    handlers, or "asyncio" for async handlers). While the executor is full,
+    runnable tasks wait in the queue rather than being dispatched.
+
+    With a shared queue (SqliteTaskQueue) several schedulers can run at
+    once: tasks are claimed atomically under a lease that this scheduler
+    renews, leases abandoned by a crashed scheduler are recovered, and
+    tasks submitted by other processes are picked up within the queue's
+    watch_interval.
+
+    Tasks may carry a deadline (and an estimated duration). Admission
+    predicts when a new task would finish from the work queued ahead of it
+    in the queue's dispatch order (use an edf queue for deadline-first
+    dispatch); a task predicted to miss its deadline is flagged
+    (metadata["deadline_at_risk"]) or, with deadline_policy="reject",
+    refused. Finished tasks record whether they met their deadline
+    (Task.sla_met), aggregated by get_sla_stats().
+
+    With a RetentionPolicy, finished tasks are pruned from the queue every
+    prune_interval seconds. With a ResultStore, large results are offloaded
+    on completion; the task keeps a reference (result_ref) and
+    get_task_status() loads the result on demand.
     """
 
+    # Number of recent dispatch latencies kept for percentiles
+    LATENCY_WINDOW = 1000
+
+    # What admission does with a task predicted to miss its deadline
+    DEADLINE_POLICIES = ("flag", "reject")
+
     def __init__(
         self,
         state_file: Optional[Path] = None,
         max_queue_size: int = 100,
-        poll_interval: float = 2.0,
+        poll_interval: float = 10.0,
+        executor: Union[str, TaskExecutor] = "thread",
+        max_workers: int = 8,
+        max_pending_executions: int = 0,
+        state_flush_interval: Optional[float] = 1.0,
+        queue: Optional[TaskQueue] = None,
+        lease_seconds: float = 60.0,
+        agent_policy: Union[str, AgentSelectionPolicy] = "least_loaded",
+        retention: Optional[RetentionPolicy] = None,
+        result_store: Optional[ResultStore] = None,
+        deadline_policy: str = "flag",
+        state_manager: Optional[AgentStateManager] = None,
     ):
-        self.queue = InMemoryTaskQueue(max_size=max_queue_size)
-        self.state_manager = AgentStateManager(state_file)
+        if deadline_policy not in self.DEADLINE_POLICIES:
+            raise ValueError(
+                f"Unknown deadline policy: {deadline_policy} (expected one of {', '.join(self.DEADLINE_POLICIES)})"
+            )
+        self.queue = queue if queue is not None else InMemoryTaskQueue(max_size=max_queue_size)
+        # Claims on shared queues are leased to this scheduler instance
+        self.scheduler_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        # Agent state is written behind (see AgentStateManager); None writes through.
+        # A given manager is used as-is (e.g. a read-only view for submitting only)
+        if state_manager is None:
+            state_manager = AgentStateManager(state_file, flush_interval=state_flush_interval)
+        self.state_manager = state_manager
         self.poll_interval = poll_interval
 
         self._running = False
         self._scheduler_thread: Optional[threading.Thread] = None
         self._task_handlers: Dict[str, Callable] = {}
 
+        # Executor: an instance is used as-is, a kind is created on start()
+        self._executor_kind = executor if isinstance(executor, str) else executor.kind
+        self._executor: Optional[TaskExecutor] = None if isinstance(executor, str) else executor
+        self._max_workers = max_workers
+        self._max_pending_executions = max_pending_executions
+        self._futures: Dict[str, Future] = {}
+
+        # Agent selection among agents with free slots
+        self.agent_policy = create_policy(agent_policy)
+        self._started: Dict[str, float] = {}  # task_id -> monotonic dispatch time
+
+        # Finished task retention and result offload
+        self.retention = retention
+        self.result_store = result_store
+        self._pruned = 0
+
+        # Deadlines: admission outcome and SLA counters, lateness of misses
+        self.deadline_policy = deadline_policy
+        self._sla = {"met": 0, "missed": 0, "flagged": 0, "rejected": 0}
+        self._lateness_s: deque = deque(maxlen=self.LATENCY_WINDOW)
+
+        # Wake-up signalling: monotonic time of the first unhandled wake
+        self._wake = threading.Condition()
+        self._wake_at: Optional[float] = None
+
+        # Dispatch latency tracking
+        self._ready_at: Dict[str, float] = {}
+        self._latencies_ms: deque = deque(maxlen=self.LATENCY_WINDOW)
+        # Queue wait (created -> claimed) per priority class
+        self._queue_waits_ms: Dict[TaskPriority, deque] = {
+            priority: deque(maxlen=self.LATENCY_WINDOW) for priority in TaskPriority
+        }
+        self._queue_wait_counts: Dict[TaskPriority, int] = {priority: 0 for priority in TaskPriority}
+        self._dispatched = 0
+        self._wakeups = 0
+        self._external_wakeups = 0
+        self._polls = 0
+        self._last_poll = self._last_lease_check = self._last_prune = time.monotonic()
+
+        self.state_manager.add_listener(self._on_agent_state_change)
+
         logger.info("TaskScheduler initialized")
 
     def register_agents_from_config(self, agents_config: Dict[str, Any]) -> None:
@@ -55,6 +161,7 @@ class TaskScheduler:
                 roles=config.roles,
                 model=config.model,
                 status=AgentStatus.IDLE,
+                capacity=getattr(config, "capacity", 1),
             )
             self.state_manager.register_agent(agent_state)
 
@@ -75,6 +182,9 @@ class TaskScheduler:
         priority: TaskPriority = TaskPriority.NORMAL,
         dependencies: list[str] = None,
         metadata: Dict[str, Any] = None,
+        submitter: Optional[str] = None,
+        deadline: Optional[Union[str, datetime]] = None,
+        estimated_seconds: Optional[float] = None,
     ) -> Task:
         """
         Submit a new task to the scheduler.
@@ -85,26 +195,124 @@ class TaskScheduler:
             priority: Task priority level
             dependencies: List of task IDs that must complete first
             metadata: Additional task metadata
+            submitter: Who submitted the task (fair share between submitters)
+            deadline: Time the task must finish by (datetime, or ISO string;
+                      naive values are UTC)
+            estimated_seconds: Expected run time (defaults to the role's
+                               historical average for admission checks)
 
         Returns:
             The created Task object
+
+        Raises:
+            RuntimeError: The queue is full, or deadline_policy is "reject"
+                          and the task is predicted to miss its deadline
         """
+        metadata = dict(metadata or {})
+        if submitter is not None:
+            metadata[SUBMITTER_KEY] = submitter
         task = Task(
             description=description,
             target_role=target_role,
             priority=priority,
             dependencies=dependencies or [],
-            metadata=metadata or {},
+            metadata=metadata,
+            deadline=_utc_iso(deadline) if deadline is not None else None,
+            estimated_seconds=estimated_seconds,
         )
+        if task.deadline:
+            self._admit_deadline(task)
         self.queue.submit(task)
+        self._ready_at[task.id] = time.monotonic()
         logger.info(f"Task submitted: {task.id} -> {target_role}")
+        self.wake()
         return task
 
+    def _admit_deadline(self, task: Task) -> None:
+        """Flag or reject a task predicted to finish after its deadline."""
+        predicted = self.predict_finish(task)
+        if predicted is None:
+            return
+        late = predicted - created_timestamp(task.deadline)
+        if late <= 0:
+            return
+        predicted_iso = _utc_iso(datetime.fromtimestamp(predicted, timezone.utc))
+        if self.deadline_policy == "reject":
+            self._sla["rejected"] += 1
+            raise RuntimeError(
+                f"Task would miss its deadline {task.deadline} by {late:.0f}s "
+                f"(predicted finish {predicted_iso})"
+            )
+        task.metadata["deadline_at_risk"] = True
+        task.metadata["predicted_finish"] = predicted_iso
+        self._sla["flagged"] += 1
+        logger.warning(f"Task {task.id} predicted to miss its deadline by {late:.0f}s")
+
+    def _estimate_seconds(self, task: Task, agents: list) -> float:
+        """A task's expected run time: its own estimate, else its agents' average."""
+        if task.estimated_seconds is not None:
+            return task.estimated_seconds
+        return _average_seconds(agents)
+
+    def predict_finish(self, task: Task) -> Optional[float]:
+        """
+        Predict when a task submitted now would finish.
+
+        The work ahead of it (pending tasks of its role that sort before it
+        in the queue's dispatch order, plus what remains of tasks running on
+        its role's agents) is spread over the role's agent slots, and the
+        task's own estimated run time is added.
+
+        Returns:
+            Predicted finish as seconds since the epoch, or None when no
+            agent serves the role
+        """
+        agents = [
+            a for a in self.state_manager.get_all_states().values()
+            if a.can_handle_role(task.target_role) and a.status != AgentStatus.OFFLINE
+        ]
+        slots = sum(a.capacity for a in agents)
+        if not slots:
+            return None
+
+        estimated, unestimated = self.queue.pending_ahead(task)
+        backlog = estimated + unestimated * _average_seconds(agents)
+        now = time.monotonic()
+        for agent in agents:
+            for task_id in agent.running_task_ids:
+                running = self.queue.get_task(task_id)
+                if running is None:
+                    continue
+                if task_id in self._started:
+                    elapsed = now - self._started[task_id]
+                else:
+                    # Started by another scheduler (see AgentStateManager read_only)
+                    elapsed = time.time() - created_timestamp(running.started_at) if running.started_at else 0.0
+                backlog += max(self._estimate_seconds(running, [agent]) - elapsed, 0.0)
+
+        return time.time() + backlog / slots + self._estimate_seconds(task, agents)
+
+    def _record_sla(self, task: Task) -> None:
+        """Record whether a finished task with a deadline met it."""
+        if not task.deadline:
+            return
+        lateness = created_timestamp(task.completed_at) - created_timestamp(task.deadline)
+        task.sla_met = task.status == TaskStatus.COMPLETED and lateness <= 0
+        if task.sla_met:
+            self._sla["met"] += 1
+        else:
+            self._sla["missed"] += 1
+            self._lateness_s.append(max(lateness, 0.0))
+            logger.warning(f"Task {task.id} missed its deadline ({task.status.value}, {lateness:.1f}s late)")
+
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get the status of a task."""
+        """Get the status of a task (loading an offloaded result from the result store)."""
         task = self.queue.get_task(task_id)
         if task:
-            return task.to_dict()
+            status = task.to_dict()
+            if task.result_ref is not None and self.result_store is not None:
+                status["result"] = self.result_store.load(task)
+            return status
         return None
 
     def cancel_task(self, task_id: str) -> bool:
@@ -114,61 +322,80 @@ class TaskScheduler:
             task.status = TaskStatus.CANCELLED
             task.updated_at = datetime.utcnow().isoformat()
             self.queue.update_task(task)
+            self._ready_at.pop(task_id, None)
             logger.info(f"Task cancelled: {task_id}")
             return True
         return False
 
+    def wake(self) -> None:
+        """Ask the scheduler loop to process the queue now"""
+        with self._wake:
+            if self._wake_at is None:
+                self._wake_at = time.monotonic()
+            self._wake.notify()
+
+    def _on_agent_state_change(self, agent: AgentState) -> None:
+        """An agent with a free slot may unblock a waiting task"""
+        if agent.is_available():
+            self.wake()
+
     def _find_agent_for_task(self, task: Task) -> Optional[AgentState]:
-        """Find an available agent that can handle the task's role."""
+        """Find an agent with a free slot for the task's role, chosen by the agent policy."""
         available = self.state_manager.get_available_agents(role=task.target_role)
-        if available:
-            return available[0]  # Return first available agent
-        return None
+        return self.agent_policy.select(task, available)
 
-    def _dispatch_task(self, task: Task, agent: AgentState) -> None:
-        """Dispatch a task to an agent."""
+    def _assign_task(self, task: Task, agent: AgentState) -> None:
+        """Record a claimed task's assignment and occupy one of the agent's slots."""
         logger.info(f"Dispatching task {task.id} to agent {agent.id}")
 
-        # Update task status
-        task.status = TaskStatus.RUNNING
+        # Record the assignment (the task was claimed RUNNING by _process_queue)
         task.assigned_agent_id = agent.id
-        task.started_at = datetime.utcnow().isoformat()
-        task.updated_at = task.started_at
+        task.updated_at = datetime.utcnow().isoformat()
         self.queue.update_task(task)
 
         # Update agent status
+        self._started[task.id] = time.monotonic()
         self.state_manager.set_agent_working(agent.id, task.id)
 
-        # Execute task in a separate thread
-        def execute():
-            try:
-                result = self._execute_task(task, agent)
-                self._complete_task(task.id, result)
-            except Exception as e:
-                logger.error(f"Task {task.id} failed: {e}")
-                self._fail_task(task.id, str(e))
-
-        thread = threading.Thread(target=execute, daemon=True)
-        thread.start()
+    def _dispatch_task(self, task: Task, agent: AgentState) -> None:
+        """Dispatch a task to an agent."""
+        self._assign_task(task, agent)
+
+        # Execute task on the executor
+        if self._executor_kind == "process":
+            # Bound methods cannot be pickled; ship the handler itself
+            fn = self._task_handlers.get(task.target_role, simulate_task)
+        else:
+            fn = self._execute_task
+        future = self._executor.submit(fn, task, agent)
+        self._futures[task.id] = future
+        future.add_done_callback(lambda f: self._on_task_done(task.id, f))
+
+    def _on_task_done(self, task_id: str, future: Future) -> None:
+        """Record the outcome of an executed task."""
+        self._futures.pop(task_id, None)
+        if future.cancelled():
+            self._cancel_running_task(task_id)
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Task {task_id} failed: {error}")
+            self._fail_task(task_id, str(error))
+        else:
+            self._complete_task(task_id, future.result())
 
     def _execute_task(self, task: Task, agent: AgentState) -> Dict[str, Any]:
         """
         Execute a task. Override this method or register handlers for custom execution.
+        Handlers may be coroutine functions; the executor awaits their result.
+        (With the process executor, registered handlers are called directly.)
         """
         handler = self._task_handlers.get(task.target_role)
 
         if handler:
             return handler(task, agent)
 
-        # Default: simulate task execution
-        logger.info(f"Executing task {task.id} on agent {agent.id}")
-        time.sleep(1)  # Simulate work
-
-        return {
-            "status": "completed",
-            "message": f"Task executed by {agent.id}",
-            "timestamp": datetime.utcnow().isoformat(),
-        }
+        return simulate_task(task, agent)
 
     def _complete_task(self, task_id: str, result: Dict[str, Any]) -> None:
         """Mark a task as completed."""
@@ -178,14 +405,29 @@ class TaskScheduler:
 
         task.status = TaskStatus.COMPLETED
         task.result = result
+        if self.result_store is not None:
+            self.result_store.offload(task)
         task.completed_at = datetime.utcnow().isoformat()
         task.updated_at = task.completed_at
+        self._record_sla(task)
         self.queue.update_task(task)
 
+        # Dependents become ready now, at the earliest
+        now = time.monotonic()
+        for dependent in self.queue.get_dependents(task_id):
+            self._ready_at[dependent.id] = now
+
+        started = self._started.pop(task_id, None)
         if task.assigned_agent_id:
-            self.state_manager.set_agent_idle(task.assigned_agent_id, task_completed=True)
+            self.state_manager.set_agent_idle(
+                task.assigned_agent_id,
+                task_completed=True,
+                task_id=task_id,
+                duration=time.monotonic() - started if started is not None else None,
+            )
 
         logger.info(f"Task completed: {task_id}")
+        self.wake()
 
     def _fail_task(self, task_id: str, error: str) -> None:
         """Mark a task as failed."""
@@ -197,57 +439,307 @@ class TaskScheduler:
         task.error = error
         task.completed_at = datetime.utcnow().isoformat()
         task.updated_at = task.completed_at
+        self._record_sla(task)
         self.queue.update_task(task)
 
+        self._started.pop(task_id, None)
         if task.assigned_agent_id:
-            self.state_manager.set_agent_error(task.assigned_agent_id, error)
+            self.state_manager.set_task_failed(task.assigned_agent_id, task_id, error)
 
         logger.error(f"Task failed: {task_id} - {error}")
+        self.wake()
+
+    def _cancel_running_task(self, task_id: str) -> None:
+        """Mark a dispatched task cancelled (executor shut down without draining)."""
+        task = self.queue.get_task(task_id)
+        if not task:
+            return
 
-    def _process_queue(self) -> int:
+        task.status = TaskStatus.CANCELLED
+        task.completed_at = datetime.utcnow().isoformat()
+        task.updated_at = task.completed_at
+        self.queue.update_task(task)
+
+        self._started.pop(task_id, None)
+        if task.assigned_agent_id:
+            self.state_manager.set_agent_idle(task.assigned_agent_id, task_completed=False, task_id=task_id)
+
+        logger.info(f"Task cancelled while dispatched: {task_id}")
+
+    def _process_queue(self, woke_at: Optional[float] = None) -> int:
         """
         Process the task queue. Returns number of tasks dispatched.
+
+        Args:
+            woke_at: Monotonic time of the wake-up that triggered this pass
+                     (None for a safety-net poll)
         """
         dispatched = 0
-        runnable_tasks = self.queue.get_runnable_tasks()
-
-        for task in runnable_tasks:
+        # Roles with no free agent left in this pass
+        blocked = set()
+
+        while True:
+            if not self._has_capacity():
+                # Backpressure: leave the rest queued until a worker frees up
+                break
+            task = self.queue.peek_runnable(exclude_roles=blocked)
+            if task is None:
+                break
             agent = self._find_agent_for_task(task)
-            if agent:
-                self._dispatch_task(task, agent)
-                dispatched += 1
+            if agent is None:
+                blocked.add(task.target_role)
+                continue
+            claimed = self.queue.claim(task.id, self.scheduler_id, self.lease_seconds)
+            if claimed is None:
+                # Another scheduler sharing the queue got it first
+                self._ready_at.pop(task.id, None)
+                continue
+            task = claimed
+            self._dispatch_task(task, agent)
+            self._record_dispatch(task, woke_at)
+            self._record_queue_wait(task)
+            dispatched += 1
 
         return dispatched
 
+    def _has_capacity(self) -> bool:
+        """Whether another task can be dispatched now"""
+        return self._executor.has_capacity()
+
+    def _record_dispatch(self, task: Task, woke_at: Optional[float]) -> None:
+        """
+        Record how long a task waited between becoming dispatchable and dispatch.
+
+        A task becomes dispatchable when it is submitted or its last
+        dependency completes; if it then waited for a free agent, the
+        wake-up that announced the agent starts the clock instead.
+        """
+        ready_at = self._ready_at.pop(task.id, None)
+        if ready_at is None:
+            return
+        if woke_at is not None:
+            ready_at = max(ready_at, woke_at)
+        self._latencies_ms.append((time.monotonic() - ready_at) * 1000)
+        self._dispatched += 1
+
+    def _record_queue_wait(self, task: Task) -> None:
+        """
+        Record how long a claimed task waited since it was created.
+
+        Measured from the task's own timestamps, so tasks submitted by
+        other processes to a shared queue are included.
+        """
+        if not task.started_at:
+            return
+        waited = created_timestamp(task.started_at) - created_timestamp(task.created_at)
+        self._queue_waits_ms[task.priority].append(max(waited, 0.0) * 1000)
+        self._queue_wait_counts[task.priority] += 1
+
     def start(self) -> None:
         """Start the scheduler loop in a background thread."""
         if self._running:
             logger.warning("Scheduler is already running")
             return
 
+        if self._executor is None or self._executor.is_shutdown:
+            self._executor = create_executor(
+                self._executor_kind, self._max_workers, self._max_pending_executions
+            )
+
         self._running = True
+        # Dispatch anything submitted before the loop started
+        self.wake()
+
+        timeout = self._loop_timeout()
 
         def scheduler_loop():
             logger.info("Scheduler loop started")
+            self._last_poll = self._last_lease_check = time.monotonic()
             while self._running:
-                try:
-                    self._process_queue()
-                except Exception as e:
-                    logger.error(f"Scheduler error: {e}")
-                time.sleep(self.poll_interval)
+                with self._wake:
+                    if self._wake_at is None:
+                        self._wake.wait(timeout)
+                    woke_at, self._wake_at = self._wake_at, None
+                if not self._running:
+                    break
+                self._loop_tick(woke_at)
             logger.info("Scheduler loop stopped")
 
         self._scheduler_thread = threading.Thread(target=scheduler_loop, daemon=True)
         self._scheduler_thread.start()
         logger.info("TaskScheduler started")
 
-    def stop(self) -> None:
-        """Stop the scheduler loop."""
+    def _loop_timeout(self) -> float:
+        """Longest the loop may sleep: often enough to renew leases and watch shared queues"""
+        timeout = min(self.poll_interval, self.lease_seconds / 3)
+        if self.queue.watch_interval:
+            timeout = min(timeout, self.queue.watch_interval)
+        return timeout
+
+    def _loop_tick(self, woke_at: Optional[float]) -> None:
+        """
+        One scheduler loop iteration after waking or timing out.
+
+        Args:
+            woke_at: Monotonic time of the wake-up (None when the wait timed out)
+        """
+        try:
+            now = time.monotonic()
+            if now - self._last_lease_check >= self.lease_seconds / 3:
+                self._last_lease_check = now
+                self._maintain_leases()
+
+            if self.retention and now - self._last_prune >= self.retention.prune_interval:
+                self._last_prune = now
+                self.prune_tasks()
+
+            if woke_at is not None:
+                self._wakeups += 1
+            elif self.queue.changed_externally():
+                self._external_wakeups += 1
+            elif now - self._last_poll >= self.poll_interval:
+                self._polls += 1
+            else:
+                return
+            self._last_poll = now
+            self._process_queue(woke_at)
+        except Exception as e:
+            logger.error(f"Scheduler error: {e}")
+
+    def _maintain_leases(self) -> None:
+        """Renew this scheduler's leases and recover leases abandoned by others."""
+        self.queue.renew_leases(self.scheduler_id, self.lease_seconds)
+        recovered = self.queue.recover_expired_leases()
+        if recovered:
+            logger.warning(f"Recovered {len(recovered)} task(s) with expired leases")
+            now = time.monotonic()
+            for task_id in recovered:
+                self._ready_at[task_id] = now
+            self.wake()
+
+    def prune_tasks(self) -> int:
+        """
+        Apply the retention policy now.
+
+        Returns:
+            Number of finished tasks removed from the queue
+        """
+        if self.retention is None:
+            return 0
+        removed = self.queue.prune_finished(self.retention.max_age_seconds, self.retention.max_finished)
+        for task_id, result_ref in removed.items():
+            self._ready_at.pop(task_id, None)
+            if result_ref is not None and self.result_store is not None:
+                self.result_store.delete(result_ref)
+        self._pruned += len(removed)
+        return len(removed)
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the scheduler loop and shut down the executor.
+
+        Args:
+            drain: Wait for running tasks to finish. False cancels tasks that
+                   have not started (and running ones on the asyncio executor);
+                   they are marked CANCELLED and their agents set idle.
+            timeout: Seconds to wait for running tasks when draining
+        """
         self._running = False
+        with self._wake:
+            self._wake.notify()
         if self._scheduler_thread:
             self._scheduler_thread.join(timeout=5.0)
+        if self._executor and not self._executor.is_shutdown:
+            self._executor.shutdown(drain=drain, timeout=timeout)
+        self.state_manager.flush()
         logger.info("TaskScheduler stopped")
 
+    def get_slot_utilization(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-agent slot usage.
+
+        Returns:
+            agent_id -> capacity, running, utilization_percent and
+            avg_task_seconds (historical, None until a task is timed)
+        """
+        utilization = {}
+        for agent_id, state in self.state_manager.get_all_states().items():
+            avg = state.avg_task_seconds()
+            utilization[agent_id] = {
+                "capacity": state.capacity,
+                "running": len(state.running_task_ids),
+                "utilization_percent": round(state.load() * 100, 1),
+                "avg_task_seconds": round(avg, 3) if avg is not None else None,
+            }
+        return utilization
+
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """
+        Dispatch latency statistics.
+
+        Returns:
+            Dict with dispatched count, wakeups (in-process events),
+            external_wakeups (shared queue changed), safety-net polls and
+            avg/p50/p95/max latency in milliseconds over the recent window
+        """
+        latencies = sorted(self._latencies_ms)
+        return {
+            "dispatched": self._dispatched,
+            "wakeups": self._wakeups,
+            "external_wakeups": self._external_wakeups,
+            "polls": self._polls,
+            "avg_latency_ms": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50_latency_ms": _percentile(latencies, 0.5),
+            "p95_latency_ms": _percentile(latencies, 0.95),
+            "max_latency_ms": round(latencies[-1], 3) if latencies else None,
+        }
+
+    def get_queue_wait_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Queue wait statistics per priority class.
+
+        The wait runs from task creation to dispatch and includes time spent
+        blocked on dependencies. A priority class whose p99/max keeps
+        growing while tasks of other classes are dispatched is starving.
+
+        Returns:
+            Priority -> dispatched count and p50/p95/p99/max wait in
+            milliseconds over the recent window
+        """
+        stats = {}
+        for priority in TaskPriority:
+            waits = sorted(self._queue_waits_ms[priority])
+            stats[priority.value] = {
+                "dispatched": self._queue_wait_counts[priority],
+                "p50_wait_ms": _percentile(waits, 0.5),
+                "p95_wait_ms": _percentile(waits, 0.95),
+                "p99_wait_ms": _percentile(waits, 0.99),
+                "max_wait_ms": round(waits[-1], 3) if waits else None,
+            }
+        return stats
+
+    def get_sla_stats(self) -> Dict[str, Any]:
+        """
+        Deadline statistics.
+
+        Returns:
+            Dict with met/missed counts of finished tasks that had a
+            deadline (failed ones count as missed), hit rate, tasks
+            flagged or rejected at admission, and p95/max lateness in
+            seconds of recent misses
+        """
+        finished = self._sla["met"] + self._sla["missed"]
+        lateness = sorted(self._lateness_s)
+        return {
+            **self._sla,
+            "hit_rate_percent": round(self._sla["met"] / finished * 100, 1) if finished else None,
+            "p95_lateness_seconds": _percentile(lateness, 0.95),
+            "max_lateness_seconds": round(lateness[-1], 3) if lateness else None,
+        }
+
+    def _executor_stats(self) -> Dict[str, Any]:
+        return self._executor.stats() if self._executor else {"kind": self._executor_kind}
+
     def get_status(self) -> Dict[str, Any]:
         """Get overall scheduler status."""
         queue_stats = self.queue.stats()
@@ -256,6 +748,17 @@ class TaskScheduler:
         return {
             "running": self._running,
             "queue": queue_stats,
+            "dispatch": self.get_dispatch_stats(),
+            "queue_wait": self.get_queue_wait_stats(),
+            "sla": self.get_sla_stats(),
+            "executor": self._executor_stats(),
+            "agent_policy": self.agent_policy.name,
+            "retention": {
+                "max_age_seconds": self.retention.max_age_seconds,
+                "max_finished": self.retention.max_finished,
+                "pruned": self._pruned,
+            } if self.retention else None,
+            "slots": self.get_slot_utilization(),
             "agents": {
                 agent_id: state.to_dict()
                 for agent_id, state in agent_states.items()
@@ -274,5 +777,59 @@ class TaskScheduler:
         print(f"  Running: {'Yes' if status['running'] else 'No'}")
         print(f"  Tasks - Pending: {queue['pending']} | Running: {queue['running']} | "
               f"Completed: {queue['completed']} | Failed: {queue['failed']}")
+        dispatch = status["dispatch"]
+        if dispatch["dispatched"]:
+            print(f"  Dispatch latency - avg: {dispatch['avg_latency_ms']}ms | "
+                  f"p95: {dispatch['p95_latency_ms']}ms | max: {dispatch['max_latency_ms']}ms "
+                  f"({dispatch['dispatched']} dispatched, {dispatch['wakeups']} wakeups, "
+                  f"{dispatch['polls']} polls)")
+            waits = " | ".join(
+                f"{priority}: p95 {stats['p95_wait_ms']}ms max {stats['max_wait_ms']}ms"
+                for priority, stats in status["queue_wait"].items() if stats["dispatched"]
+            )
+            print(f"  Queue wait - {waits}")
+        sla = status["sla"]
+        if sla["met"] or sla["missed"] or sla["flagged"] or sla["rejected"]:
+            print(f"  Deadlines - met: {sla['met']} | missed: {sla['missed']} | "
+                  f"hit rate: {sla['hit_rate_percent']}% | flagged: {sla['flagged']} | "
+                  f"rejected: {sla['rejected']}")
+        executor = status["executor"]
+        if "max_workers" in executor:
+            print(f"  Executor ({executor['kind']}) - active: {executor['active']}/{executor['max_workers']} | "
+                  f"queued: {executor['queued']} | avg utilization: {executor['avg_utilization_percent']}%")
         print("=" * 60)
         print(self.state_manager.print_status())
+
+
+def _utc_iso(value: Union[str, datetime]) -> str:
+    """Normalize a datetime or ISO string to a naive UTC ISO string (like created_at)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _average_seconds(agents: list) -> float:
+    """Average task run time of agents that have one (0.0 if none do)"""
+    known = [a.avg_task_seconds() for a in agents if a.avg_task_seconds() is not None]
+    return sum(known) / len(known) if known else 0.0
+
+
+def _percentile(values: list, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values (None if empty)"""
+    if not values:
+        return None
+    return round(values[min(int(len(values) * fraction), len(values) - 1)], 3)
+
+
+def simulate_task(task: Task, agent: AgentState) -> Dict[str, Any]:
+    """Default task execution: simulate work (module-level so process pools can pickle it)."""
+    logger.info(f"Executing task {task.id} on agent {agent.id}")
+    time.sleep(1)  # Simulate work
+
+    return {
+        "status": "completed",
+        "message": f"Task executed by {agent.id}",
+        "timestamp": datetime.utcnow().isoformat(),
+    }
@@ -0,0 +1,522 @@
+"""
+SQLite Task Queue - Durable task queue shared by CLI invocations and schedulers
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable, Tuple
+
+from .task import Task, TaskStatus
+from .queue import TaskQueue, finished_cutoff
+from .fairness import FairShare, PRIORITY_RANK, SUBMITTER_KEY, submitter_of
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    target_role TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    assigned_agent_id TEXT,
+    result TEXT,
+    result_ref TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    deadline TEXT,
+    estimated_seconds REAL,
+    sla_met INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks(status, target_role, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(status, lease_expires);
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_id TEXT NOT NULL,
+    depends_on TEXT NOT NULL,
+    PRIMARY KEY (task_id, depends_on)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_task_dependencies_depends_on ON task_dependencies(depends_on);
+"""
+
+# Priority is stored as its sort rank so ORDER BY priority puts HIGH first
+RANK_PRIORITY = {rank: priority for priority, rank in PRIORITY_RANK.items()}
+
+COLUMNS = (
+    "id, description, target_role, status, priority, assigned_agent_id, result, result_ref, error, "
+    "created_at, updated_at, started_at, completed_at, metadata, deadline, estimated_seconds, sla_met"
+)
+COLUMN_COUNT = len(COLUMNS.split(","))
+
+# Columns added after the first schema version: name -> type
+MIGRATIONS = {
+    "result_ref": "TEXT",
+    "deadline": "TEXT",
+    "estimated_seconds": "REAL",
+    "sla_met": "INTEGER",
+}
+
+# Dependencies fetched with each row, joined by a unit separator
+DEP_SEPARATOR = "\x1f"
+DEPENDENCIES = (
+    "(SELECT group_concat(depends_on, char(31)) FROM task_dependencies WHERE task_id = t.id)"
+)
+
+# A task is runnable when every dependency exists and is COMPLETED
+RUNNABLE = (
+    "t.status = 'PENDING' AND NOT EXISTS ("
+    "SELECT 1 FROM task_dependencies d LEFT JOIN tasks p ON p.id = d.depends_on "
+    "WHERE d.task_id = t.id AND (p.status IS NULL OR p.status != 'COMPLETED'))"
+)
+
+
+class SqliteTaskQueue(TaskQueue):
+    """
+    Durable task queue backed by a SQLite database in WAL mode.
+
+    Tasks survive process exit, so `maf task` can feed a long-running
+    scheduler (`maf scheduler`) and `maf queue` reports what it holds.
+    Several scheduler processes can share one database:
+
+    - claim() is a single UPDATE ... WHERE status = 'PENDING' RETURNING
+      statement, so exactly one process wins each task.
+    - A claim takes a lease (lease_owner, lease_expires) that the owning
+      scheduler renews while the task runs. If the process dies, the lease
+      expires and recover_expired_leases() puts the task back to PENDING
+      (or FAILED after max_attempts claims).
+    - changed_externally() reads PRAGMA data_version, so schedulers notice
+      tasks submitted by other processes without rescanning the queue.
+
+    Requires SQLite 3.35+ (RETURNING).
+    """
+
+    watch_interval = 0.5
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_size: Optional[int] = None,
+        max_attempts: int = 3,
+        timeout: float = 30.0,
+        aging_seconds: Optional[float] = None,
+        fair_share: Optional[FairShare] = None,
+        edf: bool = False,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            db_path: Database file. Defaults to ~/.multi-agent-flow/tasks.db
+            max_size: Maximum number of tasks held (None: unbounded)
+            max_attempts: Claims allowed before an abandoned task is FAILED
+            timeout: Seconds to wait on a locked database before failing
+            aging_seconds: Wait after which a task outranks fresh tasks one
+                           priority level above it (None: strict priority)
+            fair_share: Weighted fair share across roles and submitters,
+                        applied to this process's dispatches
+            edf: Dispatch tasks with deadlines earliest deadline first,
+                 falling back to priority order for tasks without one
+        """
+        if aging_seconds is not None and aging_seconds <= 0:
+            raise ValueError("aging_seconds must be positive")
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(f"SqliteTaskQueue requires SQLite 3.35+, found {sqlite3.sqlite_version}")
+
+        self.db_path = Path(db_path) if db_path else Path.home() / ".multi-agent-flow" / "tasks.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.aging_seconds = aging_seconds
+        self.fair_share = fair_share
+        self.edf = edf
+        self._local = threading.local()
+
+        self._get_connection().executescript(SCHEMA)
+        self._migrate()
+        logger.info(f"SqliteTaskQueue initialized: {self.db_path}")
+
+    def _migrate(self) -> None:
+        """Add columns missing from databases created by older versions"""
+        conn = self._get_connection()
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+        for column, column_type in MIGRATIONS.items():
+            if column in existing:
+                continue
+            try:
+                conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} {column_type}")
+                logger.info(f"Migrated {self.db_path}: added tasks.{column}")
+            except sqlite3.OperationalError as e:
+                # Another process migrated first
+                if "duplicate column" not in str(e):
+                    raise
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get (or open) the connection for the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=self.timeout,
+                isolation_level=None,  # autocommit; transactions are explicit
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the connection owned by the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _to_task(self, row: tuple, dependencies: Optional[List[str]] = None) -> Task:
+        (task_id, description, target_role, status, priority, assigned_agent_id, result,
+         result_ref, error, created_at, updated_at, started_at, completed_at,
+         metadata, deadline, estimated_seconds, sla_met) = row[:COLUMN_COUNT]
+        if len(row) > COLUMN_COUNT:
+            dependencies = row[COLUMN_COUNT].split(DEP_SEPARATOR) if row[COLUMN_COUNT] else []
+        if dependencies is None:
+            dependencies = [
+                dep for (dep,) in self._get_connection().execute(
+                    "SELECT depends_on FROM task_dependencies WHERE task_id = ?", (task_id,)
+                )
+            ]
+        return Task(
+            id=task_id,
+            description=description,
+            target_role=target_role,
+            status=TaskStatus(status),
+            priority=RANK_PRIORITY[priority],
+            dependencies=dependencies,
+            assigned_agent_id=assigned_agent_id,
+            result=json.loads(result) if result is not None else None,
+            result_ref=result_ref,
+            error=error,
+            created_at=created_at,
+            updated_at=updated_at,
+            started_at=started_at,
+            completed_at=completed_at,
+            metadata=json.loads(metadata),
+            deadline=deadline,
+            estimated_seconds=estimated_seconds,
+            sla_met=bool(sla_met) if sla_met is not None else None,
+        )
+
+    def _select(self, where: str, params: tuple = (), suffix: str = "") -> List[Task]:
+        rows = self._get_connection().execute(
+            f"SELECT {COLUMNS}, {DEPENDENCIES} FROM tasks t WHERE {where} {suffix}", params
+        ).fetchall()
+        return [self._to_task(row) for row in rows]
+
+    # TaskQueue API
+
+    def submit(self, task: Task) -> None:
+        """Add a task to the queue."""
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.max_size is not None:
+                (count,) = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+                if count >= self.max_size:
+                    raise RuntimeError(f"Task queue is full (max={self.max_size})")
+            conn.execute(
+                f"INSERT OR REPLACE INTO tasks ({COLUMNS}) VALUES ({', '.join('?' * COLUMN_COUNT)})",
+                (task.id, task.description, task.target_role, task.status.value,
+                 PRIORITY_RANK[task.priority], task.assigned_agent_id,
+                 json.dumps(task.result) if task.result is not None else None, task.result_ref,
+                 task.error,
+                 task.created_at, task.updated_at, task.started_at, task.completed_at,
+                 json.dumps(task.metadata), task.deadline, task.estimated_seconds, task.sla_met),
+            )
+            conn.execute("DELETE FROM task_dependencies WHERE task_id = ?", (task.id,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO task_dependencies (task_id, depends_on) VALUES (?, ?)",
+                [(task.id, dep) for dep in task.dependencies],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Task submitted: {task.id} ({task.description[:50]}...)")
+
+    def get_pending_tasks(self) -> List[Task]:
+        """Get all pending tasks, sorted by priority."""
+        return self._select("t.status = 'PENDING'", suffix=f"ORDER BY {self._order_by()}")
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Get a task by ID."""
+        tasks = self._select("t.id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def update_task(self, task: Task) -> None:
+        """Update a task in the queue (leaving RUNNING releases its lease)."""
+        running = task.status == TaskStatus.RUNNING
+        self._get_connection().execute(
+            "UPDATE tasks SET description = ?, target_role = ?, status = ?, priority = ?, "
+            "assigned_agent_id = ?, result = ?, result_ref = ?, error = ?, updated_at = ?, started_at = ?, "
+            "completed_at = ?, metadata = ?, deadline = ?, estimated_seconds = ?, sla_met = ?, "
+            "lease_owner = CASE WHEN ? THEN lease_owner END, "
+            "lease_expires = CASE WHEN ? THEN lease_expires END "
+            "WHERE id = ?",
+            (task.description, task.target_role, task.status.value, PRIORITY_RANK[task.priority],
+             task.assigned_agent_id, json.dumps(task.result) if task.result is not None else None,
+             task.result_ref, task.error, task.updated_at, task.started_at, task.completed_at,
+             json.dumps(task.metadata), task.deadline, task.estimated_seconds, task.sla_met,
+             running, running, task.id),
+        )
+        logger.debug(f"Task updated: {task.id} -> {task.status}")
+
+    def get_runnable_tasks(self) -> List[Task]:
+        """
+        Get tasks that are ready to run.
+        A task is runnable if:
+        1. Status is PENDING
+        2. All dependencies are COMPLETED
+        """
+        return self._select(RUNNABLE, suffix=f"ORDER BY {self._order_by()}")
+
+    def _order_terms(self, alias: str) -> List[str]:
+        """SQL terms of fairness.order_key for the row alias"""
+        if self.aging_seconds is None:
+            terms = [f"{alias}.priority", f"{alias}.created_at"]
+        else:
+            # Same ordering as created timestamp + rank * aging_seconds
+            terms = [
+                f"julianday({alias}.created_at) * 86400.0 + {alias}.priority * {float(self.aging_seconds)!r}",
+                f"{alias}.created_at",
+            ]
+        if self.edf:
+            terms = [f"{alias}.deadline IS NULL", f"COALESCE(julianday({alias}.deadline), 0)", *terms]
+        return terms
+
+    def _order_by(self) -> str:
+        """SQL ORDER BY matching fairness.order_key"""
+        return ", ".join(self._order_terms("t"))
+
+    def pending_ahead(self, task: Task) -> Tuple[float, int]:
+        """Work queued ahead of a task, summed in SQL over its role's pending rows."""
+        seconds, unestimated = self._get_connection().execute(
+            "SELECT COALESCE(SUM(t.estimated_seconds), 0), COUNT(*) - COUNT(t.estimated_seconds) "
+            "FROM tasks t, (SELECT ? AS priority, ? AS created_at, ? AS deadline) p "
+            "WHERE t.status = 'PENDING' AND t.target_role = ? "
+            f"AND ({', '.join(self._order_terms('t'))}) <= ({', '.join(self._order_terms('p'))})",
+            (PRIORITY_RANK[task.priority], task.created_at, task.deadline, task.target_role),
+        ).fetchone()
+        return float(seconds), unestimated
+
+    def peek_runnable(self, exclude_roles: Iterable[str] = ()) -> Optional[Task]:
+        """
+        Get the highest-priority runnable task whose role is not excluded.
+
+        With a FairShare, the best runnable task of every (role, submitter)
+        is fetched and the one furthest behind its share is returned.
+        """
+        excluded = list(exclude_roles)
+        where = RUNNABLE
+        if excluded:
+            where += f" AND t.target_role NOT IN ({', '.join('?' * len(excluded))})"
+        if self.fair_share is None:
+            tasks = self._select(where, tuple(excluded), f"ORDER BY {self._order_by()} LIMIT 1")
+            return tasks[0] if tasks else None
+
+        rows = self._get_connection().execute(
+            f"SELECT {COLUMNS}, {DEPENDENCIES} FROM ("
+            f"SELECT t.*, ROW_NUMBER() OVER ("
+            f"PARTITION BY t.target_role, json_extract(t.metadata, '$.{SUBMITTER_KEY}') "
+            f"ORDER BY {self._order_by()}) AS share_rank "
+            f"FROM tasks t WHERE {where}) t WHERE share_rank = 1",
+            tuple(excluded),
+        ).fetchall()
+        if not rows:
+            return None
+        heads = {}
+        for row in rows:
+            task = self._to_task(row)
+            heads[(task.target_role, submitter_of(task))] = task
+        role, submitter = self.fair_share.pick({key: self.order_key(task) for key, task in heads.items()})
+        return heads[(role, submitter)]
+
+    def get_dependents(self, task_id: str) -> List[Task]:
+        """Get pending tasks that depend on a task."""
+        return self._select(
+            "t.status = 'PENDING' AND t.id IN "
+            "(SELECT task_id FROM task_dependencies WHERE depends_on = ?)",
+            (task_id,),
+        )
+
+    def claim(self, task_id: str, owner: str, lease_seconds: Optional[float] = None) -> Optional[Task]:
+        """
+        Atomically move a PENDING task to RUNNING under a lease.
+
+        Returns:
+            The claimed task, or None if another scheduler got it first
+        """
+        now = datetime.utcnow().isoformat()
+        lease_expires = time.time() + lease_seconds if lease_seconds else None
+        row = self._get_connection().execute(
+            "UPDATE tasks SET status = 'RUNNING', started_at = ?, updated_at = ?, "
+            "lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+            f"WHERE id = ? AND status = 'PENDING' RETURNING {COLUMNS}",
+            (now, now, owner, lease_expires, task_id),
+        ).fetchone()
+        if not row:
+            return None
+        task = self._to_task(row)
+        if self.fair_share:
+            self.fair_share.charge(task.target_role, submitter_of(task))
+        return task
+
+    def renew_leases(self, owner: str, lease_seconds: float) -> int:
+        """Extend the leases of tasks claimed by owner. Returns count renewed."""
+        return self._get_connection().execute(
+            "UPDATE tasks SET lease_expires = ? WHERE status = 'RUNNING' AND lease_owner = ?",
+            (time.time() + lease_seconds, owner),
+        ).rowcount
+
+    def recover_expired_leases(self) -> List[str]:
+        """
+        Return RUNNING tasks whose lease expired (owner crashed) to PENDING.
+
+        Tasks already claimed max_attempts times are marked FAILED instead.
+        """
+        now_iso = datetime.utcnow().isoformat()
+        rows = self._get_connection().execute(
+            "UPDATE tasks SET "
+            "status = CASE WHEN attempts >= ? THEN 'FAILED' ELSE 'PENDING' END, "
+            "error = CASE WHEN attempts >= ? THEN 'Lease expired after ' || attempts || ' attempts' "
+            "ELSE error END, "
+            "completed_at = CASE WHEN attempts >= ? THEN ? ELSE completed_at END, "
+            "assigned_agent_id = NULL, started_at = NULL, updated_at = ?, "
+            "lease_owner = NULL, lease_expires = NULL "
+            "WHERE status = 'RUNNING' AND lease_expires IS NOT NULL AND lease_expires < ? "
+            "RETURNING id, status",
+            (self.max_attempts, self.max_attempts, self.max_attempts, now_iso, now_iso, time.time()),
+        ).fetchall()
+        for task_id, status in rows:
+            logger.warning(f"Lease expired for task {task_id} -> {status}")
+        return [task_id for task_id, _ in rows]
+
+    def changed_externally(self) -> bool:
+        """
+        Whether another connection committed since the last check.
+
+        data_version is per connection, so the baseline is kept per thread;
+        the first check in a thread reports a change, since nothing is
+        known about what happened before it.
+        """
+        (version,) = self._get_connection().execute("PRAGMA data_version").fetchone()
+        changed = version != getattr(self._local, "data_version", None)
+        self._local.data_version = version
+        return changed
+
+    def get_all_tasks(self) -> List[Task]:
+        """Get all tasks in the queue."""
+        return self._select("1", suffix="ORDER BY t.created_at")
+
+    def get_tasks_by_status(self, status: TaskStatus) -> List[Task]:
+        """Get all tasks with a specific status."""
+        return self._select("t.status = ?", (status.value,))
+
+    def remove_task(self, task_id: str) -> bool:
+        """Remove a task from the queue."""
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount
+            conn.execute("DELETE FROM task_dependencies WHERE task_id = ?", (task_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if removed:
+            logger.info(f"Task removed: {task_id}")
+        return removed > 0
+
+    def clear_completed(self) -> int:
+        """Remove all completed tasks. Returns count of removed tasks."""
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM task_dependencies WHERE task_id IN "
+                "(SELECT id FROM tasks WHERE status IN ('COMPLETED', 'CANCELLED'))"
+            )
+            removed = conn.execute(
+                "DELETE FROM tasks WHERE status IN ('COMPLETED', 'CANCELLED')"
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Cleared {removed} completed tasks")
+        return removed
+
+    def prune_finished(
+        self,
+        max_age_seconds: Optional[float] = None,
+        max_finished: Optional[int] = None,
+    ) -> Dict[str, Optional[str]]:
+        """Remove finished tasks beyond a retention limit (see TaskQueue.prune_finished)."""
+        conditions, params = [], []
+        if max_finished is not None:
+            conditions.append("f.recency > ?")
+            params.append(max_finished)
+        cutoff = finished_cutoff(max_age_seconds)
+        if cutoff is not None:
+            conditions.append("f.finished_at < ?")
+            params.append(cutoff)
+        if not conditions:
+            return {}
+
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT f.id, f.result_ref FROM ("
+                "SELECT id, result_ref, COALESCE(completed_at, updated_at) AS finished_at, "
+                "ROW_NUMBER() OVER (ORDER BY COALESCE(completed_at, updated_at) DESC) AS recency "
+                "FROM tasks WHERE status IN ('COMPLETED', 'FAILED', 'CANCELLED')) f "
+                f"WHERE ({' OR '.join(conditions)}) AND NOT EXISTS ("
+                "SELECT 1 FROM task_dependencies d JOIN tasks w ON w.id = d.task_id "
+                "WHERE d.depends_on = f.id AND w.status IN ('PENDING', 'RUNNING'))",
+                params,
+            ).fetchall()
+            ids = [(task_id,) for task_id, _ in rows]
+            conn.executemany("DELETE FROM task_dependencies WHERE task_id = ?", ids)
+            conn.executemany("DELETE FROM tasks WHERE id = ?", ids)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if rows:
+            logger.info(f"Pruned {len(rows)} finished tasks")
+        return dict(rows)
+
+    def stats(self) -> Dict[str, int]:
+        """Get queue statistics."""
+        counts = dict(self._get_connection().execute(
+            "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+        ).fetchall())
+        return {
+            "total": sum(counts.values()),
+            "pending": counts.get("PENDING", 0),
+            "running": counts.get("RUNNING", 0),
+            "completed": counts.get("COMPLETED", 0),
+            "failed": counts.get("FAILED", 0),
+        }
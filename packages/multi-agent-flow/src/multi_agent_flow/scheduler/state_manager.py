@@ -3,11 +3,14 @@ Agent State Manager - Persists agent states to JSON file
 """
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Callable, List
 from datetime import datetime
-from threading import RLock
+from threading import RLock, Lock, Event, Thread
 
+from ..shared.lifecycle import close_at_exit
 from .task import AgentState, AgentStatus
 
 logger = logging.getLogger(__name__)
@@ -17,19 +20,90 @@ class AgentStateManager:
     """
     Manages agent states with file-based persistence.
     Thread-safe with in-process locking.
+
+    Persistence modes:
+    - write-through (flush_interval=None): every change rewrites the file
+      before the call returns.
+    - write-behind (flush_interval=seconds): changes only mark the state
+      dirty; a background thread writes the latest snapshot at most once
+      per interval, so bursts of changes cost a single write. flush()
+      writes immediately and close() (also run at exit) flushes pending
+      changes.
+
+    Crash consistency: the file is written to a temporary file in the same
+    directory, fsync'd and renamed over the old one, so readers and a
+    restarted process always see a complete snapshot, never a torn file.
+    In write-behind mode a crash loses at most the changes made during the
+    last flush_interval; a clean shutdown (close() or interpreter exit)
+    loses nothing.
+
+    With read_only, the file is loaded once and never written: a view of
+    the agents of a scheduler running in another process.
     """
 
-    def __init__(self, state_file: Optional[Path] = None):
+    def __init__(
+        self,
+        state_file: Optional[Path] = None,
+        flush_interval: Optional[float] = None,
+        compact: bool = False,
+        read_only: bool = False,
+    ):
+        """
+        Initialize the state manager.
+
+        Args:
+            state_file: JSON state file. Defaults to ~/.multi-agent-flow/agent_status.json
+            flush_interval: Seconds between write-behind flushes (None: write-through)
+            compact: Write compact JSON instead of indented JSON
+            read_only: Load the file and keep every change in memory only
+        """
         if state_file is None:
             state_file = Path.home() / ".multi-agent-flow" / "agent_status.json"
 
         self.state_file = Path(state_file)
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.compact = compact
+        self.read_only = read_only
 
         self._lock = RLock()  # Reentrant lock to allow nested locking
         self._states: Dict[str, AgentState] = {}
+        self._listeners: List[Callable[[AgentState], None]] = []
+
+        # Write-behind state
+        self._write_lock = Lock()  # Serializes file writes (never held while taking _lock)
+        self._dirty = False
+        self._version = 0  # Bumped on every change
+        self._written_version = 0
+        self._flush_event = Event()
+        self._flush_thread: Optional[Thread] = None
+        self._running = False
+        self.writes = 0
+        if read_only:
+            self.load()
+        elif flush_interval is not None:
+            close_at_exit(self)
+
+        if read_only:
+            mode = "read-only"
+        else:
+            mode = "write-through" if flush_interval is None else f"write-behind {flush_interval}s"
+        logger.info(f"AgentStateManager initialized: {self.state_file} ({mode})")
+
+    def add_listener(self, callback: Callable[[AgentState], None]) -> None:
+        """
+        Register a callback invoked after every agent state change.
 
-        logger.info(f"AgentStateManager initialized: {self.state_file}")
+        Callbacks run on the thread that made the change and must not block.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, state: AgentState) -> None:
+        for callback in self._listeners:
+            try:
+                callback(state)
+            except Exception as e:
+                logger.warning(f"Agent state listener error: {e}")
 
     def load(self) -> Dict[str, AgentState]:
         """Load agent states from file."""
@@ -57,11 +131,32 @@ class AgentStateManager:
                 return {}
 
     def save(self, states: Optional[Dict[str, AgentState]] = None) -> None:
-        """Save agent states to file."""
-        if states is not None:
-            self._states = states
+        """Save agent states to file immediately."""
+        with self._lock:
+            if states is not None:
+                self._states = states
+            self._dirty = True
+            self._version += 1
+        self.flush()
+
+    def _changed(self) -> None:
+        """Persist a state change according to the persistence mode."""
+        if self.read_only:
+            return
+        if self.flush_interval is None:
+            self.save()
+            return
+        with self._lock:
+            self._dirty = True
+            self._version += 1
+        self._ensure_flusher()
 
+    def flush(self) -> None:
+        """Write pending changes to the state file (no-op when clean)."""
         with self._lock:
+            if not self._dirty or self.read_only:
+                return
+            version = self._version
             data = {
                 "last_updated": datetime.utcnow().isoformat(),
                 "agents": {
@@ -69,11 +164,79 @@ class AgentStateManager:
                     for agent_id, state in self._states.items()
                 }
             }
+            self._dirty = False
 
-            with open(self.state_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
-            logger.debug(f"Saved {len(self._states)} agent states")
+        with self._write_lock:
+            # A newer snapshot was written while this one waited
+            if version <= self._written_version:
+                return
+            error = None
+            try:
+                self._write_atomic(data)
+                self._written_version = version
+                self.writes += 1
+            except OSError as e:
+                error = e
+
+        if error is not None:
+            with self._lock:
+                self._dirty = True
+            raise error
+        logger.debug(f"Saved {len(data['agents'])} agent states")
+
+    def _write_atomic(self, data: Dict) -> None:
+        """Write to a temporary file and rename it over the state file."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.state_file.parent, prefix=f".{self.state_file.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                if self.compact:
+                    json.dump(data, f, separators=(",", ":"))
+                else:
+                    json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _ensure_flusher(self) -> None:
+        """Start the write-behind thread on first use."""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+        with self._lock:
+            if self._flush_thread and self._flush_thread.is_alive():
+                return
+            self._running = True
+
+            def flush_loop():
+                while self._running:
+                    self._flush_event.wait(self.flush_interval)
+                    self._flush_event.clear()
+                    try:
+                        self.flush()
+                    except Exception as e:
+                        logger.warning(f"Agent state flush error: {e}")
+
+            self._flush_thread = Thread(target=flush_loop, daemon=True)
+            self._flush_thread.start()
+
+    def close(self) -> None:
+        """Stop the write-behind thread and flush pending changes."""
+        self._running = False
+        self._flush_event.set()
+        if self._flush_thread:
+            self._flush_thread.join(timeout=5.0)
+            self._flush_thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Agent state flush error: {e}")
 
     def get_state(self, agent_id: str) -> Optional[AgentState]:
         """Get state for a specific agent."""
@@ -96,55 +259,134 @@ class AgentStateManager:
                     setattr(state, key, value)
 
             state.last_seen = datetime.utcnow().isoformat()
-            self.save()
+            self._changed()
+            self._notify(state)
             return state
 
     def set_agent_working(self, agent_id: str, task_id: str) -> Optional[AgentState]:
-        """Mark an agent as working on a task."""
-        return self.update_state(
-            agent_id,
-            status=AgentStatus.WORKING,
-            current_task_id=task_id
-        )
+        """Mark an agent as working on a task (occupies one slot)."""
+        with self._lock:
+            state = self._states.get(agent_id)
+            if not state:
+                return None
+            running = state.running_task_ids + [task_id]
+            return self.update_state(
+                agent_id,
+                status=self._slot_status(state, running),
+                current_task_id=task_id,
+                running_task_ids=running,
+            )
 
-    def set_agent_idle(self, agent_id: str, task_completed: bool = True) -> Optional[AgentState]:
-        """Mark an agent as idle (finished task)."""
-        state = self._states.get(agent_id)
-        if state:
+    def _release_slot(self, state: AgentState, task_id: Optional[str]) -> List[str]:
+        """Running tasks left after task_id finishes (None releases every slot)."""
+        if task_id is None:
+            return []
+        return [t for t in state.running_task_ids if t != task_id]
+
+    @staticmethod
+    def _slot_status(state: AgentState, running: List[str]) -> AgentStatus:
+        """Status for an agent running these tasks (ERROR stays until cleared)."""
+        if state.status == AgentStatus.ERROR:
+            return AgentStatus.ERROR
+        return AgentStatus.WORKING if running else AgentStatus.IDLE
+
+    def set_agent_idle(
+        self,
+        agent_id: str,
+        task_completed: bool = True,
+        task_id: Optional[str] = None,
+        duration: Optional[float] = None,
+    ) -> Optional[AgentState]:
+        """
+        Release an agent's slot (finished task).
+
+        The agent becomes IDLE once no task is running on it. An agent in
+        ERROR stays there until clear_agent_error().
+
+        Args:
+            agent_id: Agent to update
+            task_completed: Count the task as completed
+            task_id: Finished task (None releases every slot)
+            duration: Task duration in seconds, for duration-weighted selection
+        """
+        with self._lock:
+            state = self._states.get(agent_id)
+            if not state:
+                return None
             if task_completed:
                 state.tasks_completed += 1
+                if duration is not None:
+                    state.total_task_seconds += duration
+            running = self._release_slot(state, task_id)
             return self.update_state(
                 agent_id,
-                status=AgentStatus.IDLE,
-                current_task_id=None
+                status=self._slot_status(state, running),
+                current_task_id=running[-1] if running else None,
+                running_task_ids=running,
             )
-        return None
 
-    def set_agent_error(self, agent_id: str, error_message: str) -> Optional[AgentState]:
-        """Mark an agent as having an error."""
-        state = self._states.get(agent_id)
-        if state:
+    def set_task_failed(self, agent_id: str, task_id: str, error_message: str) -> Optional[AgentState]:
+        """
+        Release the slot of a task that failed on an agent.
+
+        A failed task says nothing about the agent's other slots, so the
+        agent stays dispatchable; the failure is counted and its error
+        recorded. Use set_agent_error() to take the agent out of rotation.
+
+        Args:
+            agent_id: Agent the task ran on
+            task_id: Failed task
+            error_message: Why the task failed
+        """
+        with self._lock:
+            state = self._states.get(agent_id)
+            if not state:
+                return None
             state.tasks_failed += 1
+            running = self._release_slot(state, task_id)
             return self.update_state(
                 agent_id,
-                status=AgentStatus.ERROR,
-                error_message=error_message
+                status=self._slot_status(state, running),
+                error_message=error_message,
+                current_task_id=running[-1] if running else None,
+                running_task_ids=running,
+            )
+
+    def set_agent_error(self, agent_id: str, error_message: str) -> Optional[AgentState]:
+        """
+        Mark an agent as broken, so no new task is dispatched to it.
+
+        Tasks already running keep their slots until they finish. The agent
+        stays in ERROR until clear_agent_error().
+        """
+        return self.update_state(agent_id, status=AgentStatus.ERROR, error_message=error_message)
+
+    def clear_agent_error(self, agent_id: str) -> Optional[AgentState]:
+        """Return an agent in ERROR to IDLE/WORKING and forget its error."""
+        with self._lock:
+            state = self._states.get(agent_id)
+            if not state:
+                return None
+            return self.update_state(
+                agent_id,
+                status=AgentStatus.WORKING if state.running_task_ids else AgentStatus.IDLE,
+                error_message=None,
             )
-        return None
 
     def register_agent(self, agent_state: AgentState) -> None:
         """Register a new agent or update existing."""
         with self._lock:
             self._states[agent_state.id] = agent_state
-            self.save()
+            self._changed()
+            self._notify(agent_state)
             logger.info(f"Registered agent: {agent_state.id}")
 
     def get_available_agents(self, role: Optional[str] = None) -> list[AgentState]:
-        """Get all available (IDLE) agents, optionally filtered by role."""
+        """Get all agents with a free slot, optionally filtered by role."""
         with self._lock:
             available = []
             for state in self._states.values():
-                if state.status != AgentStatus.IDLE:
+                if not state.is_available():
                     continue
                 if role and not state.can_handle_role(role):
                     continue
@@ -173,6 +415,8 @@ class AgentStateManager:
             }.get(state.status, "●")
 
             task_info = f"Task: {state.current_task_id}" if state.current_task_id else ""
+            if state.capacity > 1:
+                task_info = f"Slots: {len(state.running_task_ids)}/{state.capacity}  {task_info}"
             lines.append(
                 f"  {status_icon} {state.name:15} {state.model:10} "
                 f"Port: {state.port}  {state.status.value:8} {task_info}"
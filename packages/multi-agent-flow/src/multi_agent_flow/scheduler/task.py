@@ -44,12 +44,16 @@ class Task:
     dependencies: List[str] = field(default_factory=list)
     assigned_agent_id: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
+    result_ref: Optional[str] = None  # Set when the result was offloaded to a ResultStore
     error: Optional[str] = None
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    deadline: Optional[str] = None  # Wall-clock (UTC ISO) time the task must finish by
+    estimated_seconds: Optional[float] = None  # Expected run time, for admission checks
+    sla_met: Optional[bool] = None  # Whether a task with a deadline finished in time
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -73,11 +77,14 @@ class AgentState:
     roles: List[str]
     model: str
     status: AgentStatus = AgentStatus.UNKNOWN
-    current_task_id: Optional[str] = None
+    current_task_id: Optional[str] = None  # Most recently assigned running task
     tasks_completed: int = 0
     tasks_failed: int = 0
     last_seen: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None  # Most recent task failure or agent error
+    capacity: int = 1  # Tasks the agent can run concurrently
+    running_task_ids: List[str] = field(default_factory=list)
+    total_task_seconds: float = 0.0  # Summed duration of completed tasks
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -93,8 +100,22 @@ class AgentState:
         return cls(**data)
 
     def is_available(self) -> bool:
-        """Check if agent is available for new tasks."""
-        return self.status == AgentStatus.IDLE
+        """Check if agent is available for new tasks (has a free slot)."""
+        return self.status in (AgentStatus.IDLE, AgentStatus.WORKING) and self.free_slots() > 0
+
+    def free_slots(self) -> int:
+        """Number of additional tasks the agent can take."""
+        return max(self.capacity - len(self.running_task_ids), 0)
+
+    def load(self) -> float:
+        """Fraction of slots in use."""
+        return len(self.running_task_ids) / self.capacity if self.capacity else 1.0
+
+    def avg_task_seconds(self) -> Optional[float]:
+        """Average duration of completed tasks, if any were timed."""
+        if not self.tasks_completed or not self.total_task_seconds:
+            return None
+        return self.total_task_seconds / self.tasks_completed
 
     def can_handle_role(self, role: str) -> bool:
         """Check if agent can handle a specific role."""
@@ -0,0 +1,40 @@
+"""
+Interpreter-exit cleanup for objects with background writers
+"""
+import atexit
+import logging
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Objects to close at exit; held weakly so registering never keeps one alive
+_open: "weakref.WeakSet" = weakref.WeakSet()
+_lock = threading.Lock()
+_registered = False
+
+
+def close_at_exit(obj) -> None:
+    """
+    Call obj.close() when the interpreter exits, unless obj is gone by then.
+
+    One atexit hook serves every object, so creating many instances does
+    not grow the atexit list or pin them in memory.
+    """
+    global _registered
+    with _lock:
+        _open.add(obj)
+        if not _registered:
+            atexit.register(_close_all)
+            _registered = True
+
+
+def _close_all() -> None:
+    with _lock:
+        objects = list(_open)
+        _open.clear()
+    for obj in objects:
+        try:
+            obj.close()
+        except Exception as e:
+            logger.warning(f"Close at exit failed for {type(obj).__name__}: {e}")
@@ -12,7 +12,7 @@ import time
 from pathlib import Path
 from datetime import datetime
 from threading import Thread, Event
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple, List, Iterable
 
 from .models import (
     AgentName,
@@ -24,10 +24,26 @@ from .models import (
     AgentOutput,
 )
 from .ipc import FileIPCManager
+from ..cache import CacheManager, generate_step_key, generate_step_fingerprint, task_tag, step_tag
 
 logger = logging.getLogger(__name__)
 
 
+# Steps memoized by default. Their fingerprint covers agent, prompt and
+# upstream output only, never workspace state, so steps that act on the
+# workspace (the tester runs the tests) must execute every time.
+CACHEABLE_STEPS = frozenset({AgentName.PLANNER, AgentName.WRITER})
+
+# Steps that are never served from cache, whatever cacheable_steps says
+UNCACHEABLE_STEPS = frozenset({AgentName.TESTER})
+
+# Seconds past expiry a cached step result may still be served while it is
+# refreshed in the background (async execution only). Only steps in
+# cacheable_steps are looked up, so only their windows apply.
+STALE_WINDOWS = {
+    AgentName.PLANNER.value: 3600,
+}
+
 # Agent CLI command mapping
 AGENT_COMMANDS = {
     AgentName.PLANNER: "gemini",  # Using gemini for planning
@@ -49,6 +65,7 @@ class WorkflowEngine:
     - Dead Letter Queue for permanently failed tasks
     - Real CLI agent integration (Phase 4)
     - Dashboard notification via WebSocket (Phase 4)
+    - Content-addressed step memoization shared across workflows
     """
 
     def __init__(
@@ -60,7 +77,19 @@ class WorkflowEngine:
         step_timeout: int = 300,  # 5 minutes per step
         use_real_agents: bool = True,  # Phase 4: Use real CLI agents
         notification_manager = None,   # Phase 4: Dashboard notifications
+        cache_manager: Optional[CacheManager] = None,
+        use_cache: bool = True,
+        cacheable_steps: Optional[Iterable[AgentName]] = None,
     ):
+        """
+        Initialize the engine.
+
+        Args:
+            cache_manager: Cache for memoized step results (created when use_cache)
+            use_cache: Memoize step results
+            cacheable_steps: Steps whose results are memoized
+                             (defaults to CACHEABLE_STEPS; the tester is never cached)
+        """
         self.ipc_manager = ipc_manager or FileIPCManager()
         self.state_dir = state_dir or Path.home() / ".multi-agent-flow" / "states"
         self.state_dir.mkdir(parents=True, exist_ok=True)
@@ -78,6 +107,27 @@ class WorkflowEngine:
         self._agent_runner = None
         self._notification_manager = notification_manager
 
+        # Step memoization (results keyed by agent + prompt + upstream output)
+        self._cache_manager = cache_manager
+        if use_cache and cache_manager is None:
+            self._cache_manager = CacheManager(stale_windows=STALE_WINDOWS)
+        if cacheable_steps is None:
+            cacheable_steps = CACHEABLE_STEPS
+        self.cacheable_steps = frozenset(AgentName(step) for step in cacheable_steps)
+        excluded = self.cacheable_steps & UNCACHEABLE_STEPS
+        if excluded:
+            raise ValueError(f"Steps cannot be memoized: {', '.join(sorted(step.value for step in excluded))}")
+        # task_id -> cache key -> (prefetched step result, fresh until)
+        # (see prefetch_step_cache)
+        self._prefetched: Dict[str, Dict[str, Tuple[Dict[str, Any], Optional[float]]]] = {}
+        # task_id -> CacheManager.invalidations when its entries were prefetched
+        self._prefetched_generation: Dict[str, int] = {}
+        # task_id -> cache warm-up started from a running event loop
+        self._warmups: Dict[str, asyncio.Task] = {}
+        # Event loop of the synchronous API, reused so that backend
+        # connections (e.g. the Redis pool) stay bound to one loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
         if use_real_agents:
             try:
                 from ..agents.runner import AgentRunner
@@ -142,13 +192,22 @@ class WorkflowEngine:
         self._workflows[state.task_id] = state
         logger.debug(f"Saved state for {state.task_id}: {state.status.value}")
 
-    def start_workflow(self, task_id: str, task_description: str) -> WorkflowState:
+    def start_workflow(
+        self,
+        task_id: str,
+        task_description: str,
+        use_cache: bool = True,
+        warm_cache: bool = True,
+    ) -> WorkflowState:
         """
         Start a new workflow for a task.
 
         Args:
             task_id: Unique task identifier
             task_description: Description of what to accomplish
+            use_cache: Reuse memoized step results (False forces every agent to run)
+            warm_cache: Resolve cached steps now and annotate predicted_cache_hits
+                        (see warm_step_cache)
 
         Returns:
             The initial WorkflowState
@@ -165,15 +224,80 @@ class WorkflowEngine:
             task_description=task_description,
             status=WorkflowStatus.QUEUED,
             current_step=AgentName.PLANNER,
+            use_cache=use_cache,
         )
 
         # Save task definition
         self.ipc_manager.save_task_definition(task_id, task_description)
         self.save_state(state)
 
+        if warm_cache and self._cache_enabled(state):
+            self._start_warm_up(state)
+
         logger.info(f"Started workflow {task_id}")
         return state
 
+    def _start_warm_up(self, state: WorkflowState):
+        """Warm the cache now, or in the background when called from a running event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._run_sync(self.warm_step_cache(state))
+            return
+        self._warmups[state.task_id] = loop.create_task(self.warm_step_cache(state))
+
+    def _run_sync(self, coro):
+        """Run a coroutine for the synchronous API on the engine's event loop"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        """Close the event loop used by the synchronous API"""
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
+    async def warm_step_cache(self, state: WorkflowState) -> List[str]:
+        """
+        Resolve which steps of a queued workflow are already cached.
+
+        The chain is walked from the current step: each step's fingerprint
+        is looked up and its cached output feeds the next step's
+        fingerprint, up to the first miss. Hits are loaded into the cache
+        manager's memory tier (when it has one) and kept for execution, and
+        the state is annotated with predicted_cache_hits. Lookups are not
+        counted as hits until a step is actually served from them.
+
+        Returns:
+            Names of the steps predicted to be served from cache
+        """
+        chain = AgentName.get_chain_order()
+        if state.current_step is None or state.current_step not in chain:
+            return []
+        remaining = chain[chain.index(state.current_step):]
+
+        generation = self._cache_manager.invalidations
+        hits: Dict[str, Tuple[Dict[str, Any], Optional[float]]] = {}
+        previous_output = state.get_last_output()
+        for step in self._cacheable_prefix(remaining):
+            _, cache_key = self._step_fingerprint(state, step, previous_output)
+            found = (await self._cache_manager.peek_entries([cache_key])).get(cache_key)
+            if not found or found[0].get("status") != StepStatus.SUCCESS.value:
+                break
+            hits[cache_key] = found
+            previous_output = found[0]["output_data"]
+
+        self._keep_prefetched(state.task_id, hits, generation)
+        state.predicted_cache_hits = [step.value for step in remaining[:len(hits)]]
+        self.save_state(state)
+        if hits:
+            logger.info(
+                f"[{state.task_id}] Warmed {len(hits)} cached step(s): "
+                f"{', '.join(state.predicted_cache_hits)}"
+            )
+        return state.predicted_cache_hits
+
     def execute_workflow(self, task_id: str) -> WorkflowState:
         """
         Execute a complete workflow synchronously.
@@ -197,6 +321,10 @@ class WorkflowEngine:
         state.status = WorkflowStatus.DISPATCHING
         self.save_state(state)
 
+        # Cache lookups run on the engine's loop, not a new loop per call
+        if self._cache_enabled(state):
+            self._run_sync(self.prefetch_step_cache(state))
+
         # Execute each step in sequence
         chain = AgentName.get_chain_order()
 
@@ -211,8 +339,11 @@ class WorkflowEngine:
 
             logger.info(f"[{task_id}] Executing step: {step.value}")
 
-            # Execute the step
-            result = self._execute_step(state, step)
+            # Execute the step (memoized steps consult the cache first)
+            if self._step_memoized(state, step):
+                result = self._run_sync(self._execute_step_cached(state, step, use_runner=False))
+            else:
+                result = self._execute_step(state, step)
             state.history.append(result)
 
             # Handle the result
@@ -223,6 +354,8 @@ class WorkflowEngine:
             if self._on_step_complete:
                 self._on_step_complete(task_id, result)
 
+        self._drop_prefetched(task_id)
+
         # Workflow complete callback
         if self._on_workflow_complete:
             self._on_workflow_complete(state)
@@ -239,6 +372,11 @@ class WorkflowEngine:
         Returns:
             Final WorkflowState
         """
+        # A warm-up still in flight would save the queued state over ours
+        warmup = self._warmups.pop(task_id, None)
+        if warmup is not None:
+            await warmup
+
         state = self.load_state(task_id)
         if not state:
             raise ValueError(f"Workflow {task_id} not found")
@@ -249,6 +387,9 @@ class WorkflowEngine:
         # Notify workflow start
         await self._notify("workflow_started", task_id, state.task_description)
 
+        if self._cache_enabled(state):
+            await self.prefetch_step_cache(state)
+
         # Execute each step in sequence
         while state.current_step and not state.status.is_terminal():
             if self._stop_event.is_set():
@@ -265,7 +406,10 @@ class WorkflowEngine:
             await self._notify("step_started", task_id, step.value)
 
             # Execute the step (async if using real agents)
-            if self.use_real_agents and self._agent_runner:
+            use_runner = bool(self.use_real_agents and self._agent_runner)
+            if self._step_memoized(state, step):
+                result = await self._execute_step_cached(state, step, use_runner, allow_stale=True)
+            elif use_runner:
                 result = await self._execute_step_async(state, step)
             else:
                 result = self._execute_step(state, step)
@@ -287,6 +431,8 @@ class WorkflowEngine:
             if self._on_step_complete:
                 self._on_step_complete(task_id, result)
 
+        self._drop_prefetched(task_id)
+
         # Notify workflow end
         await self._notify(
             "workflow_ended", task_id,
@@ -294,13 +440,307 @@ class WorkflowEngine:
             {"steps_completed": len([h for h in state.history if h.status == StepStatus.SUCCESS])}
         )
 
+        # Stale hits are refreshed in the background; finish those refreshes
+        # before the caller's event loop (e.g. asyncio.run) can shut down
+        if self._cache_manager is not None:
+            await self._cache_manager.wait_for_refreshes()
+
         # Workflow complete callback
         if self._on_workflow_complete:
             self._on_workflow_complete(state)
 
         return state
 
-    async def _execute_step_async(self, state: WorkflowState, step: AgentName) -> StepResult:
+    def _cache_enabled(self, state: WorkflowState) -> bool:
+        """Check whether step memoization applies to a workflow"""
+        return self._cache_manager is not None and state.use_cache
+
+    def _step_memoized(self, state: WorkflowState, step: AgentName) -> bool:
+        """Check whether a step's result is looked up in and stored to the cache"""
+        return self._cache_enabled(state) and step in self.cacheable_steps
+
+    def _cacheable_prefix(self, steps: List[AgentName]) -> List[AgentName]:
+        """
+        Leading steps that are memoized. A later step's fingerprint depends
+        on the output of every step before it, so it cannot be predicted
+        past the first step that always runs.
+        """
+        prefix = []
+        for step in steps:
+            if step not in self.cacheable_steps:
+                break
+            prefix.append(step)
+        return prefix
+
+    async def prefetch_step_cache(self, state: WorkflowState) -> Dict[str, bool]:
+        """
+        Load the cache status of every remaining step in one batch.
+
+        Entries indexed under the task are fetched in one batch; the chain
+        of fingerprints is then walked locally, feeding each cached output
+        into the next step's fingerprint. Entries loaded by warm_step_cache
+        are used as well. Hits are kept for _execute_step_cached so resumed
+        steps skip the per-step lookup; they are dropped once they expire or
+        anything is invalidated in the cache manager.
+
+        Returns:
+            Step name -> whether a cached result is available
+        """
+        chain = AgentName.get_chain_order()
+        if state.current_step is None or state.current_step not in chain:
+            return {}
+        remaining = chain[chain.index(state.current_step):]
+
+        generation = self._cache_manager.invalidations
+        entries = await self._cache_manager.peek_task_entries(state.task_id)
+        warmed = self._valid_prefetched(state.task_id)
+        status = {step.value: False for step in remaining}
+        hits: Dict[str, Tuple[Dict[str, Any], Optional[float]]] = {}
+
+        previous_output = state.get_last_output()
+        for step in self._cacheable_prefix(remaining):
+            _, cache_key = self._step_fingerprint(state, step, previous_output)
+            found = entries.get(cache_key) or warmed.get(cache_key)
+            if not found or found[0].get("status") != StepStatus.SUCCESS.value:
+                break
+            status[step.value] = True
+            hits[cache_key] = found
+            previous_output = found[0]["output_data"]
+
+        self._drop_prefetched(state.task_id)
+        self._keep_prefetched(state.task_id, hits, generation)
+        state.predicted_cache_hits = [step for step, hit in status.items() if hit]
+        if hits:
+            logger.info(f"[{state.task_id}] Prefetched {len(hits)} cached step(s)")
+        return status
+
+    def _keep_prefetched(
+        self,
+        task_id: str,
+        hits: Dict[str, Tuple[Dict[str, Any], Optional[float]]],
+        generation: int,
+    ):
+        """Keep entries looked up for a task, as of the cache manager's invalidation count"""
+        if self._prefetched_generation.get(task_id, generation) != generation:
+            self._prefetched.pop(task_id, None)
+        self._prefetched.setdefault(task_id, {}).update(hits)
+        self._prefetched_generation[task_id] = generation
+
+    def _valid_prefetched(self, task_id: str) -> Dict[str, Tuple[Dict[str, Any], Optional[float]]]:
+        """Prefetched entries of a task, dropped if anything was invalidated since"""
+        if self._prefetched_generation.get(task_id) != self._cache_manager.invalidations:
+            self._drop_prefetched(task_id)
+            return {}
+        return self._prefetched.get(task_id, {})
+
+    def _drop_prefetched(self, task_id: str):
+        self._prefetched.pop(task_id, None)
+        self._prefetched_generation.pop(task_id, None)
+
+    def _step_fingerprint(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        previous_output: Optional[Dict[str, Any]] = None,
+        skip_rule: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """
+        Fingerprint a step from its agent, prompt and upstream output.
+
+        The upstream output and the prompt built from it are canonicalized
+        first (task ID header, volatile fields, key order, whitespace; see
+        Canonicalizer) so that identical work in different workflows maps
+        to the same cache entry.
+
+        Args:
+            state: Workflow state
+            step: Step to fingerprint
+            previous_output: Upstream output (defaults to the state's last output)
+            skip_rule: Canonicalization rule to leave out
+
+        Returns:
+            Tuple of (fingerprint, cache_key)
+        """
+        if previous_output is None:
+            previous_output = state.get_last_output()
+        canonicalizer = self._cache_manager.canonicalizer
+        upstream = canonicalizer.canonicalize_data(previous_output, skip_rule)
+        prompt = self.ipc_manager.create_agent_prompt(
+            task_id=state.task_id,
+            step=step,
+            task_description=state.task_description,
+            previous_output=upstream,
+        )
+        prompt = canonicalizer.canonicalize_text(prompt, skip_rule)
+
+        fingerprint = generate_step_fingerprint(
+            AGENT_COMMANDS.get(step, ""), prompt, upstream
+        )
+        return fingerprint, generate_step_key(step.value, fingerprint)
+
+    def _fingerprint_variants(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        previous_output: Optional[Dict[str, Any]],
+    ) -> Dict[str, str]:
+        """Fingerprints of a step with each canonicalization rule left out in turn"""
+        return {
+            rule: self._step_fingerprint(state, step, previous_output, skip_rule=rule)[0]
+            for rule in self._cache_manager.canonicalizer.rule_names
+        }
+
+    def _record_recovered(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        previous_output: Optional[Dict[str, Any]],
+        cached: Dict[str, Any],
+    ):
+        """
+        Credit a cache hit to the canonicalization rules it depended on.
+
+        A rule recovered the hit if the entry's writer and this lookup
+        disagree on the fingerprint computed without that rule.
+        """
+        stored = cached.get("variants")
+        if not stored:
+            return
+        own = self._fingerprint_variants(state, step, previous_output)
+        recovered = [rule for rule, fp in own.items() if rule in stored and stored[rule] != fp]
+        if recovered:
+            self._cache_manager.record_recovered_hit(step.value, recovered)
+
+    async def _execute_step_cached(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        use_runner: bool,
+        allow_stale: bool = False,
+    ) -> StepResult:
+        """
+        Execute a step, short-circuiting the agent run on a cache hit.
+
+        Concurrent executions of the same fingerprint are coalesced, so only
+        one of them runs the agent. Only successful results are memoized;
+        failures and rejections always re-run the agent.
+
+        With allow_stale, a result within its step's stale window is used
+        and the step is recomputed in the background to refresh the cache
+        (see _recompute_step). The caller's event loop must keep running
+        until CacheManager.wait_for_refreshes() returns.
+        """
+        previous_output = state.get_last_output()
+        fingerprint, cache_key = self._step_fingerprint(state, step, previous_output)
+
+        tags = (task_tag(state.task_id), step_tag(step.value))
+
+        prefetched, fresh_until = self._valid_prefetched(state.task_id).pop(cache_key, (None, None))
+        if prefetched is not None and (fresh_until is None or time.time() < fresh_until):
+            logger.info(f"[{state.task_id}] Prefetched cache hit for step {step.value}: {cache_key}")
+            await self._cache_manager.record_served_hit(cache_key, prefetched, tags)
+            self._record_recovered(state, step, previous_output, prefetched)
+            await self._notify("cache_hit", state.task_id, step.value, cache_key)
+            return self._step_result_from_cache(state, step, prefetched)
+
+        own: Dict[str, StepResult] = {}
+
+        def to_payload(status: StepStatus, output_data, error_message) -> Dict[str, Any]:
+            return {
+                "status": status.value,
+                "agent": AGENT_COMMANDS.get(step),
+                "output_data": output_data,
+                "error_message": error_message,
+                # Lets later hits tell which canonicalization rules they needed
+                "variants": self._fingerprint_variants(state, step, previous_output),
+            }
+
+        async def run_step() -> Dict[str, Any]:
+            if use_runner:
+                result = await self._execute_step_async(state, step, previous_output)
+            else:
+                result = self._execute_step(state, step, previous_output)
+            own["result"] = result
+            return to_payload(result.status, result.output_data, result.error_message)
+
+        # A background refresh may run after the workflow has moved on, so
+        # the upstream output is captured rather than read from the state
+        async def refresh_step() -> Dict[str, Any]:
+            return to_payload(*await self._recompute_step(state, step, previous_output, use_runner))
+
+        payload = await self._cache_manager.get_or_compute(
+            ("step", step.value, fingerprint),
+            run_step,
+            cache_if=lambda p: p["status"] == StepStatus.SUCCESS.value and bool(p["output_data"]),
+            tags=tags,
+            allow_stale=allow_stale,
+            refresh_factory=refresh_step,
+        )
+
+        if "result" in own:
+            return own["result"]
+
+        if payload.get("status") == StepStatus.SUCCESS.value:
+            logger.info(f"[{state.task_id}] Cache hit for step {step.value}: {cache_key}")
+            self._record_recovered(state, step, previous_output, payload)
+            await self._notify("cache_hit", state.task_id, step.value, cache_key)
+            return self._step_result_from_cache(state, step, payload)
+
+        # A concurrent run of the same step failed; share its outcome
+        timestamp = datetime.utcnow().isoformat()
+        input_path, output_path, _ = self.ipc_manager.get_step_paths(state.task_id, step)
+        return StepResult(
+            step_name=step,
+            status=StepStatus(payload["status"]),
+            started_at=timestamp,
+            completed_at=timestamp,
+            input_path=str(input_path),
+            output_path=str(output_path),
+            exit_code=1,
+            output_data=payload.get("output_data"),
+            error_message=payload.get("error_message"),
+        )
+
+    def _step_result_from_cache(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        cached: Dict[str, Any],
+    ) -> StepResult:
+        """Materialize a cached step result into this workflow's IPC files"""
+        timestamp = datetime.utcnow().isoformat()
+        input_path, output_path, _ = self.ipc_manager.get_step_paths(state.task_id, step)
+
+        agent_input = AgentInput(
+            task_id=state.task_id,
+            task_description=state.task_description,
+            step_name=step.value,
+            previous_step_output=state.get_last_output(),
+        )
+        self.ipc_manager.prepare_step_input(state.task_id, step, agent_input)
+
+        output_data = cached["output_data"]
+        with open(output_path, 'w') as f:
+            json.dump(output_data, f, indent=2)
+
+        return StepResult(
+            step_name=step,
+            status=StepStatus.SUCCESS,
+            started_at=timestamp,
+            completed_at=timestamp,
+            input_path=str(input_path),
+            output_path=str(output_path),
+            exit_code=0,
+            output_data=output_data,
+            cached=True,
+        )
+
+    async def _execute_step_async(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        previous_output: Optional[Dict[str, Any]] = None,
+    ) -> StepResult:
         """Execute a single workflow step asynchronously using real agents"""
         started_at = datetime.utcnow().isoformat()
         input_path, output_path, stderr_path = self.ipc_manager.get_step_paths(
@@ -308,7 +748,8 @@ class WorkflowEngine:
         )
 
         # Prepare input
-        previous_output = state.get_last_output()
+        if previous_output is None:
+            previous_output = state.get_last_output()
 
         # Create prompt for the agent
         prompt = self.ipc_manager.create_agent_prompt(
@@ -347,28 +788,7 @@ class WorkflowEngine:
         completed_at = datetime.utcnow().isoformat()
 
         # Create output
-        if exit_code == 0 and output_content:
-            output = AgentOutput(
-                status="success",
-                payload={
-                    "step": step.value,
-                    "output": output_content[:5000],  # Truncate for storage
-                    "timestamp": completed_at,
-                },
-                message=f"{step.value.capitalize()} completed successfully",
-            )
-            step_status = StepStatus.SUCCESS
-        else:
-            output = AgentOutput(
-                status="failure",
-                payload={
-                    "step": step.value,
-                    "error": stderr_content[:1000],
-                    "timestamp": completed_at,
-                },
-                message=f"{step.value.capitalize()} failed",
-            )
-            step_status = StepStatus.FAILURE
+        step_status, output = self._agent_output(step, exit_code, output_content, stderr_content, completed_at)
 
         # Save output
         with open(output_path, 'w') as f:
@@ -390,7 +810,12 @@ class WorkflowEngine:
             error_message=stderr_content[:500] if stderr_content else None,
         )
 
-    def _execute_step(self, state: WorkflowState, step: AgentName) -> StepResult:
+    def _execute_step(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        previous_output: Optional[Dict[str, Any]] = None,
+    ) -> StepResult:
         """Execute a single workflow step"""
         started_at = datetime.utcnow().isoformat()
         input_path, output_path, stderr_path = self.ipc_manager.get_step_paths(
@@ -398,7 +823,8 @@ class WorkflowEngine:
         )
 
         # Prepare input
-        previous_output = state.get_last_output()
+        if previous_output is None:
+            previous_output = state.get_last_output()
         agent_input = AgentInput(
             task_id=state.task_id,
             task_description=state.task_description,
@@ -450,6 +876,90 @@ class WorkflowEngine:
             error_message=stderr_content[:500] if stderr_content else None,
         )
 
+    def _agent_output(
+        self,
+        step: AgentName,
+        exit_code: int,
+        output_content: str,
+        stderr_content: str,
+        completed_at: str,
+    ) -> Tuple[StepStatus, AgentOutput]:
+        """Build a step's output from an agent CLI run"""
+        if exit_code == 0 and output_content:
+            output = AgentOutput(
+                status="success",
+                payload={
+                    "step": step.value,
+                    "output": output_content[:5000],  # Truncate for storage
+                    "timestamp": completed_at,
+                },
+                message=f"{step.value.capitalize()} completed successfully",
+            )
+            return StepStatus.SUCCESS, output
+
+        output = AgentOutput(
+            status="failure",
+            payload={
+                "step": step.value,
+                "error": stderr_content[:1000],
+                "timestamp": completed_at,
+            },
+            message=f"{step.value.capitalize()} failed",
+        )
+        return StepStatus.FAILURE, output
+
+    def _simulated_output(self, step: AgentName) -> AgentOutput:
+        """Placeholder output of a simulated agent run"""
+        return AgentOutput(
+            status="success",
+            payload={
+                "step": step.value,
+                "message": f"Completed {step.value} step (simulated)",
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+            message=f"{step.value.capitalize()} completed successfully",
+        )
+
+    async def _recompute_step(
+        self,
+        state: WorkflowState,
+        step: AgentName,
+        previous_output: Optional[Dict[str, Any]],
+        use_runner: bool,
+    ) -> Tuple[StepStatus, Dict[str, Any], Optional[str]]:
+        """
+        Re-run a step's agent to refresh its cache entry.
+
+        Unlike _execute_step / _execute_step_async, nothing is written to
+        the workflow's IPC files and no notifications are sent: the step
+        was already served from cache and the workflow may have ended.
+
+        Returns:
+            Tuple of (status, output data, error message)
+        """
+        if not use_runner:
+            return StepStatus.SUCCESS, self._simulated_output(step).to_dict(), None
+
+        prompt = self.ipc_manager.create_agent_prompt(
+            task_id=state.task_id,
+            step=step,
+            task_description=state.task_description,
+            previous_output=previous_output,
+        )
+        try:
+            result = await self._agent_runner.run(
+                AGENT_COMMANDS.get(step),
+                prompt,
+                timeout_override=self.step_timeout
+            )
+            exit_code, output_content, stderr_content = result.return_code, result.stdout, result.stderr
+        except Exception as e:
+            exit_code, output_content, stderr_content = 1, "", str(e)
+
+        completed_at = datetime.utcnow().isoformat()
+        status, output = self._agent_output(step, exit_code, output_content, stderr_content, completed_at)
+        return status, output.to_dict(), stderr_content[:500] if stderr_content else None
+
     def _run_agent(
         self,
         step: AgentName,
@@ -475,16 +985,7 @@ class WorkflowEngine:
         # For now, simulate agent execution by creating a placeholder output
         # In production, this would actually invoke the CLI tool
         try:
-            # Create a simulated output
-            simulated_output = AgentOutput(
-                status="success",
-                payload={
-                    "step": step.value,
-                    "message": f"Completed {step.value} step (simulated)",
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-                message=f"{step.value.capitalize()} completed successfully",
-            )
+            simulated_output = self._simulated_output(step)
 
             with open(output_path, 'w') as f:
                 json.dump(simulated_output.to_dict(), f, indent=2)
@@ -581,6 +1082,7 @@ class WorkflowEngine:
                     "step": h.step_name.value,
                     "status": h.status.value,
                     "duration": h.completed_at,
+                    "cached": h.cached,
                 }
                 for h in state.history
             ],
@@ -599,6 +1101,8 @@ class WorkflowEngine:
                             "task_id": state.task_id,
                             "status": state.status.value,
                             "current_step": state.current_step.value if state.current_step else None,
+                            "predicted_cache_hits": state.predicted_cache_hits,
+                            "predicted_agent_runs": state.predicted_agent_runs(),
                             "created_at": state.created_at,
                             "last_updated": state.last_updated,
                         })
@@ -626,5 +1130,6 @@ class WorkflowEngine:
         print("  HISTORY:")
         for h in status["history"]:
             icon = "✓" if h["status"] == "success" else "✗"
-            print(f"    {icon} {h['step']:12} - {h['status']}")
+            cached = " (cached)" if h["cached"] else ""
+            print(f"    {icon} {h['step']:12} - {h['status']}{cached}")
         print("=" * 60)
@@ -98,6 +98,7 @@ class StepResult:
     output_data: Optional[Dict[str, Any]] = None
     error_log_path: Optional[str] = None
     error_message: Optional[str] = None
+    cached: bool = False  # Served from the step cache instead of running the agent
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -111,6 +112,7 @@ class StepResult:
             "output_data": self.output_data,
             "error_log_path": self.error_log_path,
             "error_message": self.error_message,
+            "cached": self.cached,
         }
 
     @classmethod
@@ -126,6 +128,7 @@ class StepResult:
             output_data=data.get("output_data"),
             error_log_path=data.get("error_log_path"),
             error_message=data.get("error_message"),
+            cached=data.get("cached", False),
         )
 
 
@@ -139,6 +142,9 @@ class WorkflowState:
     history: List[StepResult] = field(default_factory=list)
     retry_count: int = 0
     rework_count: int = 0
+    use_cache: bool = True  # Per-workflow step cache bypass
+    # Steps expected to be served from cache, resolved when the workflow was queued
+    predicted_cache_hits: List[str] = field(default_factory=list)
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     last_updated: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
@@ -159,6 +165,14 @@ class WorkflowState:
                 return result.output_data
         return None
 
+    def predicted_agent_runs(self) -> int:
+        """Remaining steps that are not expected to be served from cache"""
+        chain = AgentName.get_chain_order()
+        if self.current_step is None or self.current_step not in chain:
+            return 0
+        remaining = chain[chain.index(self.current_step):]
+        return sum(1 for step in remaining if step.value not in self.predicted_cache_hits)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "task_id": self.task_id,
@@ -168,6 +182,8 @@ class WorkflowState:
             "history": [h.to_dict() for h in self.history],
             "retry_count": self.retry_count,
             "rework_count": self.rework_count,
+            "use_cache": self.use_cache,
+            "predicted_cache_hits": self.predicted_cache_hits,
             "created_at": self.created_at,
             "last_updated": self.last_updated,
         }
@@ -183,6 +199,8 @@ class WorkflowState:
             history=history,
             retry_count=data.get("retry_count", 0),
             rework_count=data.get("rework_count", 0),
+            use_cache=data.get("use_cache", True),
+            predicted_cache_hits=data.get("predicted_cache_hits", []),
             created_at=data.get("created_at", datetime.utcnow().isoformat()),
             last_updated=data.get("last_updated", datetime.utcnow().isoformat()),
         )
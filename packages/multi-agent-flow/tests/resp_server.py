@@ -0,0 +1,359 @@
+"""
+In-process RESP server (test support)
+
+A small Redis stand-in that speaks enough of the protocol for RedisCache,
+so the Redis backend is tested without an external service. Data lives
+in memory and is lost when the server stops.
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from typing import Optional, Dict, List, Any, Tuple, Set
+
+from multi_agent_flow.cache.resp import RespError
+
+logger = logging.getLogger(__name__)
+
+
+class WrongType(Exception):
+    """Command applied to a key holding another data type"""
+    pass
+
+
+def _glob_to_regex(pattern: str) -> "re.Pattern":
+    """Translate a Redis glob (with backslash escapes) into a regex"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        if ch == "*":
+            out.append(".*")
+        elif ch == "?":
+            out.append(".")
+        elif ch == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("^"):
+                    body = "^" + re.escape(body[1:])
+                else:
+                    body = re.escape(body)
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return re.compile("".join(out) + r"\Z", re.DOTALL)
+
+
+def _encode_reply(value: Any) -> bytes:
+    """Encode a Python value as a RESP reply"""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, bool):
+        return f":{int(value)}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return f"${len(value)}\r\n".encode() + value + b"\r\n"
+    if isinstance(value, (list, tuple)):
+        return f"*{len(value)}\r\n".encode() + b"".join(_encode_reply(v) for v in value)
+    raise TypeError(f"Cannot encode reply: {value!r}")
+
+
+class LocalRespServer:
+    """
+    In-memory RESP server for tests.
+
+    Usage:
+        async with LocalRespServer() as server:
+            cache = RedisCache(port=server.port)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        # key -> (value, expires_at_ms or None)
+        self._data: Dict[bytes, Tuple[bytes, Optional[int]]] = {}
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self.commands_processed = 0
+        # Command name -> times executed
+        self.command_counts: Counter = Counter()
+        # Client connections accepted
+        self.connections_accepted = 0
+
+    async def start(self):
+        """Start listening"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"LocalRespServer listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        """Stop listening"""
+        if self._server:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "LocalRespServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        """Read one RESP array command"""
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command (e.g. from telnet)
+            return line.strip().split()
+
+        args = []
+        for _ in range(int(line[1:-2])):
+            header = await reader.readline()
+            length = int(header[1:-2])
+            data = await reader.readexactly(length + 2)
+            args.append(data[:-2])
+        return args
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one client connection"""
+        self._clients.add(writer)
+        self.connections_accepted += 1
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                writer.write(_encode_reply(self.dispatch(args)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def _now_ms(self) -> int:
+        return int(time.time() * 1000)
+
+    def _live(self, key: bytes) -> Optional[Tuple[bytes, Optional[int]]]:
+        """Return a live entry, expiring it lazily"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and self._now_ms() >= entry[1]:
+            del self._data[key]
+            return None
+        return entry
+
+    def dispatch(self, args: List[bytes]) -> Any:
+        """Execute a command and return its reply value"""
+        self.commands_processed += 1
+        name = args[0].decode().upper()
+        self.command_counts[name] += 1
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return RespError(f"ERR unknown command '{name}'")
+        try:
+            return handler(*args[1:])
+        except WrongType:
+            return RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        except (TypeError, ValueError, IndexError):
+            return RespError(f"ERR wrong arguments for '{name}' command")
+
+    # Connection commands
+
+    def _cmd_ping(self, *args):
+        return args[0] if args else "PONG"
+
+    def _cmd_auth(self, *args):
+        return "OK"
+
+    def _cmd_select(self, db):
+        return "OK"
+
+    # String commands
+
+    def _string(self, key) -> Optional[bytes]:
+        """Live string value of a key (raises WrongType for other types)"""
+        entry = self._live(key)
+        if entry is None:
+            return None
+        if not isinstance(entry[0], bytes):
+            raise WrongType()
+        return entry[0]
+
+    def _cmd_get(self, key):
+        return self._string(key)
+
+    def _cmd_mget(self, *keys):
+        values = []
+        for key in keys:
+            entry = self._live(key)
+            # MGET reports non-string keys as nil instead of failing
+            values.append(entry[0] if entry and isinstance(entry[0], bytes) else None)
+        return values
+
+    def _cmd_set(self, key, value, *options):
+        expires_at = None
+        nx = xx = False
+        opts = [o.upper() for o in options]
+        i = 0
+        while i < len(opts):
+            if opts[i] == b"EX":
+                expires_at = self._now_ms() + int(opts[i + 1]) * 1000
+                i += 2
+            elif opts[i] == b"PX":
+                expires_at = self._now_ms() + int(opts[i + 1])
+                i += 2
+            elif opts[i] == b"NX":
+                nx = True
+                i += 1
+            elif opts[i] == b"XX":
+                xx = True
+                i += 1
+            else:
+                return RespError("ERR syntax error")
+
+        exists = self._live(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._data[key] = (value, expires_at)
+        return "OK"
+
+    def _cmd_getrange(self, key, start, end):
+        value = self._string(key)
+        if value is None:
+            return b""
+        start, end = int(start), int(end)
+        if start < 0:
+            start = max(len(value) + start, 0)
+        if end < 0:
+            end = len(value) + end
+        return value[start:end + 1]
+
+    def _cmd_strlen(self, key):
+        value = self._string(key)
+        return len(value) if value is not None else 0
+
+    # Set commands
+
+    def _set(self, key) -> set:
+        """Live set value of a key (raises WrongType for other types)"""
+        entry = self._live(key)
+        if entry is None:
+            return set()
+        if not isinstance(entry[0], set):
+            raise WrongType()
+        return entry[0]
+
+    def _cmd_sadd(self, key, *members):
+        if not members:
+            raise ValueError("no members")
+        members_set = self._set(key)
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        entry = self._live(key)
+        self._data[key] = (members_set, entry[1] if entry else None)
+        return added
+
+    def _cmd_srem(self, key, *members):
+        members_set = self._set(key)
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        if not members_set and key in self._data:
+            del self._data[key]
+        return removed
+
+    def _cmd_smembers(self, key):
+        return sorted(self._set(key))
+
+    def _cmd_scard(self, key):
+        return len(self._set(key))
+
+    # Key commands
+
+    def _cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    def _cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    def _cmd_expire(self, key, seconds):
+        entry = self._live(key)
+        if entry is None:
+            return 0
+        self._data[key] = (entry[0], self._now_ms() + int(seconds) * 1000)
+        return 1
+
+    def _cmd_pttl(self, key):
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return max(entry[1] - self._now_ms(), 0)
+
+    def _cmd_ttl(self, key):
+        pttl = self._cmd_pttl(key)
+        return pttl if pttl < 0 else pttl // 1000
+
+    def _cmd_scan(self, cursor, *options):
+        pattern = b"*"
+        count = 10
+        opts = list(options)
+        for i in range(0, len(opts) - 1, 2):
+            if opts[i].upper() == b"MATCH":
+                pattern = opts[i + 1]
+            elif opts[i].upper() == b"COUNT":
+                count = int(opts[i + 1])
+
+        regex = _glob_to_regex(pattern.decode())
+        keys = sorted(self._data)
+        start = int(cursor)
+        batch = keys[start:start + count]
+        next_cursor = start + count if start + count < len(keys) else 0
+        matched = [
+            key for key in batch
+            if self._live(key) is not None and regex.match(key.decode())
+        ]
+        return [str(next_cursor).encode(), matched]
+
+    def _cmd_dbsize(self):
+        return sum(1 for key in list(self._data) if self._live(key) is not None)
+
+    def _cmd_flushdb(self, *args):
+        self._data.clear()
+        return "OK"
@@ -0,0 +1,137 @@
+"""
+Tests for running scheduler tasks on agent CLIs
+"""
+import asyncio
+import pickle
+import sys
+import time
+
+import pytest
+
+from multi_agent_flow.agents import AgentConfig, AgentsConfig, AgentTaskHandler
+from multi_agent_flow.scheduler import AgentState, AgentStatus, TaskScheduler, TaskStatus
+
+
+def python_agent(name, code):
+    """An agent CLI that runs a Python snippet with the prompt as argv[1]"""
+    config = AgentsConfig()
+    config.add(AgentConfig(name=name, executable=sys.executable, default_args=["-c", code], timeout_seconds=30))
+    return config
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    scheduler = TaskScheduler(state_file=tmp_path / "agents.json", poll_interval=0.1)
+    scheduler.state_manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex", status=AgentStatus.IDLE,
+    ))
+    yield scheduler
+    scheduler.stop()
+
+
+def wait_finished(scheduler, task_id, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = scheduler.get_task_status(task_id)
+        if status["status"] in (TaskStatus.COMPLETED.value, TaskStatus.FAILED.value):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"Task {task_id} did not finish")
+
+
+def test_task_runs_on_the_agent_cli(tmp_path, scheduler):
+    handler = AgentTaskHandler(python_agent("codex", "import sys; print('done: ' + sys.argv[1])"), working_dir=tmp_path)
+    scheduler.register_task_handler("writer", handler)
+    scheduler.start()
+
+    task = scheduler.submit_task("Implement login", target_role="writer")
+    status = wait_finished(scheduler, task.id)
+
+    assert status["status"] == TaskStatus.COMPLETED.value
+    assert status["result"]["stdout"] == "done: Implement login\n"
+    assert status["result"]["agent_name"] == "codex"
+
+
+def test_failed_agent_run_fails_the_task(tmp_path, scheduler):
+    handler = AgentTaskHandler(python_agent("codex", "import sys; sys.exit('broken')"), working_dir=tmp_path)
+    scheduler.register_task_handler("writer", handler)
+    scheduler.start()
+
+    task = scheduler.submit_task("Implement login", target_role="writer")
+    status = wait_finished(scheduler, task.id)
+
+    assert status["status"] == TaskStatus.FAILED.value
+    assert "exited with 1: broken" in status["error"]
+
+
+def test_missing_agent_cli_fails_the_task(tmp_path, scheduler):
+    handler = AgentTaskHandler(AgentsConfig(), working_dir=tmp_path)
+    scheduler.register_task_handler("writer", handler)
+    scheduler.start()
+
+    task = scheduler.submit_task("Implement login", target_role="writer")
+
+    assert wait_finished(scheduler, task.id)["status"] == TaskStatus.FAILED.value
+
+
+def test_handler_is_picklable_for_the_process_executor(tmp_path):
+    handler = AgentTaskHandler(python_agent("codex", "print('ok')"), working_dir=tmp_path, timeout_override=5)
+    restored = pickle.loads(pickle.dumps(handler))
+    assert restored.config.get("codex").executable == sys.executable
+    assert restored.timeout_override == 5
+
+
+def test_async_scheduler_awaits_the_agent_run_on_its_loop(tmp_path, monkeypatch):
+    from multi_agent_flow.scheduler import AsyncTaskScheduler, async_scheduler
+
+    async def no_threads(*args, **kwargs):
+        raise AssertionError("handler was run in a thread")
+
+    monkeypatch.setattr(async_scheduler.asyncio, "to_thread", no_threads)
+    handler = AgentTaskHandler(python_agent("codex", "import sys; print('done: ' + sys.argv[1])"), working_dir=tmp_path)
+
+    async def run():
+        scheduler = AsyncTaskScheduler(state_file=tmp_path / "agents.json", poll_interval=0.1)
+        scheduler.state_manager.register_agent(AgentState(
+            id="writer", name="Writer", port=8002, roles=["writer"], model="codex", status=AgentStatus.IDLE,
+        ))
+        scheduler.register_task_handler("writer", handler)
+        async with scheduler:
+            task = scheduler.submit_task("Implement login", target_role="writer")
+            deadline = time.monotonic() + 30
+            while scheduler.get_task_status(task.id)["status"] != TaskStatus.COMPLETED.value:
+                assert time.monotonic() < deadline, scheduler.get_task_status(task.id)
+                await asyncio.sleep(0.05)
+            return scheduler.get_task_status(task.id)
+
+    status = asyncio.run(run())
+
+    assert status["result"]["stdout"] == "done: Implement login\n"
+
+
+def test_cancelled_async_task_propagates_cancellation(tmp_path):
+    from multi_agent_flow.scheduler import AsyncTaskScheduler
+
+    async def hang(task, agent):
+        await asyncio.sleep(60)
+
+    async def run():
+        scheduler = AsyncTaskScheduler(state_file=tmp_path / "agents.json", poll_interval=0.1)
+        scheduler.state_manager.register_agent(AgentState(
+            id="writer", name="Writer", port=8002, roles=["writer"], model="codex", status=AgentStatus.IDLE,
+        ))
+        scheduler.register_task_handler("writer", hang)
+        async with scheduler:
+            task = scheduler.submit_task("Hang", target_role="writer")
+            while task.id not in scheduler._in_flight:
+                await asyncio.sleep(0.01)
+            running = scheduler._in_flight[task.id]
+            assert scheduler.cancel_task(task.id)
+            await asyncio.gather(running, return_exceptions=True)
+            return running, scheduler.get_task_status(task.id), scheduler.state_manager.get_state("writer")
+
+    running, status, agent = asyncio.run(run())
+
+    assert running.cancelled()
+    assert status["status"] == TaskStatus.CANCELLED.value
+    assert agent.running_task_ids == []
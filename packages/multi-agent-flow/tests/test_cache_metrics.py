@@ -0,0 +1,58 @@
+"""
+Tests for host-wide cache metrics reporting
+"""
+import json
+
+import pytest
+
+from multi_agent_flow.cache.metrics import CacheMetrics, OPEN_LATENCY_BUCKET
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    metrics = CacheMetrics(db_path=tmp_path / "metrics.db")
+    yield metrics
+    metrics.close()
+
+
+def test_percentiles_use_bucket_bounds(metrics):
+    for _ in range(19):
+        metrics.record_lookup("planner", hit=True, latency_s=0.003)
+    metrics.record_lookup("planner", hit=False, latency_s=0.2)
+
+    planner = metrics.summary()["steps"]["planner"]
+
+    assert planner["p50_lookup_ms"] == 5.0
+    assert planner["p95_lookup_ms"] == 5.0
+    assert planner["hit_rate_percent"] == 95.0
+
+
+def test_slow_lookups_report_open_bucket_as_json(metrics):
+    metrics.record_lookup("writer", hit=False, latency_s=2.5)
+
+    summary = metrics.summary()
+
+    assert summary["steps"]["writer"]["p95_lookup_ms"] == OPEN_LATENCY_BUCKET
+    # Starlette's JSONResponse rejects inf/nan the same way
+    json.dumps(summary, allow_nan=False)
+
+
+def test_dashboard_endpoint_serves_slow_lookups(metrics):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from multi_agent_flow.dashboard.server import DashboardServer
+
+    metrics.record_lookup("writer", hit=False, latency_s=2.5)
+    server = DashboardServer()
+    server._cache_metrics = metrics
+
+    response = TestClient(server.create_app()).get("/cache/metrics")
+
+    assert response.status_code == 200
+    assert response.json()["total"]["p95_lookup_ms"] == OPEN_LATENCY_BUCKET
+
+
+def test_no_lookups_have_no_percentile(metrics):
+    metrics.record_write("planner", 10)
+
+    assert metrics.summary()["steps"]["planner"]["p95_lookup_ms"] is None
@@ -0,0 +1,147 @@
+"""
+Tests for cache input canonicalization rules
+"""
+import json
+
+from multi_agent_flow.cache import (
+    CacheManager,
+    Canonicalizer,
+    SortKeysRule,
+    TaskHeaderRule,
+    VolatileFieldsRule,
+    WhitespaceRule,
+)
+from multi_agent_flow.workflow import FileIPCManager, WorkflowEngine
+
+
+# TaskHeaderRule
+
+def test_task_header_is_removed():
+    text = "[Task ID: task-123]\nImplement login\n"
+    assert TaskHeaderRule().apply_text(text) == "Implement login\n"
+
+
+def test_task_header_rule_keeps_other_brackets():
+    text = "Implement login\nSee [Task ID: task-123] in the log\n[Note: keep]\n"
+    assert TaskHeaderRule().apply_text(text) == text
+
+
+def test_task_header_rule_leaves_data_alone():
+    data = {"header": "[Task ID: task-123]"}
+    assert TaskHeaderRule().apply_data(data) == data
+
+
+# VolatileFieldsRule
+
+def test_volatile_fields_are_dropped_at_any_depth():
+    data = {
+        "plan": "steps",
+        "timestamp": "2026-01-01T00:00:00",
+        "items": [{"name": "a", "created_at": "x"}, {"name": "b", "task_id": "t1"}],
+    }
+    assert VolatileFieldsRule().apply_data(data) == {
+        "plan": "steps",
+        "items": [{"name": "a"}, {"name": "b"}],
+    }
+
+
+def test_volatile_fields_rule_uses_configured_fields():
+    rule = VolatileFieldsRule(["run_id"])
+    assert rule.apply_data({"run_id": 7, "timestamp": "x"}) == {"timestamp": "x"}
+
+
+def test_volatile_fields_rule_rewrites_json_text_only():
+    assert json.loads(VolatileFieldsRule().apply_text('{"a": 1, "timestamp": "x"}')) == {"a": 1}
+    text = "timestamp: 2026-01-01, not JSON"
+    assert VolatileFieldsRule().apply_text(text) == text
+
+
+# SortKeysRule
+
+def test_sort_keys_orders_nested_objects():
+    data = {"b": {"y": 1, "x": 2}, "a": [{"d": 1, "c": 2}]}
+    result = SortKeysRule().apply_data(data)
+    assert list(result) == ["a", "b"]
+    assert list(result["b"]) == ["x", "y"]
+    assert list(result["a"][0]) == ["c", "d"]
+    assert result == data
+
+
+def test_sort_keys_rule_keeps_list_order_and_values():
+    data = [3, 1, {"b": "z", "a": "y"}]
+    assert SortKeysRule().apply_data(data) == [3, 1, {"a": "y", "b": "z"}]
+
+
+def test_sort_keys_rule_rewrites_json_text_only():
+    assert SortKeysRule().apply_text('{"b": 1, "a": 2}') == '{"a": 2, "b": 1}'
+    text = "b = 1\na = 2"
+    assert SortKeysRule().apply_text(text) == text
+
+
+# WhitespaceRule
+
+def test_whitespace_is_normalized():
+    text = "\r\nline one  \r\n\r\n\r\n\r\nline two\t\n\n"
+    assert WhitespaceRule().apply_text(text) == "line one\n\nline two"
+
+
+def test_whitespace_rule_keeps_indentation():
+    code = "def f():\n    return 1\n\n    # comment"
+    assert WhitespaceRule().apply_text(code) == code
+
+
+def test_whitespace_rule_applies_to_strings_in_data():
+    data = {"code": "x = 1   \n", "lines": ["a \n\n\n\nb"], "count": 3}
+    assert WhitespaceRule().apply_data(data) == {"code": "x = 1", "lines": ["a\n\nb"], "count": 3}
+
+
+# Canonicalizer
+
+def test_canonicalizer_applies_rules_in_order():
+    canonicalizer = Canonicalizer()
+    a = '[Task ID: t1]\n{"timestamp": "1", "b": 1, "a": 2}  '
+    b = '[Task ID: t2]\n{"a": 2, "b": 1, "timestamp": "2"}'
+    assert canonicalizer.hash(a) == canonicalizer.hash(b)
+    assert canonicalizer.rule_names == ["task_header", "volatile_fields", "sort_keys", "whitespace"]
+
+
+def test_canonicalizer_skips_one_rule():
+    canonicalizer = Canonicalizer()
+    text = "[Task ID: t1]\nImplement login  "
+    assert canonicalizer.canonicalize_text(text) == "Implement login"
+    assert canonicalizer.canonicalize_text(text, skip="task_header") == "[Task ID: t1]\nImplement login"
+
+
+def test_empty_canonicalizer_hashes_input_unchanged():
+    canonicalizer = Canonicalizer([])
+    assert canonicalizer.canonicalize_text(" a ") == " a "
+    assert canonicalizer.canonicalize_data(None) is None
+
+
+def test_recovered_hits_are_reported_per_rule(tmp_path):
+    cache = CacheManager(backend="sqlite", db_path=tmp_path / "cache.db", persist_metrics=False)
+    for task_id in ("task-1", "task-2"):
+        engine = WorkflowEngine(
+            ipc_manager=FileIPCManager(tmp_path / "runs"),
+            state_dir=tmp_path / "states",
+            use_real_agents=False,
+            cache_manager=cache,
+        )
+        engine.start_workflow(task_id, "Implement login", warm_cache=False)
+        engine.execute_workflow(task_id)
+
+    # Prompts differ only in their task ID header, so both cached steps of
+    # the second workflow were recovered by that rule alone
+    assert cache.get_stats()["recovered_by_rule"] == {"task_header": 2}
+
+
+def test_record_recovered_hit_counts_each_rule(tmp_path):
+    cache = CacheManager(backend="sqlite", db_path=tmp_path / "cache.db", metrics_path=tmp_path / "metrics.db")
+    cache.record_recovered_hit("planner", ["sort_keys", "whitespace"])
+    cache.record_recovered_hit("writer", ["sort_keys"])
+
+    assert cache.get_stats()["recovered_by_rule"] == {"sort_keys": 2, "whitespace": 1}
+    steps = cache.get_host_stats()["steps"]
+    assert steps["planner"]["recovered_by_rule"] == {"sort_keys": 1, "whitespace": 1}
+    assert steps["writer"]["recovered_by_rule"] == {"sort_keys": 1}
+    cache.metrics.close()
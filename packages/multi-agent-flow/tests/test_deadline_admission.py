@@ -0,0 +1,169 @@
+"""
+Tests for deadline admission: work queued ahead, flag/reject, and SLA outcome
+"""
+import itertools
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from multi_agent_flow.scheduler import (
+    AgentState, AgentStatus, InMemoryTaskQueue, SqliteTaskQueue, Task, TaskPriority,
+    TaskQueue, TaskScheduler, TaskStatus,
+)
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_task(i, role="writer", priority=TaskPriority.NORMAL, deadline_in=None, estimate=None):
+    return Task(
+        id=f"t{i:03d}",
+        description=f"task {i}",
+        target_role=role,
+        priority=priority,
+        created_at=(BASE + timedelta(seconds=37 * i)).isoformat(),
+        deadline=(BASE + timedelta(seconds=deadline_in)).isoformat() if deadline_in is not None else None,
+        estimated_seconds=estimate,
+    )
+
+
+def mixed_tasks():
+    priorities = itertools.cycle([TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW])
+    tasks = []
+    for i in range(40):
+        tasks.append(make_task(
+            i,
+            role="writer" if i % 4 else "tester",
+            priority=next(priorities),
+            deadline_in=600 + 90 * (i % 7) if i % 3 == 0 else None,
+            estimate=float(10 + i) if i % 2 else None,
+        ))
+    return tasks
+
+
+@pytest.fixture(params=list(itertools.product(["memory", "sqlite"], [None, 300.0], [False, True])),
+                ids=lambda p: f"{p[0]}-aging={p[1]}-edf={p[2]}")
+def queue(request, tmp_path):
+    kind, aging, edf = request.param
+    if kind == "memory":
+        return InMemoryTaskQueue(max_size=1000, aging_seconds=aging, edf=edf)
+    return SqliteTaskQueue(db_path=tmp_path / "tasks.db", aging_seconds=aging, edf=edf)
+
+
+def test_pending_ahead_matches_the_dispatch_order(queue):
+    for task in mixed_tasks():
+        queue.submit(task)
+    # A running task no longer counts as queued
+    running = queue.get_pending_tasks()[0]
+    running.status = TaskStatus.RUNNING
+    queue.update_task(running)
+
+    for probe in [
+        make_task(100),
+        make_task(101, priority=TaskPriority.HIGH),
+        make_task(102, priority=TaskPriority.LOW, estimate=5.0),
+        make_task(103, deadline_in=700),
+        make_task(104, role="tester", deadline_in=60),
+        make_task(-20, priority=TaskPriority.LOW),
+    ]:
+        assert queue.pending_ahead(probe) == TaskQueue.pending_ahead(queue, probe), probe.id
+
+
+def test_pending_ahead_does_not_list_the_queue(queue, monkeypatch):
+    for task in mixed_tasks():
+        queue.submit(task)
+
+    def no_scan():
+        raise AssertionError("pending tasks listed")
+
+    monkeypatch.setattr(queue, "get_pending_tasks", no_scan)
+    seconds, unestimated = queue.pending_ahead(make_task(100, priority=TaskPriority.LOW))
+
+    assert unestimated > 0 and seconds > 0
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    def make(deadline_policy="flag", edf=False):
+        scheduler = TaskScheduler(
+            state_file=tmp_path / "agents.json", poll_interval=0.1,
+            queue=InMemoryTaskQueue(edf=edf), deadline_policy=deadline_policy,
+        )
+        scheduler.state_manager.register_agent(AgentState(
+            id="writer", name="Writer", port=8002, roles=["writer"], model="codex",
+            status=AgentStatus.IDLE, capacity=2,
+        ))
+        made.append(scheduler)
+        return scheduler
+
+    made = []
+    yield make
+    for scheduler in made:
+        scheduler.stop()
+
+
+def in_seconds(seconds):
+    return datetime.utcnow() + timedelta(seconds=seconds)
+
+
+def test_task_behind_a_long_backlog_is_flagged(scheduler):
+    scheduler = scheduler()
+    for i in range(4):
+        scheduler.submit_task(f"queued {i}", "writer", estimated_seconds=600)
+
+    # 4 x 600s over 2 slots, then 60s of its own
+    fits = scheduler.submit_task("fits", "writer", deadline=in_seconds(1400), estimated_seconds=60)
+    late = scheduler.submit_task("late", "writer", deadline=in_seconds(1200), estimated_seconds=60)
+
+    assert "deadline_at_risk" not in fits.metadata
+    assert late.metadata["deadline_at_risk"] is True
+    assert "predicted_finish" in late.metadata
+    assert scheduler.get_sla_stats()["flagged"] == 1
+
+
+def test_edf_admits_an_urgent_task_ahead_of_the_backlog(scheduler):
+    scheduler = scheduler(edf=True)
+    for i in range(4):
+        scheduler.submit_task(f"queued {i}", "writer", estimated_seconds=600)
+
+    urgent = scheduler.submit_task("urgent", "writer", deadline=in_seconds(120), estimated_seconds=60)
+
+    assert "deadline_at_risk" not in urgent.metadata
+    assert scheduler.queue.get_pending_tasks()[0].id == urgent.id
+
+
+def test_reject_policy_refuses_a_late_task(scheduler):
+    scheduler = scheduler(deadline_policy="reject")
+    for i in range(4):
+        scheduler.submit_task(f"queued {i}", "writer", estimated_seconds=600)
+
+    with pytest.raises(RuntimeError, match="would miss its deadline"):
+        scheduler.submit_task("late", "writer", deadline=in_seconds(900), estimated_seconds=60)
+
+    assert scheduler.queue.stats()["pending"] == 4
+    assert scheduler.get_sla_stats()["rejected"] == 1
+
+
+def test_sla_met_records_the_outcome(scheduler):
+    scheduler = scheduler()
+
+    def handler(task, agent):
+        time.sleep(0.3)
+        return {"ok": True}
+
+    scheduler.register_task_handler("writer", handler)
+    on_time = scheduler.submit_task("on time", "writer", deadline=in_seconds(60), estimated_seconds=0.3)
+    late = scheduler.submit_task("late", "writer", deadline=in_seconds(0.1), estimated_seconds=0.3)
+    scheduler.start()
+
+    deadline = time.monotonic() + 10
+    while scheduler.queue.stats()["completed"] < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    assert scheduler.queue.get_task(on_time.id).sla_met is True
+    assert scheduler.queue.get_task(late.id).sla_met is False
+    stats = scheduler.get_sla_stats()
+    assert (stats["met"], stats["missed"], stats["flagged"]) == (1, 1, 1)
+    assert stats["hit_rate_percent"] == 50.0
+    assert stats["max_lateness_seconds"] > 0
@@ -0,0 +1,123 @@
+"""
+Tests for bounded task executors: backpressure and shutdown
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from multi_agent_flow.scheduler import AgentState, AgentStatus, TaskScheduler, TaskStatus
+from multi_agent_flow.scheduler.executor import AsyncioTaskExecutor, ThreadTaskExecutor
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_bound_covers_workers_and_queue(release):
+    executor = ThreadTaskExecutor(max_workers=2, max_queue=1)
+    futures = [executor.submit(release.wait) for _ in range(3)]
+
+    wait_until(lambda: executor.stats()["active"] == 2)
+    stats = executor.stats()
+    assert not executor.has_capacity()
+    assert (stats["active"], stats["queued"], stats["utilization_percent"]) == (2, 1, 100.0)
+
+    release.set()
+    for future in futures:
+        assert future.result(timeout=5) is True
+    wait_until(executor.has_capacity)
+    assert executor.stats()["completed"] == 3
+    executor.shutdown()
+
+
+def test_drain_waits_for_in_flight_work():
+    executor = ThreadTaskExecutor(max_workers=1, max_queue=1)
+    done = []
+    for i in range(2):
+        executor.submit(lambda i=i: (time.sleep(0.1), done.append(i)))
+
+    assert executor.shutdown(drain=True) == 0
+
+    assert done == [0, 1]
+    assert not executor.has_capacity()
+    with pytest.raises(RuntimeError, match="shut down"):
+        executor.submit(print)
+
+
+def test_drain_timeout_returns_with_work_still_running(release):
+    executor = ThreadTaskExecutor(max_workers=1)
+    future = executor.submit(release.wait)
+
+    start = time.monotonic()
+    executor.shutdown(drain=True, timeout=0.2)
+
+    assert time.monotonic() - start < 2.0
+    assert not future.done()
+
+
+def test_cancel_drops_work_that_has_not_started(release):
+    executor = ThreadTaskExecutor(max_workers=1, max_queue=2)
+    running = executor.submit(release.wait)
+    queued = [executor.submit(release.wait) for _ in range(2)]
+    wait_until(lambda: executor.stats()["active"] == 1)
+
+    assert executor.shutdown(drain=False) == 2
+
+    assert all(future.cancelled() for future in queued)
+    release.set()
+    assert running.result(timeout=5) is True
+    assert executor.stats()["cancelled"] == 2
+
+
+def test_asyncio_cancel_stops_running_coroutines():
+    executor = AsyncioTaskExecutor(max_workers=2)
+    started = threading.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(60)
+
+    future = executor.submit(hang)
+    assert started.wait(5)
+
+    start = time.monotonic()
+    assert executor.shutdown(drain=False) == 1
+
+    assert time.monotonic() - start < 5.0
+    assert future.cancelled()
+
+
+def test_scheduler_leaves_tasks_pending_while_executor_is_full(tmp_path, release):
+    scheduler = TaskScheduler(state_file=tmp_path / "agents.json", poll_interval=0.1, max_workers=1)
+    scheduler.state_manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex",
+        status=AgentStatus.IDLE, capacity=5,
+    ))
+    scheduler.register_task_handler("writer", lambda task, agent: release.wait(5) and {"ok": True})
+    scheduler.start()
+    try:
+        tasks = [scheduler.submit_task(f"task {i}", target_role="writer") for i in range(3)]
+        wait_until(lambda: scheduler.queue.stats()["running"] == 1)
+        time.sleep(0.3)
+
+        # Backpressure: the agent has free slots, but the pool does not
+        assert scheduler.queue.stats() == {"total": 3, "pending": 2, "running": 1, "completed": 0, "failed": 0}
+
+        release.set()
+        wait_until(lambda: all(
+            scheduler.get_task_status(t.id)["status"] == TaskStatus.COMPLETED.value for t in tasks
+        ))
+    finally:
+        scheduler.stop()
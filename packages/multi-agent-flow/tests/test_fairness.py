@@ -0,0 +1,137 @@
+"""
+Tests for dispatch ordering: priority aging, EDF and weighted fair share
+"""
+import itertools
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from multi_agent_flow.scheduler import FairShare, InMemoryTaskQueue, SqliteTaskQueue, Task, TaskPriority
+from multi_agent_flow.scheduler.fairness import SUBMITTER_KEY, order_key
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+PRIORITIES = [TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW]
+
+
+def make_queue(kind, tmp_path, **options):
+    if kind == "memory":
+        return InMemoryTaskQueue(max_size=1000, **options)
+    return SqliteTaskQueue(db_path=tmp_path / "tasks.db", **options)
+
+
+def make_task(task_id, seconds, priority=TaskPriority.NORMAL, role="writer", submitter=None, deadline_in=None):
+    return Task(
+        id=task_id,
+        description=task_id,
+        target_role=role,
+        priority=priority,
+        created_at=(BASE + timedelta(seconds=seconds)).isoformat(),
+        deadline=(BASE + timedelta(seconds=deadline_in)).isoformat() if deadline_in is not None else None,
+        metadata={SUBMITTER_KEY: submitter} if submitter else {},
+    )
+
+
+def dispatch_order(queue, count=None):
+    order = []
+    while count is None or len(order) < count:
+        task = queue.peek_runnable()
+        if task is None:
+            break
+        assert queue.claim(task.id, "test") is not None
+        order.append(task.id)
+    return order
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+@pytest.mark.parametrize("aging,edf", list(itertools.product([None, 60.0, 600.0], [False, True])))
+def test_queue_order_matches_order_key(kind, aging, edf, tmp_path):
+    rng = random.Random(11)
+    queue = make_queue(kind, tmp_path, aging_seconds=aging, edf=edf)
+    tasks = [
+        make_task(
+            f"t{i:02d}", rng.randint(0, 3600), rng.choice(PRIORITIES),
+            deadline_in=rng.randint(600, 7200) if rng.random() < 0.3 else None,
+        )
+        for i in range(60)
+    ]
+    for task in tasks:
+        queue.submit(task)
+
+    expected = [t.id for t in sorted(tasks, key=lambda t: order_key(t, aging, edf))]
+
+    assert [t.id for t in queue.get_pending_tasks()] == expected
+    assert [t.id for t in queue.get_runnable_tasks()] == expected
+    assert dispatch_order(queue) == expected
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_aging_lets_a_waiting_low_task_overtake(kind, tmp_path):
+    queue = make_queue(kind, tmp_path, aging_seconds=60.0)
+    # LOW is two levels below HIGH: it overtakes HIGH tasks created over 120s later
+    queue.submit(make_task("low", 0, TaskPriority.LOW))
+    queue.submit(make_task("high-early", 100, TaskPriority.HIGH))
+    queue.submit(make_task("high-late", 130, TaskPriority.HIGH))
+
+    assert dispatch_order(queue) == ["high-early", "low", "high-late"]
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_without_aging_priority_is_strict(kind, tmp_path):
+    queue = make_queue(kind, tmp_path)
+    queue.submit(make_task("low", 0, TaskPriority.LOW))
+    queue.submit(make_task("high", 10_000, TaskPriority.HIGH))
+
+    assert dispatch_order(queue) == ["high", "low"]
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_role_weights_share_dispatches(kind, tmp_path):
+    queue = make_queue(kind, tmp_path, fair_share=FairShare(role_weights={"writer": 2.0}))
+    for i in range(12):
+        queue.submit(make_task(f"w{i:02d}", i, role="writer"))
+        queue.submit(make_task(f"t{i:02d}", i, role="tester"))
+
+    order = dispatch_order(queue, count=9)
+
+    assert sum(task_id.startswith("w") for task_id in order) == 6
+    assert sum(task_id.startswith("t") for task_id in order) == 3
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_submitters_share_a_role(kind, tmp_path):
+    queue = make_queue(kind, tmp_path, fair_share=FairShare())
+    for i in range(6):
+        queue.submit(make_task(f"alice{i}", i, submitter="alice"))
+    for i in range(2):
+        queue.submit(make_task(f"bob{i}", 100 + i, submitter="bob"))
+
+    order = dispatch_order(queue)
+
+    # Bob's later tasks are not stuck behind all of Alice's
+    assert order[:4] == ["alice0", "bob0", "alice1", "bob1"]
+    assert order[4:] == ["alice2", "alice3", "alice4", "alice5"]
+
+
+def test_fair_share_dispatch_is_the_same_on_both_queues(tmp_path):
+    rng = random.Random(5)
+    tasks = [
+        make_task(
+            f"t{i:02d}", rng.randint(0, 600), rng.choice(PRIORITIES),
+            role=rng.choice(["writer", "tester", "reviewer"]),
+            submitter=rng.choice(["alice", "bob", None]),
+        )
+        for i in range(60)
+    ]
+    orders = []
+    for kind in ["memory", "sqlite"]:
+        queue = make_queue(
+            kind, tmp_path, aging_seconds=120.0,
+            fair_share=FairShare(role_weights={"writer": 3.0}, submitter_weights={"bob": 2.0}),
+        )
+        for task in tasks:
+            queue.submit(Task.from_dict(task.to_dict()))
+        orders.append(dispatch_order(queue))
+
+    assert orders[0] == orders[1]
+    assert len(orders[0]) == 60
@@ -0,0 +1,37 @@
+"""
+Tests for the file cache's directory layout
+"""
+import asyncio
+
+from multi_agent_flow.cache import FileCache
+
+
+def subdirs(path):
+    return sorted(p.name for p in path.iterdir() if p.is_dir())
+
+
+def test_reads_do_not_create_directories(tmp_path):
+    cache = FileCache(cache_dir=tmp_path, io_workers=0)
+
+    async def run():
+        assert await cache.get("missing") is None
+        assert await cache.exists("missing") is False
+        assert await cache.delete("missing") is False
+
+    asyncio.run(run())
+
+    assert subdirs(tmp_path) == []
+
+
+def test_first_write_creates_its_directory(tmp_path):
+    cache = FileCache(cache_dir=tmp_path)
+
+    async def run():
+        await cache.set("k", "v")
+        await cache.clear()
+        await cache.set("k", "again")
+        return await cache.get("k")
+
+    assert asyncio.run(run()) == "again"
+    assert len(subdirs(tmp_path)) == 1
+    cache.close()
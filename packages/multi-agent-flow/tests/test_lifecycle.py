@@ -0,0 +1,46 @@
+"""
+Tests for closing background writers at interpreter exit
+"""
+import atexit
+import gc
+import weakref
+
+from multi_agent_flow.cache import CacheMetrics
+from multi_agent_flow.scheduler import AgentState, AgentStateManager, AgentStatus
+from multi_agent_flow.shared import lifecycle
+
+
+def test_instances_share_one_exit_hook(tmp_path, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    monkeypatch.setattr(lifecycle, "_registered", False)
+
+    for i in range(5):
+        CacheMetrics(db_path=tmp_path / f"metrics{i}.db").close()
+
+    assert hooks == [lifecycle._close_all]
+
+
+def test_registration_does_not_keep_instances_alive(tmp_path):
+    metrics = CacheMetrics(db_path=tmp_path / "metrics.db")
+    metrics.close()
+    ref = weakref.ref(metrics)
+
+    del metrics
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_exit_flushes_unclosed_write_behind_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(lifecycle, "_open", type(lifecycle._open)())
+    manager = AgentStateManager(state_file=tmp_path / "agents.json", flush_interval=3600)
+    manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex", status=AgentStatus.IDLE,
+    ))
+    assert not manager.state_file.exists()
+
+    lifecycle._close_all()
+
+    reloaded = AgentStateManager(state_file=manager.state_file, read_only=True)
+    assert reloaded.get_state("writer").name == "Writer"
@@ -0,0 +1,146 @@
+"""
+Tests for the RESP-speaking Redis cache backend, run against an in-process stand-in
+"""
+import asyncio
+import time
+
+import pytest
+
+from multi_agent_flow.cache import CacheManager, RedisCache
+from multi_agent_flow.cache.resp import RespError
+
+from resp_server import LocalRespServer
+
+
+def run_with_redis(scenario, **cache_options):
+    """Run scenario(server, cache) against a fresh LocalRespServer"""
+    async def main():
+        async with LocalRespServer() as server:
+            cache = RedisCache(port=server.port, **cache_options)
+            try:
+                return await scenario(server, cache)
+            finally:
+                await cache.close()
+    return asyncio.run(main())
+
+
+def test_get_set_delete():
+    async def scenario(server, cache):
+        assert await cache.get("maf:cache:a") is None
+        await cache.set("maf:cache:a", "value")
+        assert await cache.get("maf:cache:a") == "value"
+        assert await cache.exists("maf:cache:a")
+        assert await cache.delete("maf:cache:a")
+        assert not await cache.exists("maf:cache:a")
+
+    run_with_redis(scenario)
+
+
+def test_ttl_uses_native_expiry():
+    async def scenario(server, cache):
+        await cache.set("maf:cache:ttl", "value", ttl_seconds=60)
+        await cache.set("maf:cache:forever", "value")
+
+        _, expires_at = await cache.get_with_expiry("maf:cache:ttl")
+        assert 55 < expires_at - time.time() <= 60
+        assert await cache.get_with_expiry("maf:cache:forever") == ("value", None)
+
+        # Expire the entry inside the server, as Redis would
+        value, _ = server._data[b"maf:cache:ttl"]
+        server._data[b"maf:cache:ttl"] = (value, server._now_ms() - 1)
+        assert await cache.get("maf:cache:ttl") is None
+
+    run_with_redis(scenario)
+
+
+def test_get_many_and_set_many_are_pipelined():
+    async def scenario(server, cache):
+        items = {f"maf:cache:k{i}": f"v{i}" for i in range(20)}
+        await cache.set_many(items, ttl_seconds=60)
+        assert server.command_counts["SET"] == 20
+
+        keys = list(items) + ["maf:cache:missing"]
+        assert await cache.get_many(keys) == {**items, "maf:cache:missing": None}
+        assert server.command_counts["MGET"] == 1
+        assert server.command_counts["GET"] == 0
+
+        entries = await cache.get_many_with_expiry(keys)
+        assert entries["maf:cache:missing"] is None
+        assert all(entries[key][0] == value for key, value in items.items())
+        # Pipelines share one connection instead of one per command
+        assert server.connections_accepted == 1
+
+    run_with_redis(scenario)
+
+
+def test_delete_matching_scans_in_batches():
+    async def scenario(server, cache):
+        await cache.set_many({f"maf:cache:task-1:step{i}": "x" for i in range(12)})
+        await cache.set("maf:cache:task-10:step", "x")
+        await cache.set("maf:cache:task-2:step", "x")
+
+        assert await cache.delete_matching("maf:cache:task-1:") == 12
+
+        assert server.command_counts["SCAN"] > 1
+        assert server.command_counts["KEYS"] == 0
+        assert sorted(await cache.scan_keys()) == ["maf:cache:task-10:step", "maf:cache:task-2:step"]
+
+    run_with_redis(scenario, scan_count=5)
+
+
+def test_delete_matching_escapes_glob_characters():
+    async def scenario(server, cache):
+        await cache.set("maf:cache:t[1]:a", "x")
+        await cache.set("maf:cache:t1:a", "x")
+
+        assert await cache.delete_matching("maf:cache:t[1]:") == 1
+        assert await cache.scan_keys() == ["maf:cache:t1:a"]
+
+    run_with_redis(scenario)
+
+
+def test_invalidate_task_through_manager():
+    async def main():
+        async with LocalRespServer() as server:
+            manager = CacheManager(backend="redis", port=server.port, persist_metrics=False)
+            await manager.set_step_result("task-1", "planner", "input", {"plan": "a"})
+            await manager.set_memoized_step("writer", "fp1", {"code": "b"}, task_id="task-1")
+            await manager.set_step_result("task-2", "planner", "input", {"plan": "c"})
+
+            assert await manager.list_task_steps("task-1") == ["planner", "writer"]
+            assert await manager.invalidate_task("task-1") == 2
+
+            assert await manager.get_step_result("task-1", "planner", "input") is None
+            assert await manager.get_memoized_step("writer", "fp1") is None
+            assert await manager.get_step_result("task-2", "planner", "input") == {"plan": "c"}
+
+    asyncio.run(main())
+
+
+def test_pool_reuses_connections():
+    async def scenario(server, cache):
+        for i in range(50):
+            await cache.set(f"maf:cache:{i}", "x")
+            await cache.get(f"maf:cache:{i}")
+        assert server.connections_accepted == 1
+
+        await asyncio.gather(*(cache.get(f"maf:cache:{i}") for i in range(50)))
+        stats = cache.pool.get_stats()
+        assert stats["connections_created"] <= cache.pool.max_connections
+        assert server.connections_accepted == stats["connections_created"]
+        assert stats["idle_connections"] == stats["connections_created"]
+
+    run_with_redis(scenario, max_connections=4)
+
+
+def test_pool_recovers_after_error_reply():
+    async def scenario(server, cache):
+        await cache.pool.execute("SADD", "maf:cache:set", "member")
+        with pytest.raises(RespError, match="WRONGTYPE"):
+            await cache.get("maf:cache:set")
+
+        await cache.set("maf:cache:a", "value")
+        assert await cache.get("maf:cache:a") == "value"
+        assert server.connections_accepted == 1
+
+    run_with_redis(scenario)
@@ -0,0 +1,109 @@
+"""
+Tests for finished task retention and offloaded result files
+"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from multi_agent_flow.scheduler import (
+    AgentState, AgentStatus, FileResultStore, InMemoryTaskQueue, RetentionPolicy, SqliteTaskQueue,
+    Task, TaskScheduler, TaskStatus,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryTaskQueue(max_size=1000)
+    return SqliteTaskQueue(db_path=tmp_path / "tasks.db")
+
+
+def finished(queue, task_id, minutes_ago, status=TaskStatus.COMPLETED, result_ref=None):
+    task = Task(id=task_id, description=task_id, target_role="writer")
+    queue.submit(task)
+    task.status = status
+    task.completed_at = (datetime.utcnow() - timedelta(minutes=minutes_ago)).isoformat()
+    task.result_ref = result_ref
+    queue.update_task(task)
+
+
+def test_max_finished_keeps_the_most_recent(queue):
+    for i, status in enumerate([TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED, TaskStatus.COMPLETED]):
+        finished(queue, f"t{i}", minutes_ago=10 - i, status=status, result_ref=f"t{i}.json.gz")
+    queue.submit(Task(id="pending", description="pending", target_role="writer"))
+
+    removed = queue.prune_finished(max_finished=2)
+
+    assert removed == {"t0": "t0.json.gz", "t1": "t1.json.gz"}
+    assert sorted(t.id for t in queue.get_all_tasks()) == ["pending", "t2", "t3"]
+
+
+def test_max_age_prunes_old_tasks_only(queue):
+    finished(queue, "old", minutes_ago=120)
+    finished(queue, "new", minutes_ago=1)
+
+    assert list(queue.prune_finished(max_age_seconds=3600)) == ["old"]
+    assert queue.prune_finished() == {}
+    assert [t.id for t in queue.get_all_tasks()] == ["new"]
+
+
+def test_dependencies_of_waiting_tasks_are_kept(queue):
+    finished(queue, "dep", minutes_ago=120)
+    finished(queue, "done-dep", minutes_ago=120)
+    queue.submit(Task(id="waiting", description="waiting", target_role="writer", dependencies=["dep"]))
+    finished(queue, "done", minutes_ago=60)
+    done = queue.get_task("done")
+    done.dependencies = ["done-dep"]
+    queue.update_task(done)
+
+    removed = queue.prune_finished(max_finished=0)
+
+    assert sorted(removed) == ["done", "done-dep"]
+    assert sorted(t.id for t in queue.get_all_tasks()) == ["dep", "waiting"]
+
+
+def test_result_store_rejects_paths_outside_its_directory(tmp_path):
+    store = FileResultStore(directory=tmp_path / "results")
+
+    with pytest.raises(ValueError):
+        store.get("../tasks.db")
+    with pytest.raises(ValueError):
+        store.delete("sub/dir.json")
+
+
+def test_pruning_deletes_offloaded_result_files(tmp_path):
+    store = FileResultStore(directory=tmp_path / "results", offload_bytes=1024)
+    scheduler = TaskScheduler(
+        state_file=tmp_path / "agents.json", poll_interval=0.1,
+        queue=SqliteTaskQueue(db_path=tmp_path / "tasks.db"),
+        retention=RetentionPolicy(max_finished=1, prune_interval=3600),
+        result_store=store,
+    )
+    scheduler.state_manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex", status=AgentStatus.IDLE,
+    ))
+    scheduler.register_task_handler("writer", lambda task, agent: {"output": task.description * 500})
+    scheduler.start()
+    try:
+        tasks = []
+        for i in range(3):
+            tasks.append(scheduler.submit_task(f"task {i} ", target_role="writer"))
+            deadline = time.monotonic() + 5
+            while scheduler.get_task_status(tasks[-1].id)["status"] != TaskStatus.COMPLETED.value:
+                assert time.monotonic() < deadline
+                time.sleep(0.02)
+            time.sleep(0.01)  # Distinct completed_at
+
+        refs = [scheduler.queue.get_task(t.id).result_ref for t in tasks]
+        assert all(refs)
+        assert sorted(p.name for p in store.directory.iterdir()) == sorted(refs)
+        assert scheduler.get_task_status(tasks[0].id)["result"] == {"output": "task 0 " * 500}
+
+        assert scheduler.prune_tasks() == 2
+    finally:
+        scheduler.stop()
+
+    assert [p.name for p in store.directory.iterdir()] == [refs[2]]
+    assert scheduler.queue.get_task(tasks[0].id) is None
+    assert scheduler.get_task_status(tasks[2].id)["result"] == {"output": "task 2 " * 500}
@@ -0,0 +1,83 @@
+"""
+Tests for event-driven dispatch: submissions and freed agents wake the loop
+"""
+import time
+
+import pytest
+
+from multi_agent_flow.scheduler import AgentState, AgentStatus, SqliteTaskQueue, TaskScheduler, TaskStatus
+
+
+def register_writer(scheduler, capacity=1):
+    scheduler.state_manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex",
+        status=AgentStatus.IDLE, capacity=capacity,
+    ))
+
+
+def wait_status(scheduler, task_id, status, timeout):
+    deadline = time.monotonic() + timeout
+    while scheduler.get_task_status(task_id)["status"] != status.value:
+        assert time.monotonic() < deadline, f"{task_id} not {status.value} after {timeout}s"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    # The loop would sleep 20s between polls without wake-ups
+    scheduler = TaskScheduler(state_file=tmp_path / "agents.json", poll_interval=60.0)
+    register_writer(scheduler)
+    yield scheduler
+    scheduler.stop(drain=False)
+
+
+def test_submit_wakes_the_loop(scheduler):
+    scheduler.register_task_handler("writer", lambda task, agent: {"ok": True})
+    scheduler.start()
+    time.sleep(0.1)  # Let the loop settle into its wait
+
+    task = scheduler.submit_task("now", target_role="writer")
+    wait_status(scheduler, task.id, TaskStatus.COMPLETED, timeout=2.0)
+
+    stats = scheduler.get_dispatch_stats()
+    assert stats["dispatched"] == 1
+    assert stats["wakeups"] >= 1
+    assert stats["polls"] == 0
+    assert stats["max_latency_ms"] < 1000
+
+
+def test_freed_agent_wakes_the_loop(scheduler):
+    def handler(task, agent):
+        time.sleep(0.2)
+        return {"ok": True}
+
+    scheduler.register_task_handler("writer", handler)
+    scheduler.start()
+    first = scheduler.submit_task("first", target_role="writer")
+    second = scheduler.submit_task("second", target_role="writer")
+
+    # The single slot is busy, so the second task waits for the first to finish
+    wait_status(scheduler, first.id, TaskStatus.COMPLETED, timeout=2.0)
+    wait_status(scheduler, second.id, TaskStatus.COMPLETED, timeout=2.0)
+
+    assert scheduler.get_dispatch_stats()["polls"] == 0
+
+
+def test_submission_from_another_process_is_noticed(tmp_path):
+    db_path = tmp_path / "tasks.db"
+    scheduler = TaskScheduler(
+        state_file=tmp_path / "agents.json", poll_interval=60.0, queue=SqliteTaskQueue(db_path=db_path),
+    )
+    register_writer(scheduler)
+    scheduler.register_task_handler("writer", lambda task, agent: {"ok": True})
+    scheduler.start()
+    try:
+        time.sleep(0.1)
+        # Another scheduler's queue connection, as `maf task` would use
+        submitter = TaskScheduler(state_file=tmp_path / "other.json", queue=SqliteTaskQueue(db_path=db_path))
+        task = submitter.submit_task("external", target_role="writer")
+
+        wait_status(scheduler, task.id, TaskStatus.COMPLETED, timeout=3.0)
+        assert scheduler.get_dispatch_stats()["external_wakeups"] >= 1
+    finally:
+        scheduler.stop()
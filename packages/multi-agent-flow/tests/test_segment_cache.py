@@ -0,0 +1,108 @@
+"""
+Tests for the log-structured segment cache: reloading and compaction
+"""
+import asyncio
+import time
+
+import pytest
+
+from multi_agent_flow.cache import SegmentCache
+
+
+@pytest.fixture
+def open_cache(tmp_path):
+    opened = []
+
+    def open_cache():
+        for cache in opened:
+            cache.close()
+        cache = SegmentCache(cache_dir=tmp_path, compact_interval=3600)
+        opened.append(cache)
+        return cache
+
+    yield open_cache
+    for cache in opened:
+        cache.close()
+
+
+def rotate(cache):
+    with cache._lock:
+        cache._rotate()
+
+
+def test_reload_restores_entries_and_tags(open_cache):
+    cache = open_cache()
+    asyncio.run(cache.set("a", "sealed"))
+    asyncio.run(cache.tag_key("a", ["task:t1"]))
+    rotate(cache)
+    asyncio.run(cache.set("b", "active"))
+    asyncio.run(cache.set("a", "newer"))
+
+    cache = open_cache()
+
+    assert asyncio.run(cache.get("a")) == "newer"
+    assert asyncio.run(cache.get("b")) == "active"
+    assert asyncio.run(cache.tagged_keys("task:t1")) == ["a"]
+    assert asyncio.run(cache.get_stats())["segments"] == 2
+
+
+def test_reload_truncates_incomplete_record(tmp_path, open_cache):
+    cache = open_cache()
+    asyncio.run(cache.set("a", "value"))
+    cache.close()
+    with open(tmp_path / "00000001.seg", "ab") as f:
+        f.write(b"\x00partial record")
+
+    cache = open_cache()
+
+    assert asyncio.run(cache.get("a")) == "value"
+    asyncio.run(cache.set("b", "after"))
+    assert asyncio.run(open_cache().get("b")) == "after"
+
+
+def test_compaction_keeps_live_entries(open_cache):
+    cache = open_cache()
+    asyncio.run(cache.set_many({"a": "old", "b": "kept"}))
+    rotate(cache)
+    asyncio.run(cache.set("a", "new"))
+
+    assert cache.compact(min_ratio=0.0) == 0
+    stats = asyncio.run(cache.get_stats())
+    assert (stats["compactions"], stats["segments"]) == (1, 1)
+
+    cache = open_cache()
+    assert asyncio.run(cache.get("a")) == "new"
+    assert asyncio.run(cache.get("b")) == "kept"
+
+
+def test_compaction_keeps_tombstones_for_older_segments(open_cache):
+    cache = open_cache()
+    asyncio.run(cache.set_many({"a": "deleted", "live": "x" * 4096}))
+    rotate(cache)
+    asyncio.run(cache.set("filler", "x"))
+    asyncio.run(cache.delete("a"))
+    rotate(cache)
+
+    # Compact only the segment holding the tombstone, not the older PUT
+    cache._compact_segment(cache._segments[2], time.time())
+
+    cache = open_cache()
+    assert asyncio.run(cache.get("a")) is None
+    assert asyncio.run(cache.get("filler")) == "x"
+    assert asyncio.run(cache.get("live")) == "x" * 4096
+
+
+def test_compacting_expired_entry_does_not_resurrect_older_value(open_cache):
+    cache = open_cache()
+    # Mostly live data, so the background compactor leaves this segment alone
+    asyncio.run(cache.set_many({"k": "OLD-VALUE", "filler": "x" * 4096}))
+    rotate(cache)
+    asyncio.run(cache.set("k", "NEW-VALUE", ttl_seconds=60))
+    rotate(cache)
+
+    # The newer segment holds the expired PUT; the older one is left alone
+    assert cache._compact_segment(cache._segments[2], time.time() + 120) == 1
+
+    cache = open_cache()
+    assert asyncio.run(cache.get("k")) is None
+    assert asyncio.run(cache.get("filler")) == "x" * 4096
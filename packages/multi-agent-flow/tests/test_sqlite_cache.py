@@ -0,0 +1,180 @@
+"""
+Tests for the SQLite cache backend: tag index and query offloading
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from multi_agent_flow.cache import FileCache, SqliteCache, generate_cache_key, generate_step_key, step_tag, task_tag
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SqliteCache(db_path=tmp_path / "cache.db")
+    yield cache
+    cache.close()
+
+
+def tag_rows(cache):
+    return cache._get_connection().execute("SELECT COUNT(*) FROM cache_tags").fetchone()[0]
+
+
+async def put(cache, key, ttl_seconds=None):
+    await cache.set(key, "value", ttl_seconds)
+    await cache.tag_key(key, ["task:t1", "step:planner"])
+
+
+@pytest.mark.parametrize("remove", [
+    lambda cache: cache.delete("maf:cache:a"),
+    lambda cache: cache.delete_many(["maf:cache:a"]),
+    lambda cache: cache.delete_matching("maf:cache:"),
+])
+def test_deleting_an_entry_removes_its_tags(cache, remove):
+    async def scenario():
+        await put(cache, "maf:cache:a")
+        assert tag_rows(cache) == 2
+        await remove(cache)
+        assert tag_rows(cache) == 0
+
+    asyncio.run(scenario())
+
+
+def test_cleanup_expired_removes_tags(cache):
+    async def scenario():
+        await put(cache, "maf:cache:a", ttl_seconds=60)
+        await put(cache, "maf:cache:b")
+        cache._get_connection().execute("UPDATE cache_entries SET expires_at = ? WHERE key = 'maf:cache:a'", (time.time() - 1,))
+
+        assert await cache.cleanup_expired() == 1
+        assert await cache.tagged_keys("task:t1") == ["maf:cache:b"]
+        assert tag_rows(cache) == 2
+
+    asyncio.run(scenario())
+
+
+def test_overwriting_an_entry_keeps_its_tags(cache):
+    async def scenario():
+        await put(cache, "maf:cache:a")
+        await cache.set("maf:cache:a", "new value")
+        await cache.set_many({"maf:cache:a": "newer value"})
+        assert await cache.tagged_keys("task:t1") == ["maf:cache:a"]
+
+    asyncio.run(scenario())
+
+
+def test_existing_database_drops_orphaned_tags(tmp_path):
+    db_path = tmp_path / "cache.db"
+    cache = SqliteCache(db_path=db_path)
+    conn = cache._get_connection()
+    conn.execute("DROP TRIGGER trg_cache_entries_untag")
+    asyncio.run(put(cache, "maf:cache:a"))
+    asyncio.run(cache.delete("maf:cache:a"))
+    assert tag_rows(cache) == 2
+    cache.close()
+
+    reopened = SqliteCache(db_path=db_path)
+    assert tag_rows(reopened) == 0
+    reopened.close()
+
+
+def test_migrate_from_file_cache_carries_tags(tmp_path, cache):
+    file_cache = FileCache(cache_dir=tmp_path / "files", io_workers=0)
+    scoped = generate_cache_key("task-1", "planner", "abc")
+    memoized = generate_step_key("writer", "fp1")
+
+    async def fill():
+        await file_cache.set(scoped, "plan")
+        await file_cache.tag_key(scoped, [task_tag("task-1"), step_tag("planner")])
+        await file_cache.set(memoized, "code")
+        await file_cache.tag_key(memoized, [task_tag("task-1"), step_tag("writer")])
+
+    asyncio.run(fill())
+
+    assert cache.migrate_from_file_cache(tmp_path / "files") == 2
+    assert sorted(asyncio.run(cache.tagged_keys(task_tag("task-1")))) == sorted([scoped, memoized])
+    assert asyncio.run(cache.tagged_keys(step_tag("writer"))) == [memoized]
+
+
+def test_migrate_resolves_legacy_tag_files_from_keys(tmp_path, cache):
+    file_cache = FileCache(cache_dir=tmp_path / "files", io_workers=0)
+    scoped = generate_cache_key("task-1", "planner", "abc")
+    asyncio.run(file_cache.set(scoped, "plan"))
+    # Tag files written before tag names were recorded hold only keys
+    for tag in (task_tag("task-1"), step_tag("planner")):
+        path = file_cache._tag_path(tag)
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(scoped + "\n")
+    # A tag no migrated key implies cannot be resolved and is skipped
+    (tmp_path / "files" / ".tags" / "0123456789abcdef0123456789abcdef.keys").write_text(scoped + "\n")
+
+    cache.migrate_from_file_cache(tmp_path / "files")
+
+    assert asyncio.run(cache.tagged_keys(task_tag("task-1"))) == [scoped]
+    assert asyncio.run(cache.tagged_keys(step_tag("planner"))) == [scoped]
+    assert tag_rows(cache) == 2
+
+
+def test_file_cache_tag_files_record_their_tag(tmp_path):
+    file_cache = FileCache(cache_dir=tmp_path, io_workers=0)
+    asyncio.run(file_cache.set("maf:cache:a", "value"))
+    asyncio.run(file_cache.tag_key("maf:cache:a", ["task:t1"]))
+    asyncio.run(file_cache.tag_key("maf:cache:b", ["task:t1"]))
+
+    lines = file_cache._tag_path("task:t1").read_text().splitlines()
+
+    assert lines == ["#tag task:t1", "maf:cache:a", "maf:cache:b"]
+    assert asyncio.run(file_cache.tagged_keys("task:t1")) == ["maf:cache:a"]
+
+
+def test_queries_run_off_the_event_loop(cache, monkeypatch):
+    threads = []
+    for name in ("_get_sync", "_set_sync"):
+        query = getattr(cache, name)
+
+        def record(*args, query=query):
+            threads.append(threading.current_thread().name)
+            return query(*args)
+
+        monkeypatch.setattr(cache, name, record)
+
+    async def run():
+        await cache.set("k", "v")
+        return await cache.get("k")
+
+    assert asyncio.run(run()) == "v"
+    assert threads[0].startswith("maf-sqlite-cache-writer")
+    assert threads[1].startswith("maf-sqlite-cache") and "writer" not in threads[1]
+
+
+def test_writes_keep_their_order(cache):
+    async def run():
+        await asyncio.gather(*(cache.set("k", str(i)) for i in range(50)))
+        return await cache.get("k")
+
+    assert asyncio.run(run()) == "49"
+
+
+def test_close_closes_executor_connections(tmp_path):
+    cache = SqliteCache(db_path=tmp_path / "cache.db")
+    asyncio.run(cache.set("k", "v"))
+    connections = list(cache._connections)
+    assert len(connections) >= 2
+
+    cache.close()
+
+    for conn in connections:
+        with pytest.raises(Exception):
+            conn.execute("SELECT 1")
+    # Closed caches run queries inline on fresh connections
+    assert asyncio.run(cache.get("k")) == "v"
+    cache.close()
+
+
+def test_inline_queries_without_io_workers(tmp_path):
+    cache = SqliteCache(db_path=tmp_path / "cache.db", io_workers=0)
+    asyncio.run(cache.set("k", "v"))
+    assert asyncio.run(cache.get("k")) == "v"
+    assert asyncio.run(cache.get_stats())["io_workers"] == 0
+    cache.close()
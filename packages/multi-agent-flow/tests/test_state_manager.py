@@ -0,0 +1,222 @@
+"""
+Tests for agent slot and error state transitions, and state file persistence
+"""
+import json
+import threading
+import time
+
+import pytest
+
+from multi_agent_flow.scheduler import AgentState, AgentStateManager, AgentStatus, TaskScheduler, TaskStatus
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = AgentStateManager(state_file=tmp_path / "agents.json", flush_interval=None)
+    yield manager
+    manager.close()
+
+
+def register(manager, capacity):
+    manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex",
+        status=AgentStatus.IDLE, capacity=capacity,
+    ))
+
+
+def test_failed_task_keeps_agent_dispatchable(manager):
+    register(manager, capacity=3)
+    manager.set_agent_working("writer", "t1")
+    manager.set_agent_working("writer", "t2")
+
+    state = manager.set_task_failed("writer", "t1", "boom")
+
+    assert state.status == AgentStatus.WORKING
+    assert state.running_task_ids == ["t2"]
+    assert state.tasks_failed == 1
+    assert state.error_message == "boom"
+    assert manager.get_available_agents("writer") == [state]
+
+
+def test_failed_task_on_single_slot_agent_frees_it(manager):
+    register(manager, capacity=1)
+    manager.set_agent_working("writer", "t1")
+
+    state = manager.set_task_failed("writer", "t1", "boom")
+
+    assert state.status == AgentStatus.IDLE
+    assert state.is_available()
+
+
+def test_agent_error_survives_task_completion(manager):
+    register(manager, capacity=3)
+    manager.set_agent_working("writer", "t1")
+    manager.set_agent_error("writer", "CLI crashed")
+    assert manager.get_state("writer").running_task_ids == ["t1"]
+    assert manager.get_available_agents() == []
+
+    state = manager.set_agent_idle("writer", task_id="t1")
+
+    assert state.status == AgentStatus.ERROR
+    assert state.error_message == "CLI crashed"
+    assert state.running_task_ids == []
+    assert manager.get_available_agents() == []
+
+
+def test_clear_agent_error(manager):
+    register(manager, capacity=2)
+    manager.set_agent_working("writer", "t1")
+    manager.set_agent_error("writer", "CLI crashed")
+
+    state = manager.clear_agent_error("writer")
+
+    assert state.status == AgentStatus.WORKING
+    assert state.error_message is None
+    assert state.is_available()
+
+
+def test_scheduler_keeps_dispatching_after_a_failure(tmp_path):
+    scheduler = TaskScheduler(state_file=tmp_path / "agents.json", poll_interval=0.1)
+    scheduler.state_manager.register_agent(AgentState(
+        id="writer", name="Writer", port=8002, roles=["writer"], model="codex",
+        status=AgentStatus.IDLE, capacity=3,
+    ))
+
+    def handler(task, agent):
+        if task.description == "fail":
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    scheduler.register_task_handler("writer", handler)
+    scheduler.start()
+    try:
+        failed = scheduler.submit_task("fail", target_role="writer")
+        deadline = time.monotonic() + 10
+        while scheduler.get_task_status(failed.id)["status"] != TaskStatus.FAILED.value:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+        tasks = [scheduler.submit_task(f"task {i}", target_role="writer") for i in range(3)]
+        deadline = time.monotonic() + 10
+        while any(scheduler.get_task_status(t.id)["status"] != TaskStatus.COMPLETED.value for t in tasks):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        scheduler.stop()
+
+    state = scheduler.state_manager.get_state("writer")
+    assert state.status == AgentStatus.IDLE
+    assert (state.tasks_completed, state.tasks_failed) == (3, 1)
+
+
+def test_read_only_view_never_writes(tmp_path, manager):
+    register(manager, capacity=2)
+    written = manager.state_file.read_text()
+
+    view = AgentStateManager(state_file=manager.state_file, read_only=True)
+    assert view.get_state("writer").capacity == 2
+    view.register_agent(AgentState(
+        id="tester", name="Tester", port=8004, roles=["tester"], model="claude",
+        status=AgentStatus.IDLE,
+    ))
+    view.set_agent_working("writer", "t1")
+    view.close()
+
+    assert manager.state_file.read_text() == written
+
+
+def test_submitting_through_read_only_view_keeps_daemon_state(tmp_path, manager):
+    from multi_agent_flow.scheduler import SqliteTaskQueue
+
+    register(manager, capacity=2)
+    written = manager.state_file.read_text()
+    queue = SqliteTaskQueue(db_path=tmp_path / "tasks.db")
+    scheduler = TaskScheduler(queue=queue, state_manager=AgentStateManager(
+        state_file=manager.state_file, read_only=True,
+    ))
+
+    task = scheduler.submit_task("queued", target_role="writer")
+
+    assert queue.get_task(task.id).status == TaskStatus.PENDING
+    assert manager.state_file.read_text() == written
+
+
+def written_agents(path):
+    return json.loads(path.read_text())["agents"]
+
+
+def test_write_behind_coalesces_changes(tmp_path):
+    manager = AgentStateManager(state_file=tmp_path / "agents.json", flush_interval=0.1)
+    register(manager, capacity=50)
+    for i in range(50):
+        manager.set_agent_working("writer", f"t{i}")
+
+    deadline = time.monotonic() + 5
+    while not manager.state_file.exists() or len(written_agents(manager.state_file)["writer"]["running_task_ids"]) < 50:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    manager.close()
+
+    assert manager.writes < 10
+
+
+def test_crash_before_flush_keeps_last_snapshot(tmp_path):
+    manager = AgentStateManager(state_file=tmp_path / "agents.json", flush_interval=3600)
+    register(manager, capacity=2)
+    manager.flush()
+    manager.set_agent_working("writer", "t1")
+
+    # A process dying now leaves the previous, complete snapshot
+    survivor = AgentStateManager(state_file=manager.state_file, read_only=True)
+    assert survivor.get_state("writer").running_task_ids == []
+
+    manager.close()
+    survivor = AgentStateManager(state_file=manager.state_file, read_only=True)
+    assert survivor.get_state("writer").running_task_ids == ["t1"]
+
+
+def test_failed_write_leaves_file_intact_and_retries(tmp_path, monkeypatch):
+    manager = AgentStateManager(state_file=tmp_path / "agents.json", flush_interval=3600)
+    register(manager, capacity=2)
+    manager.flush()
+    before = manager.state_file.read_text()
+    manager.set_agent_working("writer", "t1")
+
+    def torn_dump(data, f, **kwargs):
+        f.write('{"agents": {"wri')
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(json, "dump", torn_dump)
+        with pytest.raises(OSError, match="disk full"):
+            manager.flush()
+
+    assert manager.state_file.read_text() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["agents.json"]
+
+    # Still dirty, so the next flush writes the change
+    manager.close()
+    assert written_agents(manager.state_file)["writer"]["running_task_ids"] == ["t1"]
+
+
+def test_concurrent_changes_and_flushes_end_consistent(tmp_path):
+    manager = AgentStateManager(state_file=tmp_path / "agents.json", flush_interval=0.01)
+    register(manager, capacity=400)
+
+    def work(n):
+        for i in range(100):
+            manager.set_agent_working("writer", f"{n}-{i}")
+            if i % 10 == 0:
+                manager.flush()
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    manager.close()
+
+    assert sorted(written_agents(manager.state_file)["writer"]["running_task_ids"]) == sorted(
+        manager.get_state("writer").running_task_ids
+    )
+    assert len(manager.get_state("writer").running_task_ids) == 400
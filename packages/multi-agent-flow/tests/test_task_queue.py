@@ -0,0 +1,146 @@
+"""
+Tests for the indexed task queues: dependency promotion and status counts
+"""
+import random
+
+import pytest
+
+from multi_agent_flow.scheduler import InMemoryTaskQueue, SqliteTaskQueue, Task, TaskStatus
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryTaskQueue(max_size=1000)
+    return SqliteTaskQueue(db_path=tmp_path / "tasks.db")
+
+
+def add(queue, task_id, *dependencies, role="writer"):
+    task = Task(id=task_id, description=task_id, target_role=role, dependencies=list(dependencies))
+    queue.submit(task)
+    return task
+
+
+def set_status(queue, task_id, status):
+    task = queue.get_task(task_id)
+    task.status = status
+    queue.update_task(task)
+
+
+def runnable(queue):
+    return sorted(t.id for t in queue.get_runnable_tasks())
+
+
+def test_completion_promotes_dependents(queue):
+    add(queue, "a")
+    add(queue, "b", "a")
+    add(queue, "c", "a")
+    add(queue, "d", "b", "c")
+    assert runnable(queue) == ["a"]
+
+    set_status(queue, "a", TaskStatus.RUNNING)
+    assert runnable(queue) == []
+    set_status(queue, "a", TaskStatus.COMPLETED)
+    assert runnable(queue) == ["b", "c"]
+
+    set_status(queue, "b", TaskStatus.COMPLETED)
+    assert runnable(queue) == ["c"]
+    set_status(queue, "c", TaskStatus.COMPLETED)
+    assert runnable(queue) == ["d"]
+    assert queue.get_dependents("a") == []
+    assert [t.id for t in queue.get_dependents("c")] == ["d"]
+
+
+def test_failed_dependency_keeps_dependents_waiting(queue):
+    add(queue, "a")
+    add(queue, "b", "a")
+
+    set_status(queue, "a", TaskStatus.FAILED)
+
+    assert runnable(queue) == []
+
+
+def test_retried_dependency_demotes_dependents(queue):
+    add(queue, "a")
+    add(queue, "b", "a")
+    set_status(queue, "a", TaskStatus.COMPLETED)
+    assert runnable(queue) == ["b"]
+
+    set_status(queue, "a", TaskStatus.PENDING)
+
+    assert runnable(queue) == ["a"]
+
+
+def test_dependency_submitted_later(queue):
+    add(queue, "b", "a")
+    assert runnable(queue) == []
+
+    add(queue, "a")
+    assert runnable(queue) == ["a"]
+    set_status(queue, "a", TaskStatus.COMPLETED)
+    assert runnable(queue) == ["b"]
+
+
+def test_peek_runnable_skips_excluded_roles(queue):
+    add(queue, "a", role="writer")
+    add(queue, "b", role="tester")
+
+    assert queue.peek_runnable().id == "a"
+    assert queue.peek_runnable(exclude_roles=["writer"]).id == "b"
+    assert queue.peek_runnable(exclude_roles=["writer", "tester"]) is None
+
+
+def test_stats_count_by_status(queue):
+    for i in range(6):
+        add(queue, f"t{i}")
+    set_status(queue, "t0", TaskStatus.RUNNING)
+    set_status(queue, "t1", TaskStatus.COMPLETED)
+    set_status(queue, "t2", TaskStatus.COMPLETED)
+    set_status(queue, "t3", TaskStatus.FAILED)
+
+    assert queue.stats() == {"total": 6, "pending": 2, "running": 1, "completed": 2, "failed": 1}
+
+
+class NoScan(dict):
+    """Task map that fails on iteration, to prove a code path does not scan it"""
+
+    def __iter__(self):
+        raise AssertionError("queue scanned")
+
+    def values(self):
+        raise AssertionError("queue scanned")
+
+    def items(self):
+        raise AssertionError("queue scanned")
+
+
+def test_in_memory_stats_and_peek_do_not_scan():
+    queue = InMemoryTaskQueue(max_size=1000)
+    for i in range(50):
+        add(queue, f"t{i}", *([f"t{i - 1}"] if i % 2 else []))
+    queue._tasks = NoScan(queue._tasks)
+
+    assert queue.stats()["pending"] == 50
+    assert queue.peek_runnable().id == "t0"
+
+
+def test_in_memory_index_matches_a_full_scan():
+    rng = random.Random(7)
+    queue = InMemoryTaskQueue(max_size=1000)
+    ids = [f"t{i}" for i in range(40)]
+    for i, task_id in enumerate(ids):
+        add(queue, task_id, *rng.sample(ids[:i], min(i, rng.randint(0, 2))))
+
+    statuses = [TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.COMPLETED, TaskStatus.FAILED]
+    for _ in range(300):
+        set_status(queue, rng.choice(ids), rng.choice(statuses))
+
+        tasks = queue.get_all_tasks()
+        status = {t.id: t.status for t in tasks}
+        expected = sorted(
+            t.id for t in tasks
+            if t.status == TaskStatus.PENDING
+            and all(status.get(dep) == TaskStatus.COMPLETED for dep in t.dependencies)
+        )
+        assert runnable(queue) == expected
+        assert queue.stats()["completed"] == sum(s == TaskStatus.COMPLETED for s in status.values())
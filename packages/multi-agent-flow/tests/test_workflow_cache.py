@@ -0,0 +1,170 @@
+"""
+Tests for workflow step memoization
+"""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from multi_agent_flow.cache import CacheManager
+from multi_agent_flow.workflow import AgentName, FileIPCManager, WorkflowEngine
+from multi_agent_flow.workflow.engine import CACHEABLE_STEPS, STALE_WINDOWS
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(backend="sqlite", db_path=tmp_path / "cache.db", persist_metrics=False)
+
+
+def make_engine(tmp_path, cache, **kwargs):
+    return WorkflowEngine(
+        ipc_manager=FileIPCManager(tmp_path / "runs"),
+        state_dir=tmp_path / "states",
+        use_real_agents=False,
+        cache_manager=cache,
+        **kwargs,
+    )
+
+
+def run(engine, task_id):
+    engine.start_workflow(task_id, "Implement login")
+    state = engine.execute_workflow(task_id)
+    return {h.step_name: h.cached for h in state.history}
+
+
+def test_only_planner_and_writer_memoized_by_default(tmp_path, cache):
+    engine = make_engine(tmp_path, cache)
+    assert not any(run(engine, "task-1").values())
+
+    cached = run(make_engine(tmp_path, cache), "task-2")
+
+    assert cached == {
+        AgentName.PLANNER: True,
+        AgentName.WRITER: True,
+        AgentName.REVIEWER: False,
+        AgentName.TESTER: False,
+        AgentName.ANALYZER: False,
+    }
+
+
+def test_prediction_stops_at_first_uncached_step(tmp_path, cache):
+    run(make_engine(tmp_path, cache), "task-1")
+    engine = make_engine(tmp_path, cache, cacheable_steps=["planner", "analyzer"])
+
+    state = engine.start_workflow("task-2", "Implement login")
+
+    assert state.predicted_cache_hits == ["planner"]
+
+
+def test_tester_is_never_cacheable(tmp_path, cache):
+    with pytest.raises(ValueError, match="tester"):
+        make_engine(tmp_path, cache, cacheable_steps=["planner", AgentName.TESTER])
+
+
+class FakeRunner:
+    """AgentRunner stand-in that returns a new output on every run"""
+
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self, agent_name, prompt, timeout_override=None):
+        self.runs += 1
+        return SimpleNamespace(return_code=0, stdout=f"run {self.runs}", stderr="")
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, method):
+        async def notify(*args, **kwargs):
+            self.events.append(method)
+        return notify
+
+
+def expire_all(cache, stale_window):
+    """Move every entry past its TTL but inside its stale window"""
+    cache._cache._get_connection().execute(
+        "UPDATE cache_entries SET expires_at = ?", (time.time() + stale_window - 1,)
+    )
+
+
+def test_stale_hit_is_refreshed_before_workflow_returns(tmp_path):
+    cache = CacheManager(
+        backend="sqlite", db_path=tmp_path / "cache.db", persist_metrics=False,
+        stale_windows={"planner": 3600},
+    )
+    engine = make_engine(tmp_path, cache, cacheable_steps=["planner"])
+    engine.use_real_agents, engine._agent_runner = True, FakeRunner()
+    engine.start_workflow("task-1", "Implement login")
+    asyncio.run(engine.execute_workflow_async("task-1"))
+    expire_all(cache, 3600)
+
+    notifier = RecordingNotifier()
+    engine.set_notification_manager(notifier)
+    engine.start_workflow("task-2", "Implement login")
+    state = asyncio.run(engine.execute_workflow_async("task-2"))
+
+    planner = state.history[0]
+    assert planner.cached
+    assert planner.output_data["payload"]["output"] == "run 1"
+    stats = cache.get_stats()
+    assert (stats["stale_hits"], stats["refreshes"], stats["refreshes_in_flight"]) == (1, 1, 0)
+
+    # The refresh stored a fresh result (stale entries are not listed)...
+    [refreshed] = asyncio.run(cache.get_task_entries("task-2")).values()
+    assert refreshed["output_data"]["payload"]["output"] != "run 1"
+    assert engine._agent_runner.runs == 5 + 4 + 1
+    # ...without touching task-2's files or sending events after it ended
+    with open(planner.output_path) as f:
+        assert json.load(f) == planner.output_data
+    assert notifier.events[-1] == "workflow_ended"
+
+
+def test_default_stale_windows_cover_only_cacheable_steps():
+    assert set(STALE_WINDOWS) <= {step.value for step in CACHEABLE_STEPS}
+
+
+def test_prefetched_hits_are_tagged_and_counted_once(tmp_path, cache):
+    run(make_engine(tmp_path, cache), "task-1")
+    hits_before = cache.get_stats()["hits"]
+
+    engine = make_engine(tmp_path, cache)
+    state = engine.start_workflow("task-2", "Implement login")
+    assert state.predicted_cache_hits == ["planner", "writer"]
+    assert cache.get_stats()["hits"] == hits_before
+
+    engine.execute_workflow("task-2")
+
+    assert cache.get_stats()["hits"] == hits_before + 2
+    assert asyncio.run(cache.list_task_steps("task-2")) == ["planner", "writer"]
+    assert asyncio.run(cache.invalidate_task("task-2")) == 2
+    engine.close()
+
+
+def test_invalidation_after_start_drops_prefetched_hits(tmp_path, cache):
+    run(make_engine(tmp_path, cache), "task-1")
+    engine = make_engine(tmp_path, cache)
+    engine.start_workflow("task-2", "Implement login")
+
+    asyncio.run(cache.purge_step("planner"))
+    state = engine.execute_workflow("task-2")
+
+    # The writer's entry is still valid for the re-run planner's output
+    assert [h.cached for h in state.history[:2]] == [False, True]
+    engine.close()
+
+
+def test_expired_prefetched_hits_are_not_served(tmp_path):
+    cache = CacheManager(backend="sqlite", db_path=tmp_path / "cache.db", persist_metrics=False, default_ttl=1)
+    run(make_engine(tmp_path, cache), "task-1")
+    engine = make_engine(tmp_path, cache)
+    assert engine.start_workflow("task-2", "Implement login").predicted_cache_hits == ["planner", "writer"]
+
+    time.sleep(1.1)
+    state = engine.execute_workflow("task-2")
+
+    assert not any(h.cached for h in state.history)
+    engine.close()